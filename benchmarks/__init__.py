@@ -0,0 +1,3 @@
+"""
+Benchmark pipeline. Jalankan dari root repo, mis. python -m benchmarks.bench_rfm
+"""
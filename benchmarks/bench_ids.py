@@ -0,0 +1,104 @@
+"""
+Benchmark interning ID: build main_df dengan ID string (object) vs kode int32.
+
+Jalankan: python -m benchmarks.bench_ids [--scale 1 | --data DIR_CSV_OLIST] [--repeat 3]
+Tanpa --data, input-nya dataset sintetis skala --scale (benchmarks.synth).
+Melaporkan durasi tiap stage build (minimum dari --repeat kali), memori
+main_df, dan operasi per-ID yang dipakai dashboard (nunique, groupby).
+"""
+
+import argparse
+
+import pandas as pd
+
+from benchmarks.common import DATA_ROOT, best_of, synthetic_raw
+from pipeline.build import (DERIVED, aggregate_payments, aggregate_reviews, build_main_df, clean_orders,
+                            translate_products)
+from pipeline.ids import intern_ids
+from pipeline.load import load_raw
+from pipeline.timing import StageTimer
+
+# Tabel yang mengindeks array padat per kode ID (CohortMatrix): hanya berjalan atas
+# ID hasil intern, jadi dilewati di kedua versi agar stage yang dibandingkan sama
+CODE_ONLY = {"cohort_matrix"}
+
+
+def build(raw, timer):
+    """Stage build_all (serial) tanpa CODE_ONLY; berjalan atas ID string maupun kode."""
+    with timer.stage("clean_orders"):
+        orders = clean_orders(raw["orders"])
+    with timer.stage("aggregate_payments"):
+        payments = aggregate_payments(raw["payments"])
+    with timer.stage("aggregate_reviews"):
+        reviews = aggregate_reviews(raw["reviews"])
+    with timer.stage("translate_products"):
+        products = translate_products(raw["products"], raw["translation"])
+    artifacts = {"main_df": build_main_df(raw["order_items"], orders, raw["customers"], products,
+                                          payments, reviews, timer)}
+    options = {"seller_scorecards": {"sellers": raw["sellers"]}}
+    for name, (fn, src) in DERIVED.items():
+        if name in CODE_ONLY:
+            continue
+        with timer.stage(name):
+            artifacts[name] = fn(artifacts[src] if src in artifacts else raw[src], **options.get(name, {}))
+    return artifacts
+
+
+def build_timings(raw, repeat):
+    """Durasi minimum per stage build + artefak hasil run terakhir."""
+    runs = []
+    for _ in range(repeat):
+        timer = StageTimer()
+        artifacts = build(raw, timer)
+        runs.append(timer.to_frame().set_index("stage")["seconds"])
+    return artifacts, pd.concat(runs, axis=1).min(axis=1)
+
+
+def id_ops(main_df, repeat):
+    ops = {
+        "nunique order_id":         lambda: main_df["order_id"].nunique(),
+        "nunique customer_unique_id": lambda: main_df["customer_unique_id"].nunique(),
+        "groupby customer (RFM)":   lambda: main_df.groupby("customer_unique_id").agg(
+            frequency=("order_id", "nunique"), monetary=("payment_value", "sum")),
+    }
+    return pd.Series({name: best_of(fn, repeat)[1] for name, fn in ops.items()})
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(prog="python -m benchmarks.bench_ids")
+    p.add_argument("--data", help="folder CSV mentah Olist (default: dataset sintetis)")
+    p.add_argument("--scale", type=float, default=1, help="skala dataset sintetis (default: 1)")
+    p.add_argument("--seed", type=int, default=42)
+    p.add_argument("--data-root", default=DATA_ROOT, help="folder dataset sintetis per skala")
+    p.add_argument("--repeat", type=int, default=3)
+    args = p.parse_args(argv)
+
+    raw = (load_raw(args.data) if args.data
+           else synthetic_raw(args.scale, args.data_root, args.seed, interned=False))
+    interned, t_intern = best_of(lambda: intern_ids(raw)[0], args.repeat)
+
+    str_art, str_t = build_timings(raw, args.repeat)
+    int_art, int_t = build_timings(interned, args.repeat)
+    stages = pd.DataFrame({"string (s)": str_t, "int32 (s)": int_t})
+    stages.loc["intern_ids"] = [0.0, t_intern]
+    stages.loc["TOTAL"] = stages.sum()
+    stages["speedup"] = (stages["string (s)"] / stages["int32 (s)"]).where(stages.index != "intern_ids")
+    print(stages.round(3).to_string(), end="\n\n")
+
+    ops = pd.DataFrame({"string (s)": id_ops(str_art["main_df"], args.repeat),
+                        "int32 (s)":  id_ops(int_art["main_df"], args.repeat)})
+    ops["speedup"] = ops["string (s)"] / ops["int32 (s)"]
+    print(ops.round(4).to_string(), end="\n\n")
+
+    mem = pd.DataFrame({
+        "string (MB)": str_art["main_df"].memory_usage(deep=True) / 2**20,
+        "int32 (MB)":  int_art["main_df"].memory_usage(deep=True) / 2**20,
+    })
+    mem = mem[mem["string (MB)"] != mem["int32 (MB)"]]
+    mem.loc["main_df (total)"] = [str_art["main_df"].memory_usage(deep=True).sum() / 2**20,
+                                  int_art["main_df"].memory_usage(deep=True).sum() / 2**20]
+    print(mem.round(2).to_string())
+
+
+if __name__ == "__main__":
+    main()
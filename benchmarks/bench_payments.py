@@ -0,0 +1,49 @@
+"""
+Benchmark agregasi payments: lambda mode() per order (notebook) vs top_category.
+
+Jalankan: python -m benchmarks.bench_payments [--scales 1 10 100]
+Input: order_payments dataset sintetis per skala (benchmarks.synth, ~4% order
+punya >1 baris payment sehingga seri mode ikut teruji). Versi lambda pada
+skala 100x memakan beberapa menit; aktifkan dengan --skip-legacy-above 100.
+"""
+
+import argparse
+
+import pandas as pd
+
+from benchmarks.common import DATA_ROOT, best_of, synthetic_raw
+from pipeline.build import aggregate_payments
+
+
+# ─── Referensi: kode notebook apa adanya ──────────────────────
+def aggregate_payments_legacy(payments_df):
+    return payments_df.groupby("order_id").agg(
+        payment_value=("payment_value", "sum"),
+        payment_type=("payment_type", lambda x: x.mode()[0]),
+    ).reset_index()
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(prog="python -m benchmarks.bench_payments")
+    p.add_argument("--scales", type=float, nargs="+", default=[1, 10])
+    p.add_argument("--seed", type=int, default=42)
+    p.add_argument("--data-root", default=DATA_ROOT, help="folder dataset sintetis per skala")
+    p.add_argument("--skip-legacy-above", type=int, default=10,
+                   help="lewati versi lambda di atas skala ini (terlalu lama)")
+    args = p.parse_args(argv)
+
+    print(f"{'scale':>6} {'orders':>11} {'rows':>11} {'legacy (s)':>11} {'vector (s)':>11} {'speedup':>8}")
+    for scale in args.scales:
+        payments = synthetic_raw(scale, args.data_root, args.seed, ["payments"])["payments"]
+        new, t_new = best_of(lambda: aggregate_payments(payments))
+        if scale <= args.skip_legacy_above:
+            old, t_old = best_of(lambda: aggregate_payments_legacy(payments))
+            pd.testing.assert_frame_equal(old, new)
+            legacy, speedup = f"{t_old:11.3f}", f"{t_old / t_new:7.1f}x"
+        else:
+            legacy, speedup = f"{'-':>11}", f"{'-':>8}"
+        print(f"{scale:>5g}x {len(new):>11,} {len(payments):>11,} {legacy} {t_new:11.3f} {speedup}")
+
+
+if __name__ == "__main__":
+    main()
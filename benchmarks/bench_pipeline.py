@@ -0,0 +1,180 @@
+"""
+Benchmark end-to-end pipeline + jalur data dashboard di atas dataset sintetis.
+
+Jalankan: python -m benchmarks.bench_pipeline [--scales 1 10 100] [--repeat 3]
+Dataset tiap skala dibuat sekali oleh benchmarks.synth di --data-root/x<skala>
+lalu dipakai ulang selama versi generator dan seed-nya sama. Setiap skala diukur di proses baru sehingga puncak RSS-nya
+terpisah. Yang diukur:
+- build: load CSV, intern ID, rantai join main_df (join_*), tabel turunan
+  (rfm_df, monthly_trend, payment_freq, delivery_review, cube, ...), tulis store;
+- dashboard: tiap halaman memuat tabelnya dari store (rentang penuh) dan
+  menghitung ulang untuk rentang FILTER_DAYS hari terakhir (cube / main_df);
+  halaman tren memuat seri harian lalu membentuk tren tiap granularitas;
+  halaman kohort memuat matriks lalu memotongnya untuk rentang yang sama;
+  halaman lookup membuka indeks lalu mencari LOOKUPS pelanggan.
+Hasil (durasi minimum per stage, throughput order/detik, puncak RSS) di-append
+ke --history agar regresi antar commit bisa dilacak.
+"""
+
+import argparse
+import multiprocessing
+import subprocess
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+
+from benchmarks.common import DATA_ROOT, ROOT, dataset
+from pipeline.build import build_all, write_artifacts
+from pipeline.buckets import GRANULARITIES, TimeBuckets
+from pipeline.cohort import CohortMatrix
+from pipeline.config import RFM_EDGES_FILE
+from pipeline.cube import DailyCube
+from pipeline.ids import intern_ids, load_ids, save_ids
+from pipeline.load import load_raw
+from pipeline.lookup import LOOKUP_COLUMNS, MainLookup
+from pipeline.query import MainQuery
+from pipeline.rfm import load_edges
+from pipeline.sellers import SELLER_METRICS, SellerBoard
+from pipeline.shared import SharedData
+from pipeline.timing import StageTimer, memory_snapshot
+
+# Tabel per halaman, sama dengan PAGES di dashboard/dashboard.py (tren, kohort, seller & lookup diukur terpisah)
+PAGES = {
+    "overview":   ["monthly_trend", "payment_freq", "overview"],
+    "revenue":    ["revenue_by_category"],
+    "rfm":        ["rfm_df"],
+    "metode":     ["payment_freq"],
+    "pengiriman": ["delivery_stats"],
+}
+CUBE_TABLES = {"overview", "revenue_by_category", "monthly_trend", "payment_freq"}
+MAIN_COLUMNS = ["order_id", "customer_unique_id", "order_purchase_timestamp",
+                "payment_value", "review_score", "delivery_days"]
+
+# Rentang Filter Tanggal yang diukur: N hari terakhir data
+FILTER_DAYS = 90
+
+# Jumlah pelanggan yang dicari di halaman lookup
+LOOKUPS = 100
+
+
+# ─── Satu skala (di proses terpisah) ──────────────────────────
+def dashboard_pages(root, timer):
+    """Jalur data setiap halaman: muat artefak + hitung ulang untuk rentang terfilter."""
+    data = SharedData(root)
+    with timer.stage("dash_init"):
+        query = MainQuery(data.frame("main_df", MAIN_COLUMNS), load_edges(Path(root) / RFM_EDGES_FILE))
+        cube = DailyCube(data.frame("daily_cube"), data.frame("cube_members"))
+    end = query.max.date()
+    start = end - pd.Timedelta(days=FILTER_DAYS)
+    for page, tables in PAGES.items():
+        with timer.stage(f"page_{page}"):
+            for name in tables:
+                if name != "overview":
+                    with timer.stage(f"{name}_full"):
+                        data.frame(name)
+                with timer.stage(f"{name}_window"):
+                    getattr(cube if name in CUBE_TABLES else query, name)(start, end)
+    with timer.stage("trend_init"):
+        trend = TimeBuckets(data.frame("daily_trend"))
+    with timer.stage("trend_window"):
+        for freq in GRANULARITIES:
+            trend.trend(freq, 3, start, end)
+    with timer.stage("cohort_init"):
+        cohort = CohortMatrix.from_table(data.frame("cohort_matrix"))
+    with timer.stage("cohort_window"):
+        for measure in ("customers", "retention", "revenue"):
+            cohort.frame(measure, start, end)
+    with timer.stage("seller_init"):
+        board = SellerBoard(data.frame("seller_scorecards"), load_ids(root))
+    with timer.stage("seller_rank"):
+        for metric in SELLER_METRICS:
+            for states in (None, board.states[-1:]):
+                board.rank(metric, 10, states, 10, largest=True)
+                board.rank(metric, 10, states, 10, largest=False)
+    with timer.stage("lookup_init"):
+        lookup = MainLookup(data.frame("main_df", LOOKUP_COLUMNS), data.frame("lookup_index"),
+                            load_ids(root), data.frame("rfm_df"))
+    customers = lookup.ids["customer_unique_id"]
+    with timer.stage("lookup_customers"):
+        for pos in range(0, len(customers), max(1, len(customers) // LOOKUPS)):
+            lookup.customer(customers[pos])
+
+
+def bench_scale(data_dir, repeat=1):
+    """Durasi minimum per stage dari `repeat` kali run + ringkasan skala."""
+    runs = []
+    for _ in range(repeat):
+        timer = StageTimer()
+        with timer.stage("load_raw"):
+            raw = load_raw(data_dir)
+        with timer.stage("intern_ids"):
+            raw, ids = intern_ids(raw)
+        with timer.stage("build"):
+            artifacts = build_all(raw, timer)
+        with tempfile.TemporaryDirectory(prefix="olist-bench-") as out:
+            with timer.stage("write_artifacts"):
+                write_artifacts(artifacts, out, formats=("parquet", "arrow"))
+                save_ids(ids, out)
+            dashboard_pages(out, timer)
+        runs.append(timer.to_frame())
+    # Urutan stage sama di setiap run (nama bisa berulang antar halaman): gabung per posisi
+    stages = runs[0].assign(seconds=pd.concat([r["seconds"] for r in runs], axis=1).min(axis=1))
+    meta = {"orders": len(raw["orders"]), "main_rows": len(artifacts["main_df"]),
+            "peak_rss_mb": memory_snapshot()["rss_peak_mb"]}
+    return stages, meta
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+# ─── Main ─────────────────────────────────────────────────────
+def main(argv=None):
+    p = argparse.ArgumentParser(prog="python -m benchmarks.bench_pipeline")
+    p.add_argument("--scales", type=float, nargs="+", default=[1, 10])
+    p.add_argument("--repeat", type=int, default=1)
+    p.add_argument("--seed", type=int, default=42)
+    p.add_argument("--data-root", default=DATA_ROOT,
+                   help="folder dataset sintetis per skala (default: benchmarks/data)")
+    p.add_argument("--history", default=ROOT / "benchmarks" / "history.csv",
+                   help="CSV riwayat hasil yang di-append setiap run")
+    args = p.parse_args(argv)
+
+    stamp, commit = pd.Timestamp.now().floor("s"), git_commit()
+    results, summary = [], []
+    for scale in args.scales:
+        data_dir = dataset(args.data_root, scale, args.seed)
+        # Proses baru per skala: puncak RSS tidak terbawa dari skala sebelumnya
+        with ProcessPoolExecutor(1, mp_context=multiprocessing.get_context("spawn")) as pool:
+            stages, meta = pool.submit(bench_scale, str(data_dir), args.repeat).result()
+        build = stages.loc[stages["depth"] == 0].set_index("stage")["seconds"]
+        build = build[["load_raw", "intern_ids", "build", "write_artifacts"]].sum()
+        summary.append({"scale": scale, **meta, "build_s": build, "orders_per_s": meta["orders"] / build})
+        results.append(stages.assign(time=stamp, commit=commit, scale=scale, orders=meta["orders"],
+                                     rows_per_s=meta["orders"] / stages["seconds"],
+                                     peak_rss_mb=meta["peak_rss_mb"]))
+
+    history = pd.concat(results, ignore_index=True)[
+        ["time", "commit", "scale", "orders", "stage", "depth", "seconds", "rows_per_s", "peak_rss_mb"]]
+    first = results[0]
+    table = pd.DataFrame({f"x{r['scale'].iat[0]:g} (s)": r["seconds"].to_numpy() for r in results},
+                         index=first["depth"].map(lambda depth: "  " * depth) + first["stage"])
+
+    print("\nDurasi per stage (minimum dari --repeat run)")
+    print(table.round(4).to_string())
+    print("\nRingkasan")
+    print(pd.DataFrame(summary).round(1).to_string(index=False))
+
+    history_path = Path(args.history)
+    history.to_csv(history_path, mode="a", header=not history_path.exists(), index=False)
+    print(f"\nRiwayat ditambahkan ke {history_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Benchmark RFM: implementasi per-baris notebook (apply) vs engine tervektorisasi.
+
+Jalankan: python -m benchmarks.bench_rfm [--scales 1 10 100]
+Input: main_df dataset sintetis per skala (benchmarks.synth). Versi apply pada
+skala 100x memakan ~10 menit; aktifkan dengan --skip-legacy-above 100.
+"""
+
+import argparse
+import datetime as dt
+
+import pandas as pd
+
+from benchmarks.common import DATA_ROOT, best_of, synthetic_main_df
+from pipeline.rfm import FIXED_EDGES, rfm_table
+
+
+# ─── Referensi: kode notebook apa adanya ──────────────────────
+def recency_score(x):
+    if x <= 114:   return 5
+    elif x <= 219: return 4
+    elif x <= 346: return 3
+    elif x <= 500: return 2
+    else:          return 1
+
+def frequency_score(x):
+    if x == 1:    return 1
+    elif x == 2:  return 2
+    elif x <= 3:  return 3
+    elif x <= 5:  return 4
+    else:         return 5
+
+def monetary_score(x):
+    if x <= 63.68:    return 1
+    elif x <= 112.83: return 2
+    elif x <= 201.13: return 3
+    elif x <= 500:    return 4
+    else:             return 5
+
+def rfm_segment(row):
+    r, f, m = row["R_score"], row["F_score"], row["M_score"]
+    if r >= 4 and f >= 4 and m >= 4:      return "Champions"
+    elif f >= 4 and m >= 3 and r >= 3:    return "Loyal Customers"
+    elif r >= 4 and (f <= 2 or m <= 2):   return "Promising"
+    elif r <= 2 and (f >= 3 or m >= 3):   return "At Risk"
+    else:                                 return "Lost"
+
+
+def rfm_legacy(main_df):
+    snapshot_date = main_df["order_purchase_timestamp"].max() + dt.timedelta(days=1)
+    rfm_df = main_df.groupby("customer_unique_id").agg(
+        recency=("order_purchase_timestamp", lambda x: (snapshot_date - x.max()).days),
+        frequency=("order_id", "nunique"),
+        monetary=("payment_value", "sum"),
+    ).reset_index()
+    rfm_df["R_score"] = rfm_df["recency"].apply(recency_score)
+    rfm_df["F_score"] = rfm_df["frequency"].apply(frequency_score)
+    rfm_df["M_score"] = rfm_df["monetary"].apply(monetary_score)
+    rfm_df["RFM_score"] = (
+        rfm_df["R_score"].astype(str) +
+        rfm_df["F_score"].astype(str) +
+        rfm_df["M_score"].astype(str)
+    )
+    rfm_df["segment"] = rfm_df.apply(rfm_segment, axis=1)
+    return rfm_df
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(prog="python -m benchmarks.bench_rfm")
+    p.add_argument("--scales", type=float, nargs="+", default=[1, 10])
+    p.add_argument("--seed", type=int, default=42)
+    p.add_argument("--data-root", default=DATA_ROOT, help="folder dataset sintetis per skala")
+    p.add_argument("--skip-legacy-above", type=int, default=10,
+                   help="lewati versi apply di atas skala ini (terlalu lama)")
+    args = p.parse_args(argv)
+
+    print(f"{'scale':>6} {'customers':>11} {'rows':>11} {'legacy (s)':>11} {'vector (s)':>11} {'speedup':>8}")
+    for scale in args.scales:
+        main_df = synthetic_main_df(scale, args.data_root, args.seed)
+        new, t_new = best_of(lambda: rfm_table(main_df, None, FIXED_EDGES))
+        if scale <= args.skip_legacy_above:
+            old, t_old = best_of(lambda: rfm_legacy(main_df))
+            pd.testing.assert_frame_equal(old, new)
+            legacy, speedup = f"{t_old:11.3f}", f"{t_old / t_new:7.1f}x"
+        else:
+            legacy, speedup = f"{'-':>11}", f"{'-':>8}"
+        print(f"{scale:>5g}x {len(new):>11,} {len(main_df):>11,} {legacy} {t_new:11.3f} {speedup}")
+
+
+if __name__ == "__main__":
+    main()
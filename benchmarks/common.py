@@ -0,0 +1,58 @@
+"""
+Utilitas bersama benchmark: pengukur waktu dan input dari dataset sintetis.
+
+Semua benchmark membaca input dari CSV `benchmarks.synth` per skala (dibuat
+sekali di --data-root lalu dipakai ulang selama stempel generatornya sama),
+sehingga distribusinya sama dengan yang diukur bench_pipeline.
+"""
+
+import time
+from pathlib import Path
+
+from benchmarks.synth import generate, read_stamp, stamp
+from pipeline.build import (aggregate_payments, aggregate_reviews, build_main_df, clean_orders,
+                            translate_products)
+from pipeline.config import RAW_FILES
+from pipeline.ids import intern_ids
+from pipeline.load import load_raw
+
+ROOT = Path(__file__).resolve().parent.parent
+DATA_ROOT = ROOT / "benchmarks" / "data"
+
+
+def best_of(fn, repeat=1):
+    """(hasil run terakhir, durasi minimum dari `repeat` kali `fn()`)."""
+    best, out = float("inf"), None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t0)
+    return out, best
+
+
+# ─── Dataset sintetis ─────────────────────────────────────────
+def dataset(data_root, scale, seed=42):
+    """Folder CSV sintetis untuk `scale`; dibuat ulang jika belum ada atau stempelnya beda.
+
+    Stempel (versi generator, skala, seed) mencegah benchmark berjalan di atas
+    data lama yang tidak lagi dihasilkan generator saat ini.
+    """
+    path = Path(data_root) / f"x{scale:g}"
+    if read_stamp(path) != stamp(scale, seed) or not all((path / f).exists() for f in RAW_FILES.values()):
+        print(f"membuat dataset x{scale:g} di {path} ...")
+        generate(path, scale, seed)
+    return path
+
+
+def synthetic_raw(scale, data_root=DATA_ROOT, seed=42, tables=None, interned=True):
+    """Tabel mentah (dict) dataset sintetis `scale`, ID di-intern seperti pipeline."""
+    raw = load_raw(dataset(data_root, scale, seed), tables)
+    return intern_ids(raw)[0] if interned else raw
+
+
+def synthetic_main_df(scale, data_root=DATA_ROOT, seed=42):
+    """main_df dataset sintetis `scale` (hanya join, tanpa tabel turunan)."""
+    raw = synthetic_raw(scale, data_root, seed)
+    return build_main_df(raw["order_items"], clean_orders(raw["orders"]), raw["customers"],
+                         translate_products(raw["products"], raw["translation"]),
+                         aggregate_payments(raw["payments"]), aggregate_reviews(raw["reviews"]))
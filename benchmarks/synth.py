@@ -0,0 +1,390 @@
+"""
+Generator dataset Olist sintetis dengan skema yang sama dengan CSV asli.
+
+Jalankan: python -m benchmarks.synth --scale 10 --out benchmarks/data/x10
+Skala 1 ≈ ukuran dataset publik (~99 ribu order); semua tabel ikut diskalakan.
+Kedelapan CSV yang dibaca pipeline ditulis, sehingga folder hasilnya bisa
+langsung dipakai sebagai --data pipeline/dashboard.
+
+Distribusinya meniru data asli secara kasar:
+- volume order naik dari akhir 2016 lalu mendatar di 2018, dengan lonjakan
+  Black Friday 2017 dan pola jam/hari;
+- ~3% pelanggan unik berbelanja lebih dari sekali;
+- popularitas produk, seller, dan kategori mengikuti power law;
+- negara bagian didominasi SP, waktu kirim lebih lama untuk negara bagian jauh;
+- order yang terlambat dari estimasi cenderung mendapat review score rendah.
+
+Order ditulis per chunk (`--chunk-orders`) sehingga skala 100x tidak perlu
+memuat seluruh tabel di memori. ID berupa 32 karakter hex hasil fungsi
+bijektif atas indeks baris, jadi unik tanpa menyimpan daftar ID.
+
+Setelah semua CSV selesai ditulis, parameter generator (VERSION, skala, seed,
+ukuran chunk) dicatat di synth.json; folder yang stempelnya berbeda dianggap
+basi dan dibuat ulang oleh benchmarks.common.dataset.
+"""
+
+import argparse
+import json
+import shutil
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from pipeline.config import DATA_PATH, RAW_FILES
+
+# Ukuran dataset publik (skala 1)
+BASE = {"orders": 99_441, "products": 32_951, "sellers": 3_095}
+
+CHUNK_ORDERS = 250_000
+
+# Naikkan setiap kali keluaran generator berubah untuk skala & seed yang sama
+VERSION = 2
+STAMP_FILE = "synth.json"
+
+START, END = pd.Timestamp("2016-09-04"), pd.Timestamp("2018-10-17")
+BLACK_FRIDAY = pd.Timestamp("2017-11-24")
+
+# Porsi order per negara bagian pelanggan dan rata-rata hari kirim ke sana
+STATES = {
+    "SP": (0.420, 8),  "RJ": (0.129, 15), "MG": (0.117, 12), "RS": (0.055, 15),
+    "PR": (0.051, 12), "SC": (0.037, 14), "BA": (0.034, 19), "DF": (0.022, 13),
+    "ES": (0.020, 15), "GO": (0.020, 15), "PE": (0.017, 18), "CE": (0.013, 21),
+    "PA": (0.010, 23), "MT": (0.009, 18), "MA": (0.008, 21), "MS": (0.007, 15),
+    "PB": (0.005, 20), "PI": (0.005, 19), "RN": (0.005, 19), "AL": (0.004, 24),
+    "SE": (0.003, 21), "TO": (0.003, 17), "RO": (0.003, 19), "AM": (0.002, 26),
+    "AC": (0.001, 21), "AP": (0.001, 27), "RR": (0.001, 29),
+}
+CITIES = {
+    "SP": ["sao paulo", "campinas", "guarulhos", "sorocaba", "ribeirao preto", "santos"],
+    "RJ": ["rio de janeiro", "niteroi", "nova iguacu", "sao goncalo"],
+    "MG": ["belo horizonte", "uberlandia", "contagem", "juiz de fora"],
+    "RS": ["porto alegre", "caxias do sul", "pelotas"],
+    "PR": ["curitiba", "londrina", "maringa"],
+    "SC": ["florianopolis", "joinville", "blumenau"],
+    "BA": ["salvador", "feira de santana"],
+    "DF": ["brasilia"], "ES": ["vitoria", "vila velha"], "GO": ["goiania"],
+    "PE": ["recife"], "CE": ["fortaleza"], "PA": ["belem"], "MT": ["cuiaba"],
+    "MA": ["sao luis"], "MS": ["campo grande"], "PB": ["joao pessoa"], "PI": ["teresina"],
+    "RN": ["natal"], "AL": ["maceio"], "SE": ["aracaju"], "TO": ["palmas"],
+    "RO": ["porto velho"], "AM": ["manaus"], "AC": ["rio branco"], "AP": ["macapa"],
+    "RR": ["boa vista"],
+}
+ORDER_STATUS = {"delivered": 0.970, "shipped": 0.011, "canceled": 0.0063, "unavailable": 0.0061,
+                "invoiced": 0.0032, "processing": 0.0030, "created": 0.0002, "approved": 0.0002}
+PAYMENT_TYPES = {"credit_card": 0.739, "boleto": 0.190, "voucher": 0.056, "debit_card": 0.015}
+REVIEW_ON_TIME = [0.07, 0.02, 0.07, 0.20, 0.64]
+REVIEW_LATE = [0.46, 0.08, 0.12, 0.14, 0.20]
+REVIEW_TITLES = ["recomendo", "otimo", "muito bom", "bom", "nao recebi", "produto errado"]
+REVIEW_MESSAGES = ["produto chegou antes do prazo", "gostei muito, recomendo",
+                   "ainda nao recebi o produto", "veio com defeito", "entrega rapida e produto bom"]
+
+
+# ─── ID & distribusi ──────────────────────────────────────────
+HEX = np.frombuffer(b"0123456789abcdef", dtype=np.uint8)
+
+
+def _mix(x):
+    """Finalizer splitmix64 (bijektif di uint64)."""
+    with np.errstate(over="ignore"):
+        x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        return x ^ (x >> np.uint64(31))
+
+
+def hex_ids(index, salt):
+    """ID hex 32 karakter untuk indeks baris; unik per (indeks, salt)."""
+    i = np.asarray(index, dtype=np.uint64)
+    with np.errstate(over="ignore"):
+        hi = _mix(i + np.uint64(salt) * np.uint64(0x9E3779B97F4A7C15))
+        lo = _mix(hi ^ np.uint64(salt))
+    raw = np.stack([hi, lo], axis=1).astype(">u8").view(np.uint8).reshape(len(i), 16)
+    out = np.empty((len(i), 32), dtype=np.uint8)
+    out[:, 0::2], out[:, 1::2] = HEX[raw >> 4], HEX[raw & 15]
+    return out.view("S32").ravel().astype("U32")
+
+
+def _uniform(index, salt):
+    """Bilangan [0, 1) deterministik per indeks (atribut tetap per pelanggan/produk)."""
+    with np.errstate(over="ignore"):
+        x = _mix(np.asarray(index, dtype=np.uint64) + np.uint64(salt) * np.uint64(0xD1B54A32D192ED03))
+    return (x >> np.uint64(11)).astype(np.float64) / 2.0**53
+
+
+def zipf_weights(n, s=1.1, offset=10):
+    w = 1.0 / (np.arange(n) + offset) ** s
+    return w / w.sum()
+
+
+def _pick(u, probs):
+    """Indeks kategori untuk u ∈ [0, 1) menurut peluang `probs`."""
+    cdf = np.cumsum(probs)
+    return np.minimum(np.searchsorted(cdf / cdf[-1], u, side="right"), len(probs) - 1)
+
+
+def daily_weights():
+    """Bobot relatif order per hari: tumbuh lalu mendatar, plus Black Friday."""
+    days = pd.date_range(START, END, freq="D")
+    t = np.arange(len(days)) / len(days)
+    w = np.clip(t / 0.55, 0.02, 1.0) * np.where(days.dayofweek < 5, 1.0, 0.75)
+    w[days == BLACK_FRIDAY] *= 5
+    return days, w / w.sum()
+
+
+HOUR_WEIGHTS = np.array([3, 1.5, 0.8, 0.5, 0.4, 0.5, 1, 2.5, 5, 7, 8.5, 8.5,
+                         8, 8.5, 8.5, 8, 8, 7.5, 7, 7, 8, 8, 7.5, 5.5])
+
+
+def _timestamps(t):
+    return pd.Series(t).dt.floor("s")
+
+
+# ─── Tabel dimensi ────────────────────────────────────────────
+def category_names(data_path=DATA_PATH):
+    """Nama kategori dari file translasi repo + dua kategori yang tidak ada terjemahannya."""
+    names = pd.read_csv(Path(data_path) / RAW_FILES["translation"], encoding="utf-8-sig")
+    return list(names.iloc[:, 0]) + ["pc_gamer", "portateis_cozinha_e_preparadores_de_alimentos"]
+
+
+def make_sellers(n, rng):
+    seller_states = list(STATES)
+    p = np.array([v[0] for v in STATES.values()])
+    p[0] *= 2.5  # seller jauh lebih terpusat di SP daripada pelanggan
+    state = np.array(seller_states)[rng.choice(len(p), n, p=p / p.sum())]
+    return pd.DataFrame({
+        "seller_id":              hex_ids(np.arange(n), 5),
+        "seller_zip_code_prefix": rng.integers(1000, 99990, n),
+        "seller_city":            [CITIES[s][0] for s in state],
+        "seller_state":           state,
+    })
+
+
+def make_products(n, n_sellers, categories, rng):
+    """Produk + harga dasar & seller utama (dipakai saat membuat order_items)."""
+    cat = np.array(categories, dtype=object)[rng.choice(len(categories), n, p=zipf_weights(len(categories), 1.2, 3))]
+    cat[rng.random(n) < 0.0185] = np.nan
+    weight = np.round(rng.lognormal(6.6, 1.2, n)).clip(2, 40_425)
+    size = np.round(rng.lognormal(3.0, 0.5, (n, 3))).clip(2, 105)
+    products = pd.DataFrame({
+        "product_id":                 hex_ids(np.arange(n), 4),
+        "product_category_name":      cat,
+        "product_name_lenght":        rng.integers(5, 77, n),
+        "product_description_lenght": rng.lognormal(6.4, 0.7, n).astype(int).clip(4, 3992),
+        "product_photos_qty":         rng.choice([1, 2, 3, 4, 5, 6], n, p=[.5, .2, .12, .08, .06, .04]),
+        "product_weight_g":           weight,
+        "product_length_cm":          size[:, 0],
+        "product_height_cm":          size[:, 1],
+        "product_width_cm":           size[:, 2],
+    })
+    price = np.round(rng.lognormal(4.1, 1.0, n).clip(0.85, 6735), 2)
+    seller = rng.choice(n_sellers, n, p=zipf_weights(n_sellers, 1.0, 20))
+    return products, price, weight, seller
+
+
+# ─── Tabel fakta (per chunk order) ────────────────────────────
+def make_orders(lo, hi, n_unique, rng, days, day_p):
+    """orders + customers untuk order [lo, hi); hasil juga jumlah pelanggan unik terbaru."""
+    n = hi - lo
+    idx = np.arange(lo, hi)
+    # ~3% order berasal dari pelanggan yang sudah pernah berbelanja
+    # Pelanggan yang sudah ada sebelum tiap order, termasuk yang dibuat lebih awal di chunk yang sama
+    repeat = rng.random(n) < 0.03
+    existing = n_unique + np.cumsum(~repeat) - ~repeat
+    repeat &= existing > 0
+    existing = n_unique + np.cumsum(~repeat) - ~repeat
+    unique = np.where(repeat, (rng.random(n) * existing).astype(np.int64), existing)
+    n_unique += int((~repeat).sum())
+
+    state_names = np.array(list(STATES))
+    state_i = _pick(_uniform(unique, 1), np.array([v[0] for v in STATES.values()]))
+    state = state_names[state_i]
+    city_u = _uniform(unique, 2)
+    city = np.array([CITIES[s][min(int(u ** 2 * len(CITIES[s])), len(CITIES[s]) - 1)]
+                     for s, u in zip(state, city_u)])
+    customers = pd.DataFrame({
+        "customer_id":              hex_ids(idx, 1),
+        "customer_unique_id":       hex_ids(unique, 2),
+        "customer_zip_code_prefix": (_uniform(unique, 3) * 98_990 + 1000).astype(int),
+        "customer_city":            city,
+        "customer_state":           state,
+    })
+
+    purchase = (days[rng.choice(len(days), n, p=day_p)].to_numpy()
+                + pd.to_timedelta(rng.choice(24, n, p=HOUR_WEIGHTS / HOUR_WEIGHTS.sum()), unit="h").to_numpy()
+                + pd.to_timedelta(rng.integers(0, 3600, n), unit="s").to_numpy())
+    status = np.array(list(ORDER_STATUS))[rng.choice(len(ORDER_STATUS), n, p=_norm(ORDER_STATUS))]
+    ship_days = np.array([v[1] for v in STATES.values()])[state_i]
+    approved = purchase + pd.to_timedelta(rng.exponential(10, n), unit="h").to_numpy()
+    carrier = approved + pd.to_timedelta(rng.gamma(2, 1.4, n), unit="D").to_numpy()
+    delivered = carrier + pd.to_timedelta(rng.gamma(2.2, ship_days / 2.2 * 0.85), unit="D").to_numpy()
+    estimated = (purchase + pd.to_timedelta(ship_days + rng.integers(8, 18, n), unit="D").to_numpy())
+
+    shipped = np.isin(status, ["delivered", "shipped"])
+    orders = pd.DataFrame({
+        "order_id":                      hex_ids(idx, 3),
+        "customer_id":                   customers["customer_id"],
+        "order_status":                  status,
+        "order_purchase_timestamp":      _timestamps(purchase),
+        "order_approved_at":             _timestamps(approved).where(rng.random(n) > 0.0016),
+        "order_delivered_carrier_date":  _timestamps(carrier).where(shipped),
+        "order_delivered_customer_date": _timestamps(delivered).where((status == "delivered")
+                                                                      & (rng.random(n) > 0.0003)),
+        "order_estimated_delivery_date": pd.Series(estimated).dt.floor("D"),
+    })
+    return orders, customers, n_unique
+
+
+def _norm(probs):
+    p = np.array(list(probs.values()))
+    return p / p.sum()
+
+
+def make_items(orders, products, rng):
+    """order_items: sebagian besar satu item; item tambahan sering produk yang sama."""
+    price, weight, seller = products
+    n_products, n_sellers = len(price), seller.max() + 1
+    n = len(orders)
+    count = rng.choice(np.arange(1, 9), n, p=[.900, .076, .013, .005, .003, .002, .0006, .0004])
+    order_pos = np.repeat(np.arange(n), count)
+    item_no = np.arange(len(order_pos)) - np.repeat(np.cumsum(count) - count, count) + 1
+
+    first = rng.choice(n_products, n, p=zipf_weights(n_products, 0.9, 50))
+    other = rng.choice(n_products, len(order_pos), p=zipf_weights(n_products, 0.9, 50))
+    same = (item_no == 1) | (rng.random(len(order_pos)) < 0.6)
+    product = np.where(same, first[order_pos], other)
+    seller_i = np.where(rng.random(len(order_pos)) < 0.9, seller[product],
+                        rng.integers(0, n_sellers, len(order_pos)))
+    approved = orders["order_approved_at"].fillna(orders["order_purchase_timestamp"]).to_numpy()
+    return pd.DataFrame({
+        "order_id":            orders["order_id"].to_numpy()[order_pos],
+        "order_item_id":       item_no,
+        "product_id":          hex_ids(product, 4),
+        "seller_id":           hex_ids(seller_i, 5),
+        "shipping_limit_date": _timestamps(approved[order_pos] + np.timedelta64(6, "D")),
+        "price":               price[product],
+        "freight_value":       np.round(7 + weight[product] / 1000 * 1.8 + rng.gamma(2, 3, len(order_pos)), 2),
+    })
+
+
+def make_payments(orders, items, rng):
+    """Total item + ongkir dibagi ke 1–3 baris payment; baris tambahan umumnya voucher."""
+    total = (items.groupby("order_id", sort=False)[["price", "freight_value"]].sum().sum(axis=1)
+             .reindex(orders["order_id"]).fillna(0).to_numpy())
+    n = len(orders)
+    rows = rng.choice([1, 2, 3], n, p=[.97, .02, .01])
+    order_pos = np.repeat(np.arange(n), rows)
+    seq = np.arange(len(order_pos)) - np.repeat(np.cumsum(rows) - rows, rows) + 1
+    share = rng.dirichlet([4, 1, 1], n)
+    share = np.where(rows[:, None] == 1, [1, 0, 0], share)
+    share = np.where(rows[:, None] == 2, share / share[:, :2].sum(axis=1, keepdims=True), share)
+    value = np.round(total[order_pos] * share[order_pos, seq - 1], 2)
+
+    ptype = np.array(list(PAYMENT_TYPES))[rng.choice(len(PAYMENT_TYPES), len(order_pos), p=_norm(PAYMENT_TYPES))]
+    ptype = np.where(seq > 1, np.where(rng.random(len(order_pos)) < 0.9, "voucher", ptype), ptype)
+    installments = np.where(ptype == "credit_card",
+                            rng.choice([1, 2, 3, 4, 5, 6, 8, 10, 12], len(order_pos),
+                                       p=[.48, .12, .10, .08, .06, .05, .04, .05, .02]), 1)
+    return pd.DataFrame({
+        "order_id":             orders["order_id"].to_numpy()[order_pos],
+        "payment_sequential":   seq,
+        "payment_type":         ptype,
+        "payment_installments": installments,
+        "payment_value":        value,
+    })
+
+
+def make_reviews(orders, lo, rng):
+    """Satu review per order (~99%), ~1% order punya dua; order terlambat → skor rendah."""
+    n = len(orders)
+    delivered = orders["order_delivered_customer_date"]
+    late = (delivered > orders["order_estimated_delivery_date"]).to_numpy()
+    undelivered = delivered.isna().to_numpy()
+    has = rng.random(n) > 0.008
+    pos = np.flatnonzero(has)
+    pos = np.sort(np.concatenate([pos, pos[rng.random(len(pos)) < 0.01]]))
+    m = len(pos)
+
+    u = rng.random(m)
+    score = np.where(late[pos] | undelivered[pos], _pick(u, REVIEW_LATE), _pick(u, REVIEW_ON_TIME)) + 1
+    created = delivered.fillna(orders["order_estimated_delivery_date"]).to_numpy()[pos]
+    created = pd.Series(created + pd.to_timedelta(rng.integers(0, 3, m), unit="D").to_numpy()).dt.floor("D")
+    title = np.where(rng.random(m) < 0.12, np.array(REVIEW_TITLES)[rng.integers(0, len(REVIEW_TITLES), m)], None)
+    message = np.where(rng.random(m) < 0.41, np.array(REVIEW_MESSAGES)[rng.integers(0, len(REVIEW_MESSAGES), m)], None)
+    return pd.DataFrame({
+        "review_id":               hex_ids(lo + np.arange(m), 6),
+        "order_id":                orders["order_id"].to_numpy()[pos],
+        "review_score":            score,
+        "review_comment_title":    title,
+        "review_comment_message":  message,
+        "review_creation_date":    created,
+        "review_answer_timestamp": _timestamps(created + pd.to_timedelta(rng.exponential(2.5, m), unit="D")),
+    })
+
+
+# ─── Orkestrasi ───────────────────────────────────────────────
+def stamp(scale=1.0, seed=42, chunk_orders=CHUNK_ORDERS):
+    """Parameter yang menentukan isi dataset sintetis."""
+    return {"version": VERSION, "scale": float(scale), "seed": int(seed), "chunk_orders": int(chunk_orders)}
+
+
+def read_stamp(out):
+    """Stempel di folder `out`, atau None jika belum ada (dataset belum lengkap)."""
+    path = Path(out) / STAMP_FILE
+    return json.loads(path.read_text()) if path.exists() else None
+
+
+def generate(out, scale=1.0, seed=42, chunk_orders=CHUNK_ORDERS, data_path=DATA_PATH):
+    """Tulis dataset sintetis ke `out`; hasil: dict nama tabel → jumlah baris."""
+    out = Path(out)
+    out.mkdir(parents=True, exist_ok=True)
+    rng = np.random.default_rng([seed, 0])
+    n_orders = max(int(BASE["orders"] * scale), 1)
+    n_products = max(int(BASE["products"] * scale), 1)
+    n_sellers = max(int(BASE["sellers"] * scale), 1)
+
+    shutil.copyfile(Path(data_path) / RAW_FILES["translation"], out / RAW_FILES["translation"])
+    sellers = make_sellers(n_sellers, rng)
+    sellers.to_csv(out / RAW_FILES["sellers"], index=False)
+    products, price, weight, seller = make_products(n_products, n_sellers, category_names(data_path), rng)
+    products.to_csv(out / RAW_FILES["products"], index=False)
+    counts = {"translation": None, "sellers": n_sellers, "products": n_products}
+
+    days, day_p = daily_weights()
+    n_unique = 0
+    for chunk_no, lo in enumerate(range(0, n_orders, chunk_orders)):
+        hi = min(lo + chunk_orders, n_orders)
+        rng = np.random.default_rng([seed, chunk_no + 1])
+        orders, customers, n_unique = make_orders(lo, hi, n_unique, rng, days, day_p)
+        items = make_items(orders, (price, weight, seller), rng)
+        tables = {
+            "orders":      orders,
+            "customers":   customers,
+            "order_items": items,
+            "payments":    make_payments(orders, items, rng),
+            "reviews":     make_reviews(orders, lo, rng),
+        }
+        for name, df in tables.items():
+            df.to_csv(out / RAW_FILES[name], mode="a" if lo else "w", header=not lo, index=False)
+            counts[name] = counts.get(name, 0) + len(df)
+    (out / STAMP_FILE).write_text(json.dumps(stamp(scale, seed, chunk_orders), indent=2))
+    return counts
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(prog="python -m benchmarks.synth")
+    p.add_argument("--scale", type=float, default=1.0, help="kelipatan ukuran dataset publik (default: 1)")
+    p.add_argument("--out", required=True, help="folder tujuan CSV")
+    p.add_argument("--seed", type=int, default=42)
+    p.add_argument("--chunk-orders", type=int, default=CHUNK_ORDERS, help="order per chunk tulis")
+    args = p.parse_args(argv)
+
+    t0 = time.perf_counter()
+    counts = generate(args.out, args.scale, args.seed, args.chunk_orders)
+    for name, n in counts.items():
+        print(f"{name:<12} {'disalin' if n is None else f'{n:>12,}'}")
+    print(f"selesai dalam {time.perf_counter() - t0:.1f} s → {args.out}")
+
+
+if __name__ == "__main__":
+    main()
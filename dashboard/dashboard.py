@@ -3,6 +3,11 @@ Dashboard Analisis: Brazilian E-Commerce Public Dataset
 Jalankan: streamlit run dashboard.py
 """
 
+import json
+import sys
+import time
+from pathlib import Path
+
 import streamlit as st
 import pandas as pd
 import numpy as np
@@ -10,6 +15,26 @@ import matplotlib.pyplot as plt
 import matplotlib.ticker as mticker
 import warnings
 
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from pipeline.buckets import GRANULARITIES, TimeBuckets
+from pipeline.cohort import CohortMatrix
+from pipeline.config import RFM_EDGES_FILE
+from pipeline.cube import DailyCube
+from pipeline.delivery import TOTAL as DELIVERY_TOTAL, DailyMoments, delivery_labels
+from pipeline.figcache import FigureCache, fingerprint, render
+from pipeline.hll import relative_error
+from pipeline.ids import load_ids
+from pipeline.lookup import LOOKUP_COLUMNS, MainLookup
+from pipeline.query import NEW_SEGMENT, MainQuery
+from pipeline.rfm import load_edges
+from pipeline.sellers import SELLER_METRICS, SellerBoard
+from pipeline.shared import SharedData
+from pipeline.store import read_table
+from pipeline.timing import StageTimer, memory_snapshot
+
 warnings.filterwarnings("ignore")
 
 # ─── Page Config ──────────────────────────────────────────────
@@ -20,6 +45,47 @@ st.set_page_config(
     initial_sidebar_state="expanded",
 )
 
+# ─── Instrumentasi ────────────────────────────────────────────
+# Timer baru per rerun. Durasi selalu dicatat (murah); panel debug dan jejak
+# memori (tracemalloc, lebih lambat) hanya aktif lewat sidebar.
+RUN_START = time.perf_counter()
+timer = StageTimer(trace_memory=st.session_state.get("debug_memory", False))
+# Jumlah rerun terakhir yang disimpan per sesi untuk ekspor CSV
+TIMING_HISTORY = 50
+# Konteks rerun untuk panel debug (diisi setelah sidebar)
+run_context = {"page": None, "start": None, "end": None, "approx": False}
+
+def debug_panel():
+    """Rincian waktu rerun ini (load, window, agregasi, render) + snapshot memori di sidebar."""
+    page, start, end, approx = (run_context[k] for k in ("page", "start", "end", "approx"))
+    with st.sidebar:
+        with st.expander("Debug: timing & memori"):
+            st.toggle("Jejak memori (tracemalloc)", key="debug_memory",
+                      help="Catat puncak alokasi per span. Memperlambat rerun; berlaku mulai rerun berikutnya.")
+            run_ms = (time.perf_counter() - RUN_START) * 1000
+            timings = timer.to_frame().assign(ms=lambda d: d["seconds"] * 1000).drop(columns="seconds")
+            mem = memory_snapshot()
+            st.caption(f"Rerun {run_ms:.0f} ms · halaman: {page}"
+                       + (f" · puncak RSS {mem['rss_peak_mb']:.0f} MB" if mem["rss_peak_mb"] else ""))
+            st.dataframe(timings, hide_index=True, width="stretch")
+
+            run = {"time": pd.Timestamp.now().isoformat(), "page": page, "start": start, "end": end,
+                   "approx": approx, "run_ms": run_ms, "memory": mem,
+                   "spans": timings.to_dict("records")}
+            history = st.session_state.setdefault("timing_history", [])
+            history.append(timings.assign(run=run["time"], page=page, run_ms=run_ms))
+            del history[:-TIMING_HISTORY]
+            st.download_button("Ekspor rerun ini (JSON)", json.dumps(run, default=str, indent=2),
+                               file_name="timing.json", mime="application/json")
+            st.download_button(f"Ekspor {len(history)} rerun terakhir (CSV)",
+                               pd.concat(history, ignore_index=True).to_csv(index=False),
+                               file_name="timing.csv", mime="text/csv")
+
+def stop():
+    """st.stop() yang tetap menampilkan panel debug untuk rerun yang berhenti lebih awal."""
+    debug_panel()
+    st.stop()
+
 # ─── Color Palette ────────────────────────────────────────────
 C = {
     "bg":       "#F7F9FC",
@@ -245,22 +311,120 @@ def fig_row(ncols, w=14, h=4.5):
 
 
 # ─── Data Loading ─────────────────────────────────────────────
+# Sumber data dashboard: nama → (artefak, kolom yang dibaca; None = semua).
+# Tidak ada yang dimuat di awal skrip; setiap sumber dimuat saat pertama diminta.
+SOURCES = {
+    "revenue_by_category": ("revenue_by_category", None),
+    "rfm_df":              ("rfm_df", ["customer_unique_id", "recency", "frequency", "monetary", "segment"]),
+    "monthly_trend":       ("monthly_trend", None),
+    "daily_trend":         ("daily_trend", None),
+    "payment_freq":        ("payment_freq", None),
+    "delivery_review":     ("delivery_review", ["order_id", "delivery_days", "review_score", "delivery_category"]),
+    "delivery_stats":      ("delivery_stats", None),
+    "delivery_moments":    ("delivery_moments", None),
+    "daily_cube":          ("daily_cube", None),
+    "cube_members":        ("cube_members", None),
+    "distinct_sketches":   ("distinct_sketches", None),
+    "cohort_matrix":       ("cohort_matrix", None),
+    "seller_scorecards":   ("seller_scorecards", None),
+    "main_df":             ("main_df", ["order_id", "customer_unique_id", "order_purchase_timestamp",
+                                        "payment_value", "review_score", "delivery_days"]),
+    "lookup_main":         ("main_df", LOOKUP_COLUMNS),
+    "lookup_index":        ("lookup_index", None),
+    # Hanya kolom waktu main_df: batas Filter Tanggal di setiap halaman
+    "timeline":            ("main_df", ["order_purchase_timestamp"]),
+}
+
+# Tabel yang dirender tiap halaman (urutan = urutan menu)
+PAGES = {
+    "Overview":                   ["monthly_trend", "payment_freq", "overview"],
+    "Revenue per Kategori":       ["revenue_by_category"],
+    "Segmentasi Pelanggan (RFM)": ["rfm_df"],
+    # Tren dijawab dari seri harian (trend_buckets) untuk granularitas & rentang apa pun
+    "Tren Bulanan":               [],
+    "Metode Pembayaran":          ["payment_freq"],
+    "Pengiriman & Kepuasan":      ["delivery_stats"],
+    # Kohort dipotong dari matriks penuh (cohort_matrix), tidak dihitung ulang per rentang
+    "Kohort Retensi":             [],
+    # Peringkat dari scorecard per seller (seller_board), sepanjang histori
+    "Performa Seller":            [],
+    # Lookup memakai indeks sendiri (main_lookup), bukan tabel per rentang
+    "Cari Pelanggan & Order":     [],
+}
+
+@st.cache_resource
+def shared_data():
+    # Satu accessor per proses; buffer Arrow di-map bersama antar proses
+    return SharedData(ROOT / "dashboard")
+
 @st.cache_data
-def load():
+def read_cached(name, columns=None):
+    return read_table(name, columns, root=ROOT / "dashboard")
+
+def load_table(name, columns=None):
+    data = shared_data()
+    if data.has(name):
+        return data.frame(name, columns)
+    return read_cached(name, columns)
+
+def source(name):
     try:
-        return (
-            pd.read_csv("dashboard/revenue_by_category.csv"), 
-            pd.read_csv("dashboard/rfm_df.csv"),              
-            pd.read_csv("dashboard/monthly_trend.csv"),       
-            pd.read_csv("dashboard/payment_freq.csv"),        
-            pd.read_csv("dashboard/delivery_review.csv"),     
-            pd.read_csv("dashboard/main_df.csv", parse_dates=["order_purchase_timestamp"]) 
-        )
+        with timer.stage(f"load_{name}"):
+            return load_table(*SOURCES[name])
     except FileNotFoundError as e:
-        st.error(f"File tidak ditemukan: {e}\nJalankan notebook terlebih dahulu.")
-        st.stop()
+        st.error(f"File tidak ditemukan: {e}\nJalankan `python -m pipeline` terlebih dahulu.")
+        stop()
+
+timeline = MainQuery(source("timeline"))
+# `version` (jumlah baris + timestamp terakhir) membatalkan cache setelah refresh
+version = (len(timeline.window()), timeline.max)
+
+@st.cache_resource(max_entries=1)
+def main_query(version):
+    return MainQuery(source("main_df"), load_edges(ROOT / "dashboard" / RFM_EDGES_FILE))
 
-rev_df, rfm_df, mo_df, pay_df, del_df, main_df = load()
+@st.cache_resource(max_entries=1)
+def daily_cube(version):
+    return DailyCube(source("daily_cube"), source("cube_members"))
+
+@st.cache_resource(max_entries=1)
+def delivery_moments(version):
+    return DailyMoments(source("delivery_moments"))
+
+@st.cache_resource(max_entries=1)
+def trend_buckets(version):
+    return TimeBuckets(source("daily_trend"))
+
+@st.cache_resource(max_entries=1)
+def cohort_matrix(version):
+    return CohortMatrix.from_table(source("cohort_matrix"))
+
+@st.cache_resource(max_entries=1)
+def seller_board(version):
+    return SellerBoard(source("seller_scorecards"), load_ids(ROOT / "dashboard"))
+
+@st.cache_resource(max_entries=1)
+def main_lookup(version):
+    return MainLookup(source("lookup_main"), source("lookup_index"), load_ids(ROOT / "dashboard"),
+                      source("rfm_df"))
+
+def cube_source(use_hll=False):
+    cube = daily_cube(version)
+    if use_hll and not cube.has_sketches:
+        # Sketch HLL hanya dimuat setelah toggle diaktifkan pertama kali
+        cube.add_sketches(source("distinct_sketches"))
+    return cube
+
+# Tabel agregat dijawab dari cube; RFM & pengiriman butuh baris per pelanggan/order
+CUBE_TABLES = {"overview", "revenue_by_category", "monthly_trend", "payment_freq"}
+
+@st.cache_data(max_entries=64)
+def window_table(_source, name, start, end, version, approx=False):
+    return getattr(_source, name)(start, end, **({"approx": True} if approx else {}))
+
+@st.cache_data(max_entries=16)
+def rfm_migration(_query, start, before, end, version):
+    return _query.rfm_migration(start, before, end)
 
 # ─── Sidebar ──────────────────────────────────────────────────
 with st.sidebar:
@@ -272,23 +436,15 @@ with st.sidebar:
 
     st.divider()
 
-    page = st.radio("Halaman", [
-        "Overview",
-        "Revenue per Kategori",
-        "Segmentasi Pelanggan (RFM)",
-        "Tren Bulanan",
-        "Metode Pembayaran",
-        "Pengiriman & Kepuasan",
-    ], label_visibility="collapsed")
+    page = st.radio("Halaman", list(PAGES), label_visibility="collapsed")
 
     st.divider()
 
-    if "order_purchase_timestamp" in main_df.columns:
-        mn = main_df["order_purchase_timestamp"].min().date()
-        mx = main_df["order_purchase_timestamp"].max().date()
-        dr = st.date_input("Filter Tanggal", [mn, mx], min_value=mn, max_value=mx)
-    else:
-        dr = None
+    mn, mx = timeline.min.date(), timeline.max.date()
+    dr = st.date_input("Filter Tanggal", [mn, mx], min_value=mn, max_value=mx)
+    approx = st.toggle("Hitung unik via HLL", value=False,
+                       help=f"Order/pelanggan unik diestimasi dari sketch HyperLogLog "
+                            f"(galat relatif ±{relative_error():.1%}, 1σ). Nonaktif = exact.")
 
     st.divider()
     st.markdown(f"""
@@ -298,14 +454,51 @@ with st.sidebar:
         Kaggle Public Dataset
     </div>""", unsafe_allow_html=True)
 
-# Date filter
-if dr and len(dr) == 2:
-    mf = main_df[
-        (main_df["order_purchase_timestamp"] >= pd.Timestamp(dr[0])) &
-        (main_df["order_purchase_timestamp"] <= pd.Timestamp(dr[1]))
-    ]
-else:
-    mf = main_df
+# Date filter — rentang penuh memakai artefak build, selain itu tabel halaman
+# dihitung ulang untuk rentang tersebut (prefix sum cube / slice main_df)
+start, end = (dr[0], dr[1]) if dr and len(dr) == 2 else (None, None)
+filtered = not timeline.is_full(start, end)
+run_context.update(page=page, start=start, end=end, approx=approx)
+if filtered and timeline.window(start, end).empty:
+    st.warning("Tidak ada transaksi pada rentang tanggal yang dipilih.")
+    stop()
+
+def page_table(name):
+    """Tabel halaman: artefak build untuk rentang penuh, selain itu dihitung dari cube/main_df."""
+    use_hll = approx and name in CUBE_TABLES
+    if not filtered and not use_hll and name in SOURCES:
+        return source(name)
+    with timer.stage(f"window_{name}"):
+        src = cube_source(use_hll) if name in CUBE_TABLES else main_query(version)
+        return window_table(src, name, start, end, version, use_hll)
+
+def page_tables(page):
+    """Hanya tabel yang dideklarasikan halaman di PAGES yang dimuat/dihitung."""
+    return {name: page_table(name) for name in PAGES[page]}
+
+@st.cache_resource
+def figure_cache():
+    # Satu cache gambar per proses, dipakai bersama semua sesi
+    return FigureCache()
+
+figures = figure_cache()
+
+def show_chart(chart_id, draw, *data):
+    """Tampilkan grafik dari cache gambar; `draw()` (→ fig) hanya dijalankan saat data/filter berubah."""
+    with timer.stage(f"chart_{chart_id}"):
+        key = (page, chart_id, fingerprint(*data), start, end, approx)
+        image = figures.get(key)
+        if image is None:
+            with timer.stage(f"render_{chart_id}"):
+                fig = draw()
+                fig.tight_layout()
+                image = render(fig)
+                plt.close(fig)
+            figures.put(key, image)
+        st.image(image, width="stretch")
+
+# Catatan KPI hitungan unik saat mode HLL aktif
+distinct_note = f"≈ ±{relative_error():.1%} (HLL)" if approx else ""
 
 
 # ══════════════════════════════════════════════════════════════
@@ -315,18 +508,16 @@ if page == "Overview":
     st.markdown('<div class="page-title">Overview</div>', unsafe_allow_html=True)
     st.markdown('<div class="page-sub">Ringkasan performa bisnis Olist E-Commerce</div>', unsafe_allow_html=True)
 
-    total_rev   = mf["revenue"].sum()
-    total_ord   = mf["order_id"].nunique()
-    total_cust  = mf["customer_unique_id"].nunique() if "customer_unique_id" in mf.columns else 0
-    avg_score   = mf["review_score"].mean() if "review_score" in mf.columns else 0
-    avg_del     = mf["delivery_days"].mean() if "delivery_days" in mf.columns else 0
-    avg_ticket  = total_rev / total_ord if total_ord else 0
+    tables = page_tables(page)
+    mo_df, pay_df, kpis = tables["monthly_trend"], tables["payment_freq"], tables["overview"]
+    total_rev, total_ord, total_cust = kpis["total_rev"], kpis["total_ord"], kpis["total_cust"]
+    avg_score, avg_del = kpis["avg_score"], kpis["avg_del"]
 
     section("RINGKASAN UTAMA")
     c1, c2, c3, c4, c5 = st.columns(5)
     with c1: kpi("Total Revenue",       f"R${total_rev/1e6:.2f}M")
-    with c2: kpi("Total Orders",        f"{total_ord:,}")
-    with c3: kpi("Unique Customers",    f"{total_cust:,}")
+    with c2: kpi("Total Orders",        f"{total_ord:,}", distinct_note)
+    with c3: kpi("Unique Customers",    f"{total_cust:,}", distinct_note)
     with c4: kpi("Avg Review Score",    f"{avg_score:.2f} / 5")
     with c5: kpi("Avg Delivery",        f"{avg_del:.1f} hari")
 
@@ -339,40 +530,42 @@ if page == "Overview":
         st.markdown('<div class="chart-title">Tren Orders Bulanan</div>', unsafe_allow_html=True)
         st.markdown('<div class="chart-sub">Jumlah pesanan unik per bulan beserta 3-month moving average</div>', unsafe_allow_html=True)
         if "year_month_str" in mo_df.columns:
-            fig, ax = fig_clean(9, 3.5)
-            x = np.arange(len(mo_df))
-            ax.bar(x, mo_df["total_orders"], color=C["primary"], alpha=0.25, width=0.7)
-            ax.plot(x, mo_df["total_orders"], color=C["primary"], linewidth=1.5, label="Orders")
-            if "orders_MA3" in mo_df.columns:
-                ax.plot(x, mo_df["orders_MA3"], color=C["red"], linewidth=1.8,
-                        linestyle="--", label="3-Month MA")
-            step = max(1, len(mo_df) // 8)
-            ax.set_xticks(x[::step])
-            ax.set_xticklabels(mo_df["year_month_str"].iloc[::step], rotation=35)
-            ax.yaxis.set_major_formatter(mticker.FuncFormatter(lambda v, _: f"{v/1e3:.0f}K" if v >= 1000 else f"{v:.0f}"))
-            ax.set_ylabel("Orders")
-            ax.legend()
-            plt.tight_layout()
-            st.pyplot(fig); plt.close()
+            def draw():
+                fig, ax = fig_clean(9, 3.5)
+                x = np.arange(len(mo_df))
+                ax.bar(x, mo_df["total_orders"], color=C["primary"], alpha=0.25, width=0.7)
+                ax.plot(x, mo_df["total_orders"], color=C["primary"], linewidth=1.5, label="Orders")
+                if "orders_MA3" in mo_df.columns:
+                    ax.plot(x, mo_df["orders_MA3"], color=C["red"], linewidth=1.8,
+                            linestyle="--", label="3-Month MA")
+                step = max(1, len(mo_df) // 8)
+                ax.set_xticks(x[::step])
+                ax.set_xticklabels(mo_df["year_month_str"].iloc[::step], rotation=35)
+                ax.yaxis.set_major_formatter(mticker.FuncFormatter(lambda v, _: f"{v/1e3:.0f}K" if v >= 1000 else f"{v:.0f}"))
+                ax.set_ylabel("Orders")
+                ax.legend()
+                return fig
+            show_chart("orders_trend", draw, mo_df)
 
     with col_r:
         st.markdown('<div class="chart-title">Metode Pembayaran</div>', unsafe_allow_html=True)
-        st.markdown('<div class="chart-sub">Proporsi berdasarkan jumlah transaksi</div>', unsafe_allow_html=True)
-        fig, ax = fig_clean(5, 3.5)
-        wedges, _, autotexts = ax.pie(
-            pay_df["count"], labels=None,
-            autopct="%1.1f%%",
-            colors=C["chart"][:len(pay_df)],
-            startangle=90, pctdistance=0.75,
-            wedgeprops=dict(width=0.55, edgecolor="white", linewidth=1.5),
-        )
-        for at in autotexts:
-            at.set_fontsize(8.5)
-        ax.legend(wedges, pay_df["payment_type"].str.replace("_", " ").str.title(),
-                  loc="lower center", bbox_to_anchor=(0.5, -0.15),
-                  ncol=2, fontsize=8, frameon=False)
-        plt.tight_layout()
-        st.pyplot(fig); plt.close()
+        st.markdown('<div class="chart-sub">Proporsi order delivered per metode pembayaran dominan</div>', unsafe_allow_html=True)
+        def draw():
+            fig, ax = fig_clean(5, 3.5)
+            wedges, _, autotexts = ax.pie(
+                pay_df["count"], labels=None,
+                autopct="%1.1f%%",
+                colors=C["chart"][:len(pay_df)],
+                startangle=90, pctdistance=0.75,
+                wedgeprops=dict(width=0.55, edgecolor="white", linewidth=1.5),
+            )
+            for at in autotexts:
+                at.set_fontsize(8.5)
+            ax.legend(wedges, pay_df["payment_type"].str.replace("_", " ").str.title(),
+                      loc="lower center", bbox_to_anchor=(0.5, -0.15),
+                      ncol=2, fontsize=8, frameon=False)
+            return fig
+        show_chart("payment_share", draw, pay_df)
 
     section("PERTANYAAN BISNIS")
     questions = [
@@ -407,6 +600,7 @@ elif page == "Revenue per Kategori":
     st.markdown('<div class="page-title">Revenue per Kategori Produk</div>', unsafe_allow_html=True)
     st.markdown('<div class="page-sub">Pertanyaan 1 — Kategori mana yang menghasilkan revenue tertinggi dan terendah?</div>', unsafe_allow_html=True)
 
+    rev_df = page_tables(page)["revenue_by_category"]
     top1 = rev_df.iloc[0]
     bot1 = rev_df.iloc[-1]
     avg_rev_per_order = rev_df["avg_revenue_per_order"].mean()
@@ -430,61 +624,64 @@ elif page == "Revenue per Kategori":
 
     with col1:
         st.markdown('<div class="chart-title">Top Kategori — Revenue Tertinggi</div>', unsafe_allow_html=True)
-        fig, ax = fig_clean(7, max(4, n * 0.45))
-        colors = [C["primary"] if i == 0 else "#93C5FD" for i in range(n)]
-        bars = ax.barh(top_n["product_category_name_english"],
-                       top_n["total_revenue"], color=colors, height=0.6)
-        ax.xaxis.set_major_formatter(mticker.FuncFormatter(lambda v, _: f"R${v/1e6:.1f}M"))
-        ax.set_xlabel("Total Revenue")
-        ax.invert_yaxis()
-        ax.grid(axis="x"); ax.grid(axis="y", alpha=0)
-        for bar in bars:
-            w = bar.get_width()
-            ax.text(w + w * 0.01, bar.get_y() + bar.get_height() / 2,
-                    f"R${w/1e6:.2f}M", va="center", fontsize=8, color=C["muted"])
-        plt.tight_layout()
-        st.pyplot(fig); plt.close()
+        def draw():
+            fig, ax = fig_clean(7, max(4, n * 0.45))
+            colors = [C["primary"] if i == 0 else "#93C5FD" for i in range(n)]
+            bars = ax.barh(top_n["product_category_name_english"],
+                           top_n["total_revenue"], color=colors, height=0.6)
+            ax.xaxis.set_major_formatter(mticker.FuncFormatter(lambda v, _: f"R${v/1e6:.1f}M"))
+            ax.set_xlabel("Total Revenue")
+            ax.invert_yaxis()
+            ax.grid(axis="x"); ax.grid(axis="y", alpha=0)
+            for bar in bars:
+                w = bar.get_width()
+                ax.text(w + w * 0.01, bar.get_y() + bar.get_height() / 2,
+                        f"R${w/1e6:.2f}M", va="center", fontsize=8, color=C["muted"])
+            return fig
+        show_chart("top_categories", draw, top_n)
 
     with col2:
         st.markdown('<div class="chart-title">Bottom Kategori — Revenue Terendah</div>', unsafe_allow_html=True)
-        fig, ax = fig_clean(7, max(4, n * 0.45))
-        colors = [C["red"] if i == 0 else "#FCA5A5" for i in range(n)]
-        bars = ax.barh(bot_n["product_category_name_english"],
-                       bot_n["total_revenue"], color=colors, height=0.6)
-        ax.set_xlabel("Total Revenue")
-        ax.invert_yaxis()
-        ax.grid(axis="x"); ax.grid(axis="y", alpha=0)
-        for bar in bars:
-            w = bar.get_width()
-            ax.text(w + max(w * 0.02, 3), bar.get_y() + bar.get_height() / 2,
-                    f"R${w:.0f}", va="center", fontsize=8, color=C["muted"])
-        plt.tight_layout()
-        st.pyplot(fig); plt.close()
+        def draw():
+            fig, ax = fig_clean(7, max(4, n * 0.45))
+            colors = [C["red"] if i == 0 else "#FCA5A5" for i in range(n)]
+            bars = ax.barh(bot_n["product_category_name_english"],
+                           bot_n["total_revenue"], color=colors, height=0.6)
+            ax.set_xlabel("Total Revenue")
+            ax.invert_yaxis()
+            ax.grid(axis="x"); ax.grid(axis="y", alpha=0)
+            for bar in bars:
+                w = bar.get_width()
+                ax.text(w + max(w * 0.02, 3), bar.get_y() + bar.get_height() / 2,
+                        f"R${w:.0f}", va="center", fontsize=8, color=C["muted"])
+            return fig
+        show_chart("bottom_categories", draw, bot_n)
 
     section("VOLUME ORDER VS REVENUE")
     st.markdown('<div class="chart-title">Perbandingan Total Orders dan Revenue per Kategori (Top 15)</div>', unsafe_allow_html=True)
     st.markdown('<div class="chart-sub">Membantu membedakan kategori yang populer vs kategori bernilai tinggi</div>', unsafe_allow_html=True)
 
     top15 = rev_df.head(15).copy()
-    fig, ax1 = fig_clean(12, 4.5)
-    ax2 = ax1.twinx()
-    x = np.arange(len(top15))
-    w = 0.4
-    ax1.bar(x - w/2, top15["total_orders"], width=w, color=C["primary"],
-            alpha=0.8, label="Total Orders")
-    ax2.bar(x + w/2, top15["total_revenue"], width=w, color=C["green"],
-            alpha=0.8, label="Total Revenue")
-    ax1.set_xticks(x)
-    ax1.set_xticklabels(top15["product_category_name_english"], rotation=35, ha="right", fontsize=8)
-    ax1.set_ylabel("Jumlah Orders", color=C["primary"])
-    ax2.set_ylabel("Total Revenue (BRL)", color=C["green"])
-    ax2.yaxis.set_major_formatter(mticker.FuncFormatter(lambda v, _: f"R${v/1e6:.1f}M"))
-    lines1, labels1 = ax1.get_legend_handles_labels()
-    lines2, labels2 = ax2.get_legend_handles_labels()
-    ax1.legend(lines1 + lines2, labels1 + labels2, loc="upper right")
-    ax1.grid(axis="y", alpha=0.5); ax2.grid(False)
-    plt.tight_layout()
-    st.pyplot(fig); plt.close()
+    def draw():
+        fig, ax1 = fig_clean(12, 4.5)
+        ax2 = ax1.twinx()
+        x = np.arange(len(top15))
+        w = 0.4
+        ax1.bar(x - w/2, top15["total_orders"], width=w, color=C["primary"],
+                alpha=0.8, label="Total Orders")
+        ax2.bar(x + w/2, top15["total_revenue"], width=w, color=C["green"],
+                alpha=0.8, label="Total Revenue")
+        ax1.set_xticks(x)
+        ax1.set_xticklabels(top15["product_category_name_english"], rotation=35, ha="right", fontsize=8)
+        ax1.set_ylabel("Jumlah Orders", color=C["primary"])
+        ax2.set_ylabel("Total Revenue (BRL)", color=C["green"])
+        ax2.yaxis.set_major_formatter(mticker.FuncFormatter(lambda v, _: f"R${v/1e6:.1f}M"))
+        lines1, labels1 = ax1.get_legend_handles_labels()
+        lines2, labels2 = ax2.get_legend_handles_labels()
+        ax1.legend(lines1 + lines2, labels1 + labels2, loc="upper right")
+        ax1.grid(axis="y", alpha=0.5); ax2.grid(False)
+        return fig
+    show_chart("orders_vs_revenue", draw, top15)
 
     with st.expander("Lihat tabel lengkap"):
         st.dataframe(
@@ -514,12 +711,14 @@ elif page == "Segmentasi Pelanggan (RFM)":
     st.markdown('<div class="page-title">Segmentasi Pelanggan (RFM)</div>', unsafe_allow_html=True)
     st.markdown('<div class="page-sub">Pertanyaan 2 — Karakteristik pelanggan berdasarkan Recency, Frequency, dan Monetary</div>', unsafe_allow_html=True)
 
-    seg_df = rfm_df.groupby("segment").agg(
-        Pelanggan=("customer_unique_id", "count"),
-        Recency=("recency", "mean"),
-        Frequency=("frequency", "mean"),
-        Monetary=("monetary", "mean"),
-    ).round(1).reset_index().sort_values("Pelanggan", ascending=False)
+    rfm_df = page_tables(page)["rfm_df"]
+    with timer.stage("rfm_segments"):
+        seg_df = rfm_df.groupby("segment", observed=True).agg(
+            Pelanggan=("customer_unique_id", "count"),
+            Recency=("recency", "mean"),
+            Frequency=("frequency", "mean"),
+            Monetary=("monetary", "mean"),
+        ).round(1).reset_index().sort_values("Pelanggan", ascending=False)
 
     SEG_COLOR = {
         "Champions":       C["green"],
@@ -551,38 +750,40 @@ elif page == "Segmentasi Pelanggan (RFM)":
     with col1:
         section("DISTRIBUSI SEGMEN")
         st.markdown('<div class="chart-title">Proporsi Pelanggan per Segmen</div>', unsafe_allow_html=True)
-        fig, ax = fig_clean(6, 5)
-        seg_colors = [SEG_COLOR.get(s, C["muted"]) for s in seg_df["segment"]]
-        bars = ax.barh(seg_df["segment"], seg_df["Pelanggan"],
-                       color=seg_colors, height=0.6)
-        ax.invert_yaxis()
-        ax.grid(axis="x"); ax.grid(axis="y", alpha=0)
-        ax.set_xlabel("Jumlah Pelanggan")
-        for bar, (_, row) in zip(bars, seg_df.iterrows()):
-            pct = row["Pelanggan"] / total_cust_rfm * 100
-            ax.text(bar.get_width() + total_cust_rfm * 0.005,
-                    bar.get_y() + bar.get_height() / 2,
-                    f"{int(row['Pelanggan']):,}  ({pct:.1f}%)",
-                    va="center", fontsize=8.5, color=C["muted"])
-        plt.tight_layout()
-        st.pyplot(fig); plt.close()
+        def draw():
+            fig, ax = fig_clean(6, 5)
+            seg_colors = [SEG_COLOR.get(s, C["muted"]) for s in seg_df["segment"]]
+            bars = ax.barh(seg_df["segment"], seg_df["Pelanggan"],
+                           color=seg_colors, height=0.6)
+            ax.invert_yaxis()
+            ax.grid(axis="x"); ax.grid(axis="y", alpha=0)
+            ax.set_xlabel("Jumlah Pelanggan")
+            for bar, (_, row) in zip(bars, seg_df.iterrows()):
+                pct = row["Pelanggan"] / total_cust_rfm * 100
+                ax.text(bar.get_width() + total_cust_rfm * 0.005,
+                        bar.get_y() + bar.get_height() / 2,
+                        f"{int(row['Pelanggan']):,}  ({pct:.1f}%)",
+                        va="center", fontsize=8.5, color=C["muted"])
+            return fig
+        show_chart("segment_count", draw, seg_df)
 
     with col2:
         section("NILAI RATA-RATA")
         st.markdown('<div class="chart-title">Avg Monetary Value per Segmen</div>', unsafe_allow_html=True)
-        fig, ax = fig_clean(6, 5)
-        sorted_seg = seg_df.sort_values("Monetary")
-        seg_colors_sorted = [SEG_COLOR.get(s, C["muted"]) for s in sorted_seg["segment"]]
-        bars = ax.barh(sorted_seg["segment"], sorted_seg["Monetary"],
-                       color=seg_colors_sorted, height=0.6)
-        ax.set_xlabel("Avg Monetary Value (BRL)")
-        ax.grid(axis="x"); ax.grid(axis="y", alpha=0)
-        for bar in bars:
-            w = bar.get_width()
-            ax.text(w + w * 0.01, bar.get_y() + bar.get_height() / 2,
-                    f"R${w:.0f}", va="center", fontsize=8.5, color=C["muted"])
-        plt.tight_layout()
-        st.pyplot(fig); plt.close()
+        def draw():
+            fig, ax = fig_clean(6, 5)
+            sorted_seg = seg_df.sort_values("Monetary")
+            seg_colors_sorted = [SEG_COLOR.get(s, C["muted"]) for s in sorted_seg["segment"]]
+            bars = ax.barh(sorted_seg["segment"], sorted_seg["Monetary"],
+                           color=seg_colors_sorted, height=0.6)
+            ax.set_xlabel("Avg Monetary Value (BRL)")
+            ax.grid(axis="x"); ax.grid(axis="y", alpha=0)
+            for bar in bars:
+                w = bar.get_width()
+                ax.text(w + w * 0.01, bar.get_y() + bar.get_height() / 2,
+                        f"R${w:.0f}", va="center", fontsize=8.5, color=C["muted"])
+            return fig
+        show_chart("segment_monetary", draw, seg_df)
 
     section("PERBANDINGAN DIMENSI RFM")
     st.markdown('<div class="chart-title">Rata-rata R, F, M per Segmen — Normalized (0–1)</div>', unsafe_allow_html=True)
@@ -596,18 +797,19 @@ elif page == "Segmentasi Pelanggan (RFM)":
 
     x = np.arange(len(rfm_norm))
     w = 0.25
-    fig, ax = fig_clean(11, 4)
-    seg_clr = [SEG_COLOR.get(s, C["muted"]) for s in rfm_norm["segment"]]
-    ax.bar(x - w,   rfm_norm["Recency"],   width=w, color=C["primary"], alpha=0.85, label="Recency (inv.)")
-    ax.bar(x,       rfm_norm["Frequency"], width=w, color=C["green"],   alpha=0.85, label="Frequency")
-    ax.bar(x + w,   rfm_norm["Monetary"],  width=w, color=C["amber"],   alpha=0.85, label="Monetary")
-    ax.set_xticks(x)
-    ax.set_xticklabels(rfm_norm["segment"], rotation=20)
-    ax.set_ylabel("Normalized Score (0–1)")
-    ax.set_ylim(0, 1.15)
-    ax.legend()
-    plt.tight_layout()
-    st.pyplot(fig); plt.close()
+    def draw():
+        fig, ax = fig_clean(11, 4)
+        seg_clr = [SEG_COLOR.get(s, C["muted"]) for s in rfm_norm["segment"]]
+        ax.bar(x - w,   rfm_norm["Recency"],   width=w, color=C["primary"], alpha=0.85, label="Recency (inv.)")
+        ax.bar(x,       rfm_norm["Frequency"], width=w, color=C["green"],   alpha=0.85, label="Frequency")
+        ax.bar(x + w,   rfm_norm["Monetary"],  width=w, color=C["amber"],   alpha=0.85, label="Monetary")
+        ax.set_xticks(x)
+        ax.set_xticklabels(rfm_norm["segment"], rotation=20)
+        ax.set_ylabel("Normalized Score (0–1)")
+        ax.set_ylim(0, 1.15)
+        ax.legend()
+        return fig
+    show_chart("rfm_normalized", draw, rfm_norm)
 
     with st.expander("Lihat tabel ringkasan segmen"):
         st.dataframe(
@@ -619,6 +821,41 @@ elif page == "Segmentasi Pelanggan (RFM)":
             use_container_width=True,
         )
 
+    section("MIGRASI SEGMEN")
+    # Butuh main_df + indeks order per pelanggan, jadi baru dihitung setelah diaktifkan
+    if st.toggle("Bandingkan dengan snapshot sebelumnya", key="rfm_compare",
+                 help="Segmen setiap pelanggan dihitung ulang per tanggal snapshot dari indeks order per pelanggan."):
+        first, last = start or timeline.min.date(), end or timeline.max.date()
+        before = st.date_input("Snapshot awal", max(first, (pd.Timestamp(last) - pd.Timedelta(days=90)).date()),
+                               min_value=first, max_value=last, key="rfm_before")
+        with timer.stage("rfm_migration"):
+            moves = rfm_migration(main_query(version), start, before, end, version)
+        st.markdown(f'<div class="chart-title">Perpindahan Segmen: {before:%d %b %Y} → {last:%d %b %Y}</div>', unsafe_allow_html=True)
+        st.markdown('<div class="chart-sub">Baris = segmen pada snapshot awal (Baru = belum bertransaksi), kolom = segmen pada snapshot akhir</div>', unsafe_allow_html=True)
+
+        def draw():
+            fig, ax = fig_clean(10, 4.5)
+            share = moves.div(moves.sum(axis=1).replace(0, np.nan), axis=0).fillna(0)
+            ax.imshow(share, cmap="Blues", vmin=0, vmax=1, aspect="auto")
+            ax.set_xticks(range(len(moves.columns)))
+            ax.set_xticklabels(moves.columns, rotation=20)
+            ax.set_yticks(range(len(moves.index)))
+            ax.set_yticklabels(moves.index)
+            ax.set_xlabel("Segmen Snapshot Akhir")
+            ax.set_ylabel("Segmen Snapshot Awal")
+            ax.grid(False)
+            for i, j in np.ndindex(moves.shape):
+                if moves.iat[i, j]:
+                    ax.text(j, i, f"{moves.iat[i, j]:,}", ha="center", va="center", fontsize=8.5,
+                            color=C["white"] if share.iat[i, j] > 0.5 else C["text"])
+            return fig
+        show_chart("rfm_migration", draw, moves)
+
+        existing = moves.drop(index=NEW_SEGMENT)
+        moved = existing.to_numpy().sum() - sum(existing.at[seg, seg] for seg in existing.columns)
+        st.caption(f"{moved:,} pelanggan berpindah segmen · {moves.loc[NEW_SEGMENT].sum():,} pelanggan baru "
+                   f"sejak {before:%d %b %Y}.")
+
     insight(
         "Segmen <b>Champions</b> memiliki nilai belanja tertinggi dan frekuensi pembelian terbaik — "
         "prioritaskan dengan program loyalitas eksklusif. "
@@ -635,7 +872,19 @@ elif page == "Tren Bulanan":
     st.markdown('<div class="page-title">Tren Bulanan</div>', unsafe_allow_html=True)
     st.markdown('<div class="page-sub">Pertanyaan 3 — Tren jumlah pesanan dan total revenue dari bulan ke bulan</div>', unsafe_allow_html=True)
 
-    best_ord_idx = mo_df["total_orders"].idxmax()
+    col1, col2, col3 = st.columns([3, 2, 1], gap="large")
+    with col1:
+        freq = st.radio("Granularitas", list(GRANULARITIES), index=list(GRANULARITIES).index("M"),
+                        format_func=lambda f: GRANULARITIES[f][0], horizontal=True, key="trend_freq")
+    with col2:
+        window = st.slider("Jendela moving average (periode)", 2, 12, 3, key="trend_window")
+    with col3:
+        show_ma = st.checkbox("Tampilkan MA", value=True)
+    noun = GRANULARITIES[freq][1]
+
+    # Seri harian → bucket granularitas terpilih (bincount) + MA dari prefix sum; tanpa load ulang
+    with timer.stage("trend_buckets"):
+        mo_df = trend_buckets(version).trend(freq, window, start, end)
     best_rev_idx = mo_df["total_revenue"].idxmax()
     growth_rev   = (mo_df["total_revenue"].iloc[-1] - mo_df["total_revenue"].iloc[0]) / mo_df["total_revenue"].iloc[0] * 100
 
@@ -643,86 +892,94 @@ elif page == "Tren Bulanan":
     c1, c2, c3, c4 = st.columns(4)
     with c1: kpi("Total Revenue",       f"R${mo_df['total_revenue'].sum()/1e6:.2f}M")
     with c2: kpi("Total Orders",        f"{int(mo_df['total_orders'].sum()):,}")
-    with c3: kpi("Bulan Terbaik",       mo_df.loc[best_rev_idx, 'year_month_str'],
+    with c3: kpi(f"{noun.title()} Terbaik", mo_df.loc[best_rev_idx, "label"],
                                          f"R${mo_df.loc[best_rev_idx,'total_revenue']/1e6:.2f}M revenue")
-    with c4: kpi("Pertumbuhan",         f"{growth_rev:+.0f}%", "First vs Last Month")
-
-    mo_df["rev_growth"] = mo_df["total_revenue"].pct_change() * 100
-
-    show_ma = st.checkbox("Tampilkan 3-Month Moving Average", value=True)
+    with c4: kpi("Pertumbuhan",         f"{growth_rev:+.0f}%", f"{noun.title()} pertama vs terakhir")
 
     section("TREN ORDERS & REVENUE")
 
-    # Orders trend
-    st.markdown('<div class="chart-title">Jumlah Pesanan per Bulan</div>', unsafe_allow_html=True)
-    fig, ax = fig_clean(13, 3.8)
     x = np.arange(len(mo_df))
-    ax.bar(x, mo_df["total_orders"], color=C["primary"], alpha=0.3, width=0.7)
-    ax.plot(x, mo_df["total_orders"], color=C["primary"], linewidth=1.8, label="Jumlah Orders")
-    if show_ma and "orders_MA3" in mo_df.columns:
-        ax.plot(x, mo_df["orders_MA3"], color=C["red"], linewidth=2,
-                linestyle="--", label="3-Month MA")
-
-    # Annotate peak
-    peak_x = mo_df["total_orders"].idxmax()
-    ax.annotate(
-        f"Peak\n{int(mo_df['total_orders'].max()):,}",
-        xy=(peak_x, mo_df["total_orders"].max()),
-        xytext=(peak_x + 1.5, mo_df["total_orders"].max() * 1.05),
-        fontsize=8, color=C["red"],
-        arrowprops=dict(arrowstyle="->", color=C["red"], lw=1.2),
-    )
-
     step = max(1, len(mo_df) // 10)
-    ax.set_xticks(x[::step])
-    ax.set_xticklabels(mo_df["year_month_str"].iloc[::step], rotation=35)
-    ax.yaxis.set_major_formatter(mticker.FuncFormatter(lambda v, _: f"{v/1e3:.0f}K" if v >= 1000 else f"{v:.0f}"))
-    ax.set_ylabel("Jumlah Orders")
-    ax.legend()
-    plt.tight_layout()
-    st.pyplot(fig); plt.close()
+    # Ratusan periode (harian): cukup garis, batang hanya memperlambat render
+    bars = len(mo_df) <= 120
+    ma_label = f"MA {window} {noun}"
+
+    # Orders trend
+    st.markdown(f'<div class="chart-title">Jumlah Pesanan per {noun.title()}</div>', unsafe_allow_html=True)
+    def draw():
+        fig, ax = fig_clean(13, 3.8)
+        if bars:
+            ax.bar(x, mo_df["total_orders"], color=C["primary"], alpha=0.3, width=0.7)
+        ax.plot(x, mo_df["total_orders"], color=C["primary"], linewidth=1.8 if bars else 1, label="Jumlah Orders")
+        if show_ma:
+            ax.plot(x, mo_df["orders_MA"], color=C["red"], linewidth=2,
+                    linestyle="--", label=ma_label)
+
+        # Annotate peak
+        peak_x = mo_df["total_orders"].idxmax()
+        ax.annotate(
+            f"Peak\n{int(mo_df['total_orders'].max()):,}",
+            xy=(peak_x, mo_df["total_orders"].max()),
+            xytext=(peak_x + max(1.5, len(mo_df) * 0.02), mo_df["total_orders"].max() * 1.05),
+            fontsize=8, color=C["red"],
+            arrowprops=dict(arrowstyle="->", color=C["red"], lw=1.2),
+        )
+
+        ax.set_xticks(x[::step])
+        ax.set_xticklabels(mo_df["label"].iloc[::step], rotation=35)
+        ax.yaxis.set_major_formatter(mticker.FuncFormatter(lambda v, _: f"{v/1e3:.0f}K" if v >= 1000 else f"{v:.0f}"))
+        ax.set_ylabel("Jumlah Orders")
+        ax.legend()
+        return fig
+    show_chart("orders_trend", draw, mo_df, show_ma)
 
     # Revenue trend
-    st.markdown('<div class="chart-title">Total Revenue per Bulan</div>', unsafe_allow_html=True)
-    fig, ax = fig_clean(13, 3.8)
-    ax.bar(x, mo_df["total_revenue"], color=C["green"], alpha=0.3, width=0.7)
-    ax.plot(x, mo_df["total_revenue"], color=C["green"], linewidth=1.8, label="Total Revenue")
-    if show_ma and "revenue_MA3" in mo_df.columns:
-        ax.plot(x, mo_df["revenue_MA3"], color=C["red"], linewidth=2,
-                linestyle="--", label="3-Month MA")
-    ax.set_xticks(x[::step])
-    ax.set_xticklabels(mo_df["year_month_str"].iloc[::step], rotation=35)
-    ax.yaxis.set_major_formatter(mticker.FuncFormatter(lambda v, _: f"R${v/1e6:.1f}M"))
-    ax.set_ylabel("Revenue (BRL)")
-    ax.legend()
-    plt.tight_layout()
-    st.pyplot(fig); plt.close()
-
-    section("GROWTH RATE BULANAN")
-    st.markdown('<div class="chart-title">Month-over-Month Revenue Growth (%)</div>', unsafe_allow_html=True)
+    st.markdown(f'<div class="chart-title">Total Revenue per {noun.title()}</div>', unsafe_allow_html=True)
+    def draw():
+        fig, ax = fig_clean(13, 3.8)
+        if bars:
+            ax.bar(x, mo_df["total_revenue"], color=C["green"], alpha=0.3, width=0.7)
+        ax.plot(x, mo_df["total_revenue"], color=C["green"], linewidth=1.8 if bars else 1, label="Total Revenue")
+        if show_ma:
+            ax.plot(x, mo_df["revenue_MA"], color=C["red"], linewidth=2,
+                    linestyle="--", label=ma_label)
+        ax.set_xticks(x[::step])
+        ax.set_xticklabels(mo_df["label"].iloc[::step], rotation=35)
+        ax.yaxis.set_major_formatter(mticker.FuncFormatter(lambda v, _: f"R${v/1e6:.1f}M"))
+        ax.set_ylabel("Revenue (BRL)")
+        ax.legend()
+        return fig
+    show_chart("revenue_trend", draw, mo_df, show_ma)
+
+    section(f"GROWTH RATE PER {noun.upper()}")
+    st.markdown(f'<div class="chart-title">Pertumbuhan Revenue terhadap {noun.title()} Sebelumnya (%)</div>', unsafe_allow_html=True)
     st.markdown('<div class="chart-sub">Batang hijau = pertumbuhan positif, merah = pertumbuhan negatif</div>', unsafe_allow_html=True)
 
-    fig, ax = fig_clean(13, 3.2)
-    growth_vals = mo_df["rev_growth"].iloc[1:].values
-    bar_colors  = [C["green"] if v >= 0 else C["red"] for v in growth_vals]
-    ax.bar(range(len(growth_vals)), growth_vals, color=bar_colors, width=0.7, alpha=0.85)
-    ax.axhline(0, color=C["muted"], linewidth=0.8, linestyle="--")
-    ax.set_xticks(range(0, len(growth_vals), step))
-    ax.set_xticklabels(mo_df["year_month_str"].iloc[1::step], rotation=35)
-    ax.set_ylabel("Growth Rate (%)")
-    plt.tight_layout()
-    st.pyplot(fig); plt.close()
-
-    with st.expander("Lihat data tren bulanan"):
+    def draw():
+        fig, ax = fig_clean(13, 3.2)
+        growth_vals = mo_df["rev_growth"].iloc[1:].values
+        bar_colors  = [C["green"] if v >= 0 else C["red"] for v in growth_vals]
+        if bars:
+            ax.bar(range(len(growth_vals)), growth_vals, color=bar_colors, width=0.7, alpha=0.85)
+        else:
+            ax.vlines(range(len(growth_vals)), 0, growth_vals, colors=bar_colors, linewidth=1, alpha=0.85)
+        ax.axhline(0, color=C["muted"], linewidth=0.8, linestyle="--")
+        ax.set_xticks(range(0, len(growth_vals), step))
+        ax.set_xticklabels(mo_df["label"].iloc[1::step], rotation=35)
+        ax.set_ylabel("Growth Rate (%)")
+        return fig
+    show_chart("revenue_growth", draw, mo_df)
+
+    with st.expander(f"Lihat data tren per {noun}"):
         st.dataframe(
-            mo_df[["year_month_str", "total_orders", "total_revenue", "rev_growth"]].rename(columns={
-                "year_month_str": "Bulan",
+            mo_df[["label", "total_orders", "total_revenue", "rev_growth"]].rename(columns={
+                "label":         noun.title(),
                 "total_orders":  "Orders",
                 "total_revenue": "Revenue (BRL)",
-                "rev_growth":    "MoM Growth (%)",
+                "rev_growth":    "Growth (%)",
             }).style.format({
-                "Revenue (BRL)":   "R${:,.0f}",
-                "MoM Growth (%)":  "{:+.1f}%",
+                "Revenue (BRL)": "R${:,.0f}",
+                "Growth (%)":    "{:+.1f}%",
             }),
             use_container_width=True, height=300,
         )
@@ -743,14 +1000,17 @@ elif page == "Metode Pembayaran":
     st.markdown('<div class="page-title">Metode Pembayaran</div>', unsafe_allow_html=True)
     st.markdown('<div class="page-sub">Pertanyaan 4 — Metode pembayaran dominan dan rata-rata nilai transaksi per metode</div>', unsafe_allow_html=True)
 
+    pay_df = page_tables(page)["payment_freq"]
+    st.caption("Dihitung per order delivered: setiap order masuk ke metode pembayaran dominannya, "
+               "dengan nilai = total payment_value order tersebut.")
     dom = pay_df.loc[pay_df["count"].idxmax()]
     hi_avg = pay_df.loc[pay_df["avg_value"].idxmax()]
 
     section("RINGKASAN")
     c1, c2, c3, c4 = st.columns(4)
     with c1: kpi("Metode Dominan",        dom["payment_type"].replace("_", " ").title(),
-                                           f"{dom['pct']:.1f}% dari total transaksi")
-    with c2: kpi("Total Transaksi",        f"{int(pay_df['count'].sum()):,}")
+                                           f"{dom['pct']:.1f}% dari total order")
+    with c2: kpi("Total Order",            f"{int(pay_df['count'].sum()):,}")
     with c3: kpi("Avg Value Tertinggi",    f"R${hi_avg['avg_value']:.0f}",
                                            hi_avg["payment_type"].replace("_", " ").title())
     with c4: kpi("Total Nilai Transaksi",  f"R${pay_df['total_value'].sum()/1e6:.2f}M")
@@ -759,74 +1019,77 @@ elif page == "Metode Pembayaran":
     col1, col2 = st.columns(2, gap="large")
 
     with col1:
-        st.markdown('<div class="chart-title">Jumlah Transaksi per Metode Pembayaran</div>', unsafe_allow_html=True)
-        fig, ax = fig_clean(6.5, 4.5)
-        sorted_count = pay_df.sort_values("count")
-        colors_count = [C["primary"] if i == len(sorted_count) - 1 else "#93C5FD"
-                        for i in range(len(sorted_count))]
-        bars = ax.barh(
-            sorted_count["payment_type"].str.replace("_", " ").str.title(),
-            sorted_count["count"],
-            color=colors_count, height=0.55,
-        )
-        ax.set_xlabel("Jumlah Transaksi")
-        ax.grid(axis="x"); ax.grid(axis="y", alpha=0)
-        for bar, (_, row) in zip(bars, sorted_count.iterrows()):
-            w = bar.get_width()
-            ax.text(w + pay_df["count"].max() * 0.01,
-                    bar.get_y() + bar.get_height() / 2,
-                    f"{int(w):,}  ({row['pct']:.1f}%)",
-                    va="center", fontsize=8.5, color=C["muted"])
-        plt.tight_layout()
-        st.pyplot(fig); plt.close()
+        st.markdown('<div class="chart-title">Jumlah Order per Metode Pembayaran Dominan</div>', unsafe_allow_html=True)
+        def draw():
+            fig, ax = fig_clean(6.5, 4.5)
+            sorted_count = pay_df.sort_values("count")
+            colors_count = [C["primary"] if i == len(sorted_count) - 1 else "#93C5FD"
+                            for i in range(len(sorted_count))]
+            bars = ax.barh(
+                sorted_count["payment_type"].str.replace("_", " ").str.title(),
+                sorted_count["count"],
+                color=colors_count, height=0.55,
+            )
+            ax.set_xlabel("Jumlah Order")
+            ax.grid(axis="x"); ax.grid(axis="y", alpha=0)
+            for bar, (_, row) in zip(bars, sorted_count.iterrows()):
+                w = bar.get_width()
+                ax.text(w + pay_df["count"].max() * 0.01,
+                        bar.get_y() + bar.get_height() / 2,
+                        f"{int(w):,}  ({row['pct']:.1f}%)",
+                        va="center", fontsize=8.5, color=C["muted"])
+            return fig
+        show_chart("payment_count", draw, pay_df)
 
     with col2:
-        st.markdown('<div class="chart-title">Rata-rata Nilai Transaksi per Metode</div>', unsafe_allow_html=True)
-        fig, ax = fig_clean(6.5, 4.5)
-        sorted_avg = pay_df.sort_values("avg_value")
-        colors_avg = [C["green"] if i == len(sorted_avg) - 1 else "#6EE7B7"
-                      for i in range(len(sorted_avg))]
-        bars = ax.barh(
-            sorted_avg["payment_type"].str.replace("_", " ").str.title(),
-            sorted_avg["avg_value"],
-            color=colors_avg, height=0.55,
-        )
-        ax.set_xlabel("Avg Transaction Value (BRL)")
-        ax.grid(axis="x"); ax.grid(axis="y", alpha=0)
-        for bar, (_, row) in zip(bars, sorted_avg.iterrows()):
-            w = bar.get_width()
-            ax.text(w + pay_df["avg_value"].max() * 0.01,
-                    bar.get_y() + bar.get_height() / 2,
-                    f"R${w:.0f}", va="center", fontsize=8.5, color=C["muted"])
-        plt.tight_layout()
-        st.pyplot(fig); plt.close()
+        st.markdown('<div class="chart-title">Rata-rata Nilai Order per Metode</div>', unsafe_allow_html=True)
+        def draw():
+            fig, ax = fig_clean(6.5, 4.5)
+            sorted_avg = pay_df.sort_values("avg_value")
+            colors_avg = [C["green"] if i == len(sorted_avg) - 1 else "#6EE7B7"
+                          for i in range(len(sorted_avg))]
+            bars = ax.barh(
+                sorted_avg["payment_type"].str.replace("_", " ").str.title(),
+                sorted_avg["avg_value"],
+                color=colors_avg, height=0.55,
+            )
+            ax.set_xlabel("Avg Order Value (BRL)")
+            ax.grid(axis="x"); ax.grid(axis="y", alpha=0)
+            for bar, (_, row) in zip(bars, sorted_avg.iterrows()):
+                w = bar.get_width()
+                ax.text(w + pay_df["avg_value"].max() * 0.01,
+                        bar.get_y() + bar.get_height() / 2,
+                        f"R${w:.0f}", va="center", fontsize=8.5, color=C["muted"])
+            return fig
+        show_chart("payment_avg", draw, pay_df)
 
     section("TOTAL NILAI PER METODE")
-    st.markdown('<div class="chart-title">Total Nilai Seluruh Transaksi per Metode Pembayaran</div>', unsafe_allow_html=True)
-    fig, ax = fig_clean(10, 3.5)
-    sorted_total = pay_df.sort_values("total_value", ascending=False)
-    colors_total = [C["primary"], "#93C5FD", "#BFDBFE", "#DBEAFE"][:len(sorted_total)]
-    bars = ax.bar(
-        sorted_total["payment_type"].str.replace("_", " ").str.title(),
-        sorted_total["total_value"],
-        color=colors_total, width=0.5,
-    )
-    ax.yaxis.set_major_formatter(mticker.FuncFormatter(lambda v, _: f"R${v/1e6:.1f}M"))
-    ax.set_ylabel("Total Value (BRL)")
-    ax.grid(axis="y"); ax.grid(axis="x", alpha=0)
-    for bar in bars:
-        h = bar.get_height()
-        ax.text(bar.get_x() + bar.get_width() / 2, h + pay_df["total_value"].max() * 0.01,
-                f"R${h/1e6:.2f}M", ha="center", fontsize=9,
-                fontweight="600", color=C["text"])
-    plt.tight_layout()
-    st.pyplot(fig); plt.close()
+    st.markdown('<div class="chart-title">Total Nilai Seluruh Order per Metode Pembayaran Dominan</div>', unsafe_allow_html=True)
+    def draw():
+        fig, ax = fig_clean(10, 3.5)
+        sorted_total = pay_df.sort_values("total_value", ascending=False)
+        colors_total = [C["primary"], "#93C5FD", "#BFDBFE", "#DBEAFE"][:len(sorted_total)]
+        bars = ax.bar(
+            sorted_total["payment_type"].str.replace("_", " ").str.title(),
+            sorted_total["total_value"],
+            color=colors_total, width=0.5,
+        )
+        ax.yaxis.set_major_formatter(mticker.FuncFormatter(lambda v, _: f"R${v/1e6:.1f}M"))
+        ax.set_ylabel("Total Value (BRL)")
+        ax.grid(axis="y"); ax.grid(axis="x", alpha=0)
+        for bar in bars:
+            h = bar.get_height()
+            ax.text(bar.get_x() + bar.get_width() / 2, h + pay_df["total_value"].max() * 0.01,
+                    f"R${h/1e6:.2f}M", ha="center", fontsize=9,
+                    fontweight="600", color=C["text"])
+        return fig
+    show_chart("payment_total", draw, pay_df)
 
     with st.expander("Lihat tabel detail"):
         st.dataframe(
             pay_df.rename(columns={
                 "payment_type":  "Metode",
-                "count":         "Jumlah Transaksi",
+                "count":         "Jumlah Order",
                 "avg_value":     "Avg Value (BRL)",
                 "total_value":   "Total Value (BRL)",
                 "pct":           "Share (%)",
@@ -853,118 +1116,132 @@ elif page == "Pengiriman & Kepuasan":
     st.markdown('<div class="page-title">Pengiriman & Kepuasan Pelanggan</div>', unsafe_allow_html=True)
     st.markdown('<div class="page-sub">Pertanyaan 5 — Apakah lama waktu pengiriman berkorelasi dengan review score pelanggan?</div>', unsafe_allow_html=True)
 
-    corr_val = del_df["delivery_days"].corr(del_df["review_score"])
-    fast_pct = (del_df["delivery_days"] <= 7).mean() * 100
+    # Statistik per kategori dihitung pipeline (delivery_stats); baris order
+    # (delivery_review) hanya dimuat saat scatter perlu digambar ulang.
+    # r dan garis tren dari momen per hari, exact untuk rentang mana pun.
+    stats_df = page_tables(page)["delivery_stats"]
+    with timer.stage("delivery_fit"):
+        fit = delivery_moments(version).fit(start, end)
+    stats_df = stats_df.assign(delivery_category=stats_df["delivery_category"].astype(str))
+    total    = stats_df.set_index("delivery_category").loc[DELIVERY_TOTAL]
+    order_cat   = delivery_labels()
+    stats       = stats_df.set_index("delivery_category").reindex(order_cat)
+    short_lbl   = ["≤7 hari\n(Cepat)", "8–14 hari\n(Normal)", "15–21 hari\n(Lambat)", ">21 hari\n(Sangat Lambat)"]
+    cat_colors  = [C["green"], C["teal"], C["amber"], C["red"]]
+    corr_val    = fit["pearson_r"]
+    fast_pct    = np.nan_to_num(stats["orders"].iloc[0]) / total["orders"] * 100
 
     section("RINGKASAN")
     c1, c2, c3, c4 = st.columns(4)
     with c1: kpi("Pearson Correlation",     f"{corr_val:.3f}",
                                              "Negatif = makin lama → makin rendah skor")
-    with c2: kpi("Avg Lama Pengiriman",      f"{del_df['delivery_days'].mean():.1f} hari")
-    with c3: kpi("Avg Review Score",         f"{del_df['review_score'].mean():.2f} / 5")
+    with c2: kpi("Avg Lama Pengiriman",      f"{total['days_mean']:.1f} hari")
+    with c3: kpi("Avg Review Score",         f"{total['review_mean']:.2f} / 5")
     with c4: kpi("Order Terkirim ≤7 Hari",   f"{fast_pct:.1f}%")
 
-    order_cat   = ["1-Fast (≤7 days)", "2-Normal (8-14 days)", "3-Slow (15-21 days)", "4-Very Slow (>21 days)"]
-    short_lbl   = ["≤7 hari\n(Cepat)", "8–14 hari\n(Normal)", "15–21 hari\n(Lambat)", ">21 hari\n(Sangat Lambat)"]
-    cat_colors  = [C["green"], C["teal"], C["amber"], C["red"]]
-    plot_data   = del_df[del_df["delivery_category"].isin(order_cat)].copy()
-
     section("ANALISIS KECEPATAN PENGIRIMAN")
     col1, col2 = st.columns(2, gap="large")
 
     with col1:
         st.markdown('<div class="chart-title">Rata-rata Review Score per Kategori Pengiriman</div>', unsafe_allow_html=True)
         st.markdown('<div class="chart-sub">Semakin cepat pengiriman, semakin tinggi skor kepuasan</div>', unsafe_allow_html=True)
-        stats = plot_data.groupby("delivery_category").agg(
-            avg=("review_score", "mean"),
-            n=("order_id", "count"),
-        ).reindex(order_cat).reset_index()
-
-        fig, ax = fig_clean(6.5, 4.5)
-        bars = ax.bar(range(4), stats["avg"], color=cat_colors, width=0.55)
-        avg_global = del_df["review_score"].mean()
-        ax.axhline(avg_global, color=C["muted"], linewidth=1.2, linestyle="--",
-                   label=f"Rata-rata keseluruhan ({avg_global:.2f})")
-        ax.set_xticks(range(4))
-        ax.set_xticklabels(short_lbl, fontsize=8.5)
-        ax.set_ylabel("Avg Review Score")
-        ax.set_ylim(1, 5.2)
-        ax.legend(loc="upper right")
-        ax.grid(axis="y"); ax.grid(axis="x", alpha=0)
-        for i, (bar, row) in enumerate(zip(bars, stats.itertuples())):
-            ax.text(bar.get_x() + bar.get_width() / 2, bar.get_height() + 0.05,
-                    f"{row.avg:.2f}", ha="center", fontsize=10,
-                    fontweight="600", color=cat_colors[i])
-            ax.text(bar.get_x() + bar.get_width() / 2, 1.1,
-                    f"n={row.n:,}", ha="center", fontsize=7.5, color=C["muted"])
-        plt.tight_layout()
-        st.pyplot(fig); plt.close()
+
+        def draw():
+            fig, ax = fig_clean(6.5, 4.5)
+            bars = ax.bar(range(4), stats["review_mean"], color=cat_colors, width=0.55)
+            avg_global = total["review_mean"]
+            ax.axhline(avg_global, color=C["muted"], linewidth=1.2, linestyle="--",
+                       label=f"Rata-rata keseluruhan ({avg_global:.2f})")
+            ax.set_xticks(range(4))
+            ax.set_xticklabels(short_lbl, fontsize=8.5)
+            ax.set_ylabel("Avg Review Score")
+            ax.set_ylim(1, 5.2)
+            ax.legend(loc="upper right")
+            ax.grid(axis="y"); ax.grid(axis="x", alpha=0)
+            for i, (bar, row) in enumerate(zip(bars, stats.itertuples())):
+                ax.text(bar.get_x() + bar.get_width() / 2, bar.get_height() + 0.05,
+                        f"{row.review_mean:.2f}", ha="center", fontsize=10,
+                        fontweight="600", color=cat_colors[i])
+                ax.text(bar.get_x() + bar.get_width() / 2, 1.1,
+                        f"n={row.orders:,.0f}", ha="center", fontsize=7.5, color=C["muted"])
+            return fig
+        show_chart("review_by_delivery", draw, stats_df)
 
     with col2:
         st.markdown('<div class="chart-title">Distribusi Review Score per Kategori (Box Plot)</div>', unsafe_allow_html=True)
         st.markdown('<div class="chart-sub">Menunjukkan sebaran dan variasi skor kepuasan</div>', unsafe_allow_html=True)
-        fig, ax = fig_clean(6.5, 4.5)
-        box_data = [
-            plot_data[plot_data["delivery_category"] == c]["review_score"].dropna().values
-            for c in order_cat
-        ]
-        bp = ax.boxplot(
-            box_data, patch_artist=True, notch=False,
-            medianprops=dict(color=C["text"], linewidth=1.8),
-            whiskerprops=dict(color=C["border"], linewidth=1),
-            capprops=dict(color=C["border"]),
-            flierprops=dict(marker="o", markerfacecolor=C["border"],
-                            markersize=2.5, alpha=0.4, markeredgecolor="none"),
-        )
-        for patch, color in zip(bp["boxes"], cat_colors):
-            patch.set_facecolor(color + "30")
-            patch.set_edgecolor(color)
-            patch.set_linewidth(1.5)
-        ax.set_xticklabels(short_lbl, fontsize=8.5)
-        ax.set_ylabel("Review Score")
-        ax.set_ylim(0.5, 5.8)
-        ax.grid(axis="y"); ax.grid(axis="x", alpha=0)
-        plt.tight_layout()
-        st.pyplot(fig); plt.close()
+        def draw():
+            fig, ax = fig_clean(6.5, 4.5)
+            # Kuartil & whisker sudah dihitung pipeline; flier = nilai review unik di luar whisker
+            present = [i for i, c in enumerate(order_cat) if stats.loc[c, "orders"] > 0]
+            box_stats = [{
+                "label": short_lbl[i], "q1": row["review_q1"], "med": row["review_median"],
+                "q3": row["review_q3"], "whislo": row["whisker_lo"], "whishi": row["whisker_hi"],
+                "fliers": [float(v) for v in str(row["fliers"]).split(";") if v and v != "nan"],
+            } for i, row in ((i, stats.loc[order_cat[i]]) for i in present)]
+            # Satu titik per nilai flier unik (tanpa tumpukan), jadi tanpa alpha
+            bp = ax.bxp(
+                box_stats, positions=[i + 1 for i in present], patch_artist=True,
+                medianprops=dict(color=C["text"], linewidth=1.8),
+                whiskerprops=dict(color=C["border"], linewidth=1),
+                capprops=dict(color=C["border"]),
+                flierprops=dict(marker="o", markerfacecolor=C["border"],
+                                markersize=2.5, markeredgecolor="none"),
+            )
+            for patch, i in zip(bp["boxes"], present):
+                patch.set_facecolor(cat_colors[i] + "30")
+                patch.set_edgecolor(cat_colors[i])
+                patch.set_linewidth(1.5)
+            ax.set_xticks(range(1, 5))
+            ax.set_xticklabels(short_lbl, fontsize=8.5)
+            ax.set_xlim(0.5, 4.5)
+            ax.set_ylabel("Review Score")
+            ax.set_ylim(0.5, 5.8)
+            ax.grid(axis="y"); ax.grid(axis="x", alpha=0)
+            return fig
+        show_chart("review_boxplot", draw, stats_df)
 
     section("KORELASI: LAMA PENGIRIMAN vs REVIEW SCORE")
     st.markdown('<div class="chart-title">Scatter Plot — Setiap Titik Mewakili Satu Order</div>', unsafe_allow_html=True)
     st.markdown('<div class="chart-sub">Garis putus-putus menunjukkan arah tren linear keseluruhan</div>', unsafe_allow_html=True)
 
-    sample = del_df.sample(min(6000, len(del_df)), random_state=42)
-    cat_map = {c: i for i, c in enumerate(order_cat)}
-    dot_colors = [
-        cat_colors[cat_map[c]] if c in cat_map else C["muted"]
-        for c in sample["delivery_category"]
-    ]
+    def draw():
+        # Baris order & sampel titik hanya dibutuhkan saat grafik benar-benar digambar
+        del_df = page_table("delivery_review")
+        with timer.stage("delivery_sample"):
+            sample = del_df.sample(min(6000, len(del_df)), random_state=42)
+            cat_map = {c: i for i, c in enumerate(order_cat)}
+            dot_colors = [
+                cat_colors[cat_map[c]] if c in cat_map else C["muted"]
+                for c in sample["delivery_category"]
+            ]
+
+        fig, ax = fig_clean(12, 4.5)
+        ax.scatter(sample["delivery_days"], sample["review_score"],
+                   c=dot_colors, alpha=0.18, s=10, edgecolors="none")
+
+        # Garis OLS atas seluruh order di rentang (bukan hanya sampel titik)
+        xl = np.linspace(0, total["days_p99"], 200)
+        ax.plot(xl, fit["slope"] * xl + fit["intercept"], color=C["text"], linewidth=2,
+                linestyle="--", label=f"Tren linear  (r = {corr_val:.3f})")
+
+        # Legend
+        import matplotlib.patches as mpatches
+        legend_patches = [
+            mpatches.Patch(color=cat_colors[i], label=short_lbl[i].replace("\n", " "))
+            for i in range(4)
+        ]
+        ax.legend(handles=legend_patches + [
+            plt.Line2D([0], [0], color=C["text"], linewidth=1.8,
+                       linestyle="--", label=f"Tren (r={corr_val:.3f})")
+        ], fontsize=8.5, ncol=5, loc="upper right")
 
-    fig, ax = fig_clean(12, 4.5)
-    ax.scatter(sample["delivery_days"], sample["review_score"],
-               c=dot_colors, alpha=0.18, s=10, edgecolors="none")
-
-    # Regression line
-    z = np.polyfit(sample["delivery_days"], sample["review_score"], 1)
-    xl = np.linspace(0, del_df["delivery_days"].quantile(0.99), 200)
-    ax.plot(xl, np.poly1d(z)(xl), color=C["text"], linewidth=2,
-            linestyle="--", label=f"Tren linear  (r = {corr_val:.3f})")
-
-    # Legend
-    import matplotlib.patches as mpatches
-    legend_patches = [
-        mpatches.Patch(color=cat_colors[i], label=short_lbl[i].replace("\n", " "))
-        for i in range(4)
-    ]
-    ax.legend(handles=legend_patches + [
-        plt.Line2D([0], [0], color=C["text"], linewidth=1.8,
-                   linestyle="--", label=f"Tren (r={corr_val:.3f})")
-    ], fontsize=8.5, ncol=5, loc="upper right")
-
-    ax.set_xlabel("Lama Pengiriman (Hari)")
-    ax.set_ylabel("Review Score")
-    ax.set_xlim(-1, del_df["delivery_days"].quantile(0.99) + 2)
-    ax.set_ylim(0.5, 5.5)
-    plt.tight_layout()
-    st.pyplot(fig); plt.close()
+        ax.set_xlabel("Lama Pengiriman (Hari)")
+        ax.set_ylabel("Review Score")
+        ax.set_xlim(-1, total["days_p99"] + 2)
+        ax.set_ylim(0.5, 5.5)
+        return fig
+    show_chart("delivery_scatter", draw, stats_df, fit)
 
     insight(
         f"Terdapat korelasi negatif antara lama pengiriman dan kepuasan pelanggan (<b>r = {corr_val:.3f}</b>). "
@@ -975,6 +1252,266 @@ elif page == "Pengiriman & Kepuasan":
         "untuk meningkatkan kepuasan pelanggan secara langsung."
     )
 
+# ══════════════════════════════════════════════════════════════
+# KOHORT RETENSI
+# ══════════════════════════════════════════════════════════════
+elif page == "Kohort Retensi":
+    st.markdown('<div class="page-title">Kohort Retensi</div>', unsafe_allow_html=True)
+    st.markdown('<div class="page-sub">Retensi dan revenue pelanggan per bulan akuisisi (bulan pembelian pertama)</div>', unsafe_allow_html=True)
+
+    matrix = cohort_matrix(version)
+    with timer.stage("cohort_window"):
+        active = matrix.frame("customers", start, end)
+        retention = matrix.frame("retention", start, end)
+        revenue = matrix.frame("revenue", start, end)
+    if active.empty:
+        st.warning("Belum ada kohort pada rentang tanggal yang dipilih.")
+        stop()
+
+    sizes = active[0]
+    # Rata-rata tertimbang per umur: hanya kohort yang sudah teramati sampai umur tersebut
+    curve = active.sum() / active.notna().mul(sizes, axis=0).sum()
+    repeat_share = revenue.iloc[:, 1:].sum().sum() / revenue.sum().sum() * 100
+
+    section("RINGKASAN")
+    c1, c2, c3, c4 = st.columns(4)
+    with c1: kpi("Jumlah Kohort",        f"{len(active)}", f"{active.index[0]} – {active.index[-1]}")
+    with c2: kpi("Pelanggan Baru",       f"{int(sizes.sum()):,}")
+    with c3: kpi("Retensi Bulan ke-1",   f"{curve.get(1, np.nan):.2%}" if len(curve) > 1 else "–",
+                                         "rata-rata tertimbang")
+    with c4: kpi("Revenue Pembelian Ulang", f"{repeat_share:.1f}%", "umur ≥ 1 bulan")
+
+    section("MATRIKS KOHORT")
+    col1, col2 = st.columns([2, 3], gap="large")
+    with col1:
+        measure = st.radio("Nilai", ["Retensi (%)", "Pelanggan aktif", "Revenue"], horizontal=True,
+                           key="cohort_measure")
+    with col2:
+        max_age = active.shape[1] - 1
+        ages = st.slider("Umur maksimum (bulan)", 1, max(max_age, 1), min(12, max(max_age, 1)),
+                         key="cohort_ages") if max_age > 1 else max_age
+    shown = {"Retensi (%)": retention, "Pelanggan aktif": active, "Revenue": revenue}[measure]
+    shown = shown.iloc[:, :ages + 1]
+    st.markdown('<div class="chart-title">Matriks Kohort Bulanan</div>', unsafe_allow_html=True)
+    st.markdown('<div class="chart-sub">Baris = bulan akuisisi, kolom = umur (bulan sejak pembelian pertama); sel kosong belum teramati</div>', unsafe_allow_html=True)
+
+    def draw():
+        fig, ax = fig_clean(12, max(4, len(shown) * 0.32))
+        data = shown.to_numpy(dtype=float)
+        # Umur 0 retensi selalu 100%: skala warna dari umur ≥ 1 agar variasinya terlihat
+        scale = data[:, 1:] if measure == "Retensi (%)" and data.shape[1] > 1 else data
+        vmax = np.nanmax(scale) if np.isfinite(scale).any() else 1
+        ax.imshow(np.ma.masked_invalid(data), cmap="Blues", vmin=0, vmax=vmax or 1, aspect="auto")
+        ax.set_xticks(range(shown.shape[1]))
+        ax.set_xticklabels(shown.columns)
+        ax.set_yticks(range(len(shown)))
+        ax.set_yticklabels(shown.index, fontsize=8)
+        ax.set_xlabel("Umur (bulan)")
+        ax.set_ylabel("Kohort")
+        ax.grid(False)
+        if data.size <= 400:
+            fmt = {"Retensi (%)": "{:.0%}", "Pelanggan aktif": "{:,.0f}", "Revenue": "{:,.0f}"}[measure]
+            for i, j in zip(*np.nonzero(np.isfinite(data))):
+                ax.text(j, i, fmt.format(data[i, j]), ha="center", va="center", fontsize=7,
+                        color=C["white"] if data[i, j] > 0.6 * vmax else C["text"])
+        return fig
+    show_chart("cohort_matrix", draw, shown, measure)
+
+    section("KURVA RETENSI")
+    st.markdown('<div class="chart-title">Rata-rata Retensi per Umur Kohort</div>', unsafe_allow_html=True)
+    st.markdown('<div class="chart-sub">Pelanggan aktif ÷ ukuran kohort, ditimbang ukuran kohort yang sudah teramati pada umur tersebut</div>', unsafe_allow_html=True)
+    tail = curve.iloc[1:ages + 1]
+    if len(tail):
+        def draw():
+            fig, ax = fig_clean(12, 3.5)
+            ax.plot(tail.index, tail.to_numpy() * 100, color=C["primary"], marker="o", linewidth=1.8)
+            ax.set_xlabel("Umur (bulan)")
+            ax.set_ylabel("Retensi (%)")
+            ax.set_xticks(tail.index)
+            ax.yaxis.set_major_formatter(mticker.FuncFormatter(lambda v, _: f"{v:.1f}%"))
+            return fig
+        show_chart("cohort_curve", draw, tail)
+
+    with st.expander("Lihat tabel lengkap"):
+        st.dataframe(shown.style.format("{:.1%}" if measure == "Retensi (%)" else "{:,.0f}", na_rep=""),
+                     width="stretch")
+    st.caption("Kohort = bulan pembelian pertama sepanjang histori. Dengan Filter Tanggal, hanya kohort yang "
+               "diakuisisi di rentang tersebut yang ditampilkan dan aktivitas setelah bulan akhir tidak dihitung.")
+
+    insight(
+        "Sebagian besar pelanggan hanya bertransaksi sekali: retensi bulan-bulan berikutnya berada di kisaran "
+        "beberapa persen dari ukuran kohort. Revenue dari pembelian ulang menunjukkan seberapa besar bisnis bergantung "
+        "pada akuisisi pelanggan baru — program loyalitas dan kampanye <i>repeat purchase</i> pada bulan pertama "
+        "setelah akuisisi berpotensi menaikkan kurva retensi."
+    )
+
+
+# ══════════════════════════════════════════════════════════════
+# PERFORMA SELLER
+# ══════════════════════════════════════════════════════════════
+elif page == "Performa Seller":
+    st.markdown('<div class="page-title">Performa Seller</div>', unsafe_allow_html=True)
+    st.markdown('<div class="page-sub">Scorecard per seller — revenue, order, lama pengiriman, review, dan keterlambatan dari estimasi</div>', unsafe_allow_html=True)
+
+    board = seller_board(version)
+    col1, col2, col3 = st.columns([2, 3, 1], gap="large")
+    with col1:
+        metric = st.selectbox("Metrik peringkat", list(SELLER_METRICS), format_func=SELLER_METRICS.get,
+                              key="seller_metric")
+    with col2:
+        states = st.multiselect("Negara bagian seller", board.states, key="seller_states",
+                                placeholder="Semua negara bagian")
+    with col3:
+        min_orders = st.number_input("Minimal order", 1, value=10, key="seller_min_orders",
+                                     help="Seller dengan order lebih sedikit tidak diperingkat "
+                                          "(rata-rata dari sedikit order tidak stabil).")
+    k = st.slider("Jumlah seller yang ditampilkan", 5, 30, 10, key="seller_k")
+    st.caption("Filter Tanggal tidak berlaku di halaman ini; scorecard dihitung dari seluruh histori.")
+
+    with timer.stage("seller_rank"):
+        summary = board.summary(states, min_orders)
+        top = board.rank(metric, k, states, min_orders, largest=True)
+        bottom = board.rank(metric, k, states, min_orders, largest=False)
+    if not summary["sellers"]:
+        st.warning("Tidak ada seller yang memenuhi filter.")
+        stop()
+
+    section("RINGKASAN")
+    c1, c2, c3, c4 = st.columns(4)
+    with c1: kpi("Jumlah Seller",         f"{summary['sellers']:,}", f"{summary['orders']:,} order")
+    with c2: kpi("Total Revenue",         f"R${summary['revenue']/1e6:.2f}M")
+    with c3: kpi("Avg Review Score",      f"{summary['avg_review_score']:.2f} / 5", "tertimbang order")
+    with c4: kpi("Tingkat Keterlambatan", f"{summary['late_rate']:.1%}", "diterima setelah estimasi")
+
+    fmt = {"revenue": lambda v: f"R${v:,.0f}", "orders": lambda v: f"{v:,.0f}",
+           "avg_delivery_days": lambda v: f"{v:.1f} hari", "avg_review_score": lambda v: f"{v:.2f}",
+           "late_rate": lambda v: f"{v:.1%}"}[metric]
+    # Lama kirim & keterlambatan: makin kecil makin baik
+    lower_better = metric in ("avg_delivery_days", "late_rate")
+
+    def draw_rank(ranked, color, light):
+        def draw():
+            fig, ax = fig_clean(7, max(4, len(ranked) * 0.42))
+            labels = ranked["seller_id"].astype(str).str[:8] + "… · " + ranked["seller_state"].astype(str)
+            values = ranked[metric].to_numpy(dtype=float)
+            bars = ax.barh(labels, values, color=[color] + [light] * (len(ranked) - 1), height=0.6)
+            ax.set_xlabel(SELLER_METRICS[metric])
+            if metric == "late_rate":
+                ax.xaxis.set_major_formatter(mticker.PercentFormatter(1.0))
+            ax.invert_yaxis()
+            ax.grid(axis="x"); ax.grid(axis="y", alpha=0)
+            span = values.max() if len(values) else 0
+            for bar, v in zip(bars, values):
+                ax.text(bar.get_width() + span * 0.01, bar.get_y() + bar.get_height() / 2,
+                        fmt(v), va="center", fontsize=8, color=C["muted"])
+            return fig
+        return draw
+
+    section("PERINGKAT SELLER")
+    col1, col2 = st.columns(2, gap="large")
+    with col1:
+        st.markdown(f'<div class="chart-title">{"Terbaik" if lower_better else "Tertinggi"} — '
+                    f'{k} {"Terendah" if lower_better else "Teratas"}</div>', unsafe_allow_html=True)
+        best = bottom if lower_better else top
+        show_chart("seller_best", draw_rank(best, C["green"], "#6EE7B7"), best, metric)
+    with col2:
+        st.markdown(f'<div class="chart-title">{"Terburuk" if lower_better else "Terendah"} — '
+                    f'{k} {"Tertinggi" if lower_better else "Terbawah"}</div>', unsafe_allow_html=True)
+        worst = top if lower_better else bottom
+        show_chart("seller_worst", draw_rank(worst, C["red"], "#FCA5A5"), worst, metric)
+
+    with st.expander("Lihat tabel peringkat"):
+        columns = {"seller_id": "Seller", "seller_city": "Kota", "seller_state": "Negara Bagian",
+                   "orders": "Order", "items": "Item", "revenue": "Revenue", "avg_delivery_days": "Lama Kirim (hari)",
+                   "avg_review_score": "Review", "late_rate": "Terlambat"}
+        st.dataframe(
+            (bottom if lower_better else top).rename(columns=columns).style.format({
+                "Revenue": "R${:,.2f}", "Lama Kirim (hari)": "{:.1f}", "Review": "{:.2f}", "Terlambat": "{:.1%}",
+            }),
+            hide_index=True, width="stretch",
+        )
+
+    insight(
+        "Revenue seller sangat terkonsentrasi: segelintir seller teratas menyumbang porsi besar dari total. "
+        "Seller dengan tingkat keterlambatan tinggi cenderung juga memiliki rata-rata review lebih rendah — "
+        "keterlambatan dari estimasi adalah sinyal paling jelas untuk program pembinaan seller "
+        "(SLA pengiriman, gudang yang lebih dekat ke pelanggan) maupun penyesuaian estimasi di negara bagian yang jauh."
+    )
+
+
+# ══════════════════════════════════════════════════════════════
+# CARI PELANGGAN & ORDER
+# ══════════════════════════════════════════════════════════════
+elif page == "Cari Pelanggan & Order":
+    st.markdown('<div class="page-title">Cari Pelanggan & Order</div>', unsafe_allow_html=True)
+    st.markdown('<div class="page-sub">Detail satu pelanggan atau order — item, kategori, pembayaran, pengiriman, review, dan segmen RFM</div>', unsafe_allow_html=True)
+
+    lookup = main_lookup(version)
+    key_col = {"Pelanggan": "customer_unique_id", "Order": "order_id"}
+    col1, col2 = st.columns([1, 3], gap="large")
+    with col1:
+        kind = st.radio("Cari berdasarkan", list(key_col), horizontal=True, key="lookup_kind")
+    with col2:
+        query = st.text_input(f"ID {kind.lower()}", key="lookup_id",
+                              placeholder=f"{key_col[kind]} (32 karakter hex)").strip()
+    st.caption(f"Contoh: `{lookup.latest(key_col[kind])}`. Filter Tanggal tidak berlaku di halaman ini; "
+               "seluruh riwayat ditampilkan.")
+
+    if query:
+        with timer.stage("lookup"):
+            if kind == "Pelanggan":
+                items, orders, rfm_row = lookup.customer(query)
+            else:
+                (items, orders), rfm_row = lookup.order(query), None
+
+        if items.empty:
+            st.warning(f"{kind} dengan ID `{query}` tidak ditemukan.")
+        else:
+            first = items.iloc[0]
+            section("RINGKASAN")
+            c1, c2, c3, c4 = st.columns(4)
+            if kind == "Pelanggan":
+                with c1: kpi("Total Order",      f"{len(orders):,}",
+                                                 f"{first['customer_city']} · {first['customer_state']}")
+                with c2: kpi("Total Pembayaran", f"R${orders['payment_value'].sum():,.2f}")
+                with c3: kpi("Avg Review Score", f"{orders['review_score'].mean():.2f} / 5")
+                with c4: kpi("Segmen RFM",       rfm_row["segment"] if rfm_row is not None else "–",
+                                                 f"Recency {rfm_row['recency']} hari" if rfm_row is not None else "")
+            else:
+                with c1: kpi("Pelanggan",        first["customer_unique_id"][:8] + "…",
+                                                 f"{first['customer_city']} · {first['customer_state']}")
+                with c2: kpi("Pembayaran",       f"R${first['payment_value']:,.2f}",
+                                                 str(first["payment_type"]).replace("_", " ").title())
+                with c3: kpi("Lama Pengiriman",  f"{first['delivery_days']} hari")
+                with c4: kpi("Review Score",     f"{first['review_score']:.1f} / 5")
+                st.caption(f"customer_unique_id: `{first['customer_unique_id']}`")
+
+            section("ORDER")
+            st.dataframe(
+                orders.rename(columns={
+                    "order_purchase_timestamp": "Tanggal Beli", "items": "Item", "categories": "Kategori",
+                    "revenue": "Harga + Ongkir", "payment_type": "Metode", "payment_value": "Pembayaran",
+                    "delivery_days": "Lama Kirim (hari)", "review_score": "Review",
+                }).style.format({"Harga + Ongkir": "R${:,.2f}", "Pembayaran": "R${:,.2f}", "Review": "{:.1f}"}),
+                hide_index=True, width="stretch",
+            )
+
+            section("ITEM")
+            st.dataframe(
+                items[["order_id", "order_item_id", "product_id", "product_category_name_english",
+                       "seller_id", "price", "freight_value", "order_delivered_customer_date"]].rename(columns={
+                    "order_item_id": "Item", "product_category_name_english": "Kategori",
+                    "price": "Harga", "freight_value": "Ongkir", "order_delivered_customer_date": "Tanggal Terima",
+                }).style.format({"Harga": "R${:,.2f}", "Ongkir": "R${:,.2f}"}),
+                hide_index=True, width="stretch",
+            )
+    else:
+        st.info("Masukkan ID untuk melihat detailnya.")
+
+
+# ─── Debug Panel ──────────────────────────────────────────────
+debug_panel()
+
 
 # ─── Footer ───────────────────────────────────────────────────
 st.markdown("<br>", unsafe_allow_html=True)
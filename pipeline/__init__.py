@@ -0,0 +1,11 @@
+"""
+Pipeline ETL Olist: membangun main_df dan tabel turunan dashboard tanpa notebook.
+
+Jalankan: python -m pipeline --data E-Commerce_Public_Dataset --out dashboard
+"""
+
+from .build import build_all, run, write_artifacts
+from .load import load_raw
+from .timing import StageTimer
+
+__all__ = ["build_all", "load_raw", "run", "write_artifacts", "StageTimer"]
@@ -0,0 +1,73 @@
+"""
+CLI: python -m pipeline [--data DIR] [--out DIR] [--timings FILE] [--refit-rfm] [--trace-memory] [--workers N]
+     python -m pipeline --incremental DELTA_DIR [--data DIR] [--out DIR]
+     python -m pipeline --stream [--chunksize N] [--spill-dir DIR] [--data DIR] [--out DIR]
+"""
+
+import argparse
+import logging
+import sys
+
+from .build import run
+from .config import CHUNK_ROWS, DATA_PATH, OUT_PATH
+from .incremental import run_incremental
+from .store import FORMATS
+from .stream import run_streaming
+from .timing import StageTimer
+
+log = logging.getLogger("pipeline")
+
+
+def parse_args(argv=None):
+    p = argparse.ArgumentParser(prog="python -m pipeline",
+                                description="Bangun ulang artefak dashboard dari dataset mentah Olist.")
+    p.add_argument("--data", default=DATA_PATH, help="folder CSV mentah Olist")
+    p.add_argument("--out", default=OUT_PATH, help="folder tujuan artefak dashboard")
+    p.add_argument("--timings", default=None, help="simpan durasi per stage ke file CSV ini")
+    p.add_argument("--format", nargs="+", choices=FORMATS, default=list(FORMATS),
+                   help="format artefak build penuh (default: semua)")
+    p.add_argument("--incremental", metavar="DELTA_DIR", default=None,
+                   help="refresh append-only dari CSV orders/order_items/payments/reviews baru di folder ini")
+    p.add_argument("--stream", action="store_true",
+                   help="build penuh per chunk dengan memori terbatas (untuk CSV yang lebih besar dari RAM)")
+    p.add_argument("--chunksize", type=int, default=CHUNK_ROWS,
+                   help=f"baris per chunk CSV untuk --stream (default: {CHUNK_ROWS})")
+    p.add_argument("--spill-dir", default=None,
+                   help="induk folder sementara partisi --stream (default: temp sistem)")
+    p.add_argument("--refit-rfm", action="store_true",
+                   help="hitung ulang threshold RFM dari kuantil walau metadata lama masih valid")
+    p.add_argument("--workers", type=int, default=1,
+                   help="jumlah proses untuk tabel turunan build penuh (0 = semua core, default: 1)")
+    p.add_argument("--trace-memory", action="store_true",
+                   help="catat puncak alokasi memori per stage (tracemalloc, lebih lambat)")
+    p.add_argument("-q", "--quiet", action="store_true", help="hanya tampilkan ringkasan akhir")
+    return p.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.WARNING if args.quiet else logging.INFO,
+                        format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    timer = StageTimer(trace_memory=args.trace_memory)
+    try:
+        if args.incremental:
+            run_incremental(args.data, args.incremental, args.out, timer)
+        elif args.stream:
+            run_streaming(args.data, args.out, timer, args.chunksize, refit_rfm=args.refit_rfm,
+                          formats=tuple(args.format), spill_dir=args.spill_dir)
+        else:
+            run(args.data, args.out, timer, refit_rfm=args.refit_rfm, formats=tuple(args.format),
+                workers=args.workers)
+    except FileNotFoundError as e:
+        log.error("File tidak ditemukan: %s", e)
+        return 1
+
+    if args.timings:
+        timer.to_frame().to_csv(args.timings, index=False)
+    print(timer.report())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
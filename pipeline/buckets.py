@@ -0,0 +1,126 @@
+"""
+Bucket waktu bilangan bulat (hari/minggu/bulan/kuartal) untuk seri tren.
+
+Timestamp dipetakan sekali ke kode hari (hari sejak 1970-01-01); kode
+granularitas lain diturunkan dari kode hari dengan aritmetika integer:
+minggu = (hari + 3) // 7 (minggu mulai Senin), bulan = bulan sejak 1970-01,
+kuartal = bulan // 3. Agregasi per bucket cukup np.bincount atas selisih
+kode, tanpa Period atau kolom string, dan bucket tanpa transaksi tetap ada
+(bernilai 0) sehingga moving average tidak melompati periode kosong.
+
+Moving average jendela berapa pun dihitung dari prefix sum: satu cumsum,
+lalu (P[i + 1] - P[i + 1 - w]) / w, setara rolling(w, min_periods=1).mean().
+"""
+
+import numpy as np
+import pandas as pd
+
+# Granularitas → (label dashboard, kata benda periode)
+GRANULARITIES = {
+    "D": ("Harian",    "hari"),
+    "W": ("Mingguan",  "minggu"),
+    "M": ("Bulanan",   "bulan"),
+    "Q": ("Kuartalan", "kuartal"),
+}
+TREND_MEASURES = ["total_orders", "total_revenue"]
+
+
+def day_code(ts):
+    """Kode hari (int64, hari sejak 1970-01-01) per timestamp."""
+    return np.asarray(ts, dtype="datetime64[ns]").astype("datetime64[D]").astype(np.int64)
+
+
+def bucket_code(days, freq):
+    """Kode bucket `freq` dari kode hari."""
+    days = np.asarray(days, dtype=np.int64)
+    if freq == "D":
+        return days
+    if freq == "W":
+        return (days + 3) // 7
+    months = days.astype("datetime64[D]").astype("datetime64[M]").astype(np.int64)
+    if freq == "M":
+        return months
+    if freq == "Q":
+        return months // 3
+    raise ValueError(f"granularitas tidak dikenal: {freq!r} (pilih {', '.join(GRANULARITIES)})")
+
+
+def bucket_start(codes, freq):
+    """Tanggal awal tiap bucket (kebalikan bucket_code)."""
+    codes = np.asarray(codes, dtype=np.int64)
+    if freq == "D":
+        start = codes.astype("datetime64[D]")
+    elif freq == "W":
+        start = (codes * 7 - 3).astype("datetime64[D]")
+    else:
+        start = (codes * (3 if freq == "Q" else 1)).astype("datetime64[M]")
+    return pd.DatetimeIndex(start.astype("datetime64[ns]"))
+
+
+def bucket_label(codes, freq):
+    """Label tampilan: 2017-03-06 (hari/awal minggu), 2017-03 (bulan), 2017Q1 (kuartal)."""
+    start = bucket_start(codes, freq)
+    if freq == "M":
+        return start.strftime("%Y-%m")
+    if freq == "Q":
+        return start.year.astype(str) + "Q" + start.quarter.astype(str)
+    return start.strftime("%Y-%m-%d")
+
+
+def moving_average(values, window):
+    """Rata-rata bergerak `window` periode dari prefix sum (periode awal memakai yang tersedia)."""
+    values = np.asarray(values, dtype=float)
+    prefix = np.zeros(len(values) + 1)
+    np.cumsum(values, out=prefix[1:])
+    hi = np.arange(1, len(values) + 1)
+    lo = np.maximum(hi - window, 0)
+    return (prefix[hi] - prefix[lo]) / (hi - lo)
+
+
+def growth(values):
+    """Pertumbuhan (%) terhadap periode sebelumnya; NaN untuk periode pertama atau basis 0."""
+    values = np.asarray(values, dtype=float)
+    out = np.full(len(values), np.nan)
+    base = values[:-1]
+    np.divide(values[1:] - base, base, out=out[1:], where=base != 0)
+    return out * 100
+
+
+class TimeBuckets:
+    """Seri tren untuk granularitas & jendela MA apa pun dari artefak daily_trend.
+
+    Kode hari dan kode setiap granularitas dihitung sekali saat dibuat; satu
+    query = dua searchsorted atas kode hari lalu satu bincount per measure.
+    """
+
+    def __init__(self, daily):
+        # Refresh inkremental bisa menulis hari watermark dua kali: jumlahkan dulu per hari
+        daily = daily.groupby("date", sort=True)[["orders", "revenue"]].sum()
+        self._days = day_code(daily.index)
+        self._values = daily.to_numpy(dtype=float)
+        self._codes = {freq: bucket_code(self._days, freq) for freq in GRANULARITIES}
+
+    def series(self, freq="M", start=None, end=None):
+        """(kode bucket, jumlah orders & revenue per bucket) untuk tanggal start..end, bucket kosong = 0."""
+        lo = 0 if start is None else np.searchsorted(self._days, day_code([pd.Timestamp(start)])[0])
+        hi = len(self._days) if end is None else np.searchsorted(
+            self._days, day_code([pd.Timestamp(end)])[0], side="right")
+        codes = self._codes[freq][lo:hi]
+        if not len(codes):
+            return codes, np.zeros((0, self._values.shape[1]))
+        idx = codes - codes[0]
+        sums = np.stack([np.bincount(idx, weights=self._values[lo:hi, j], minlength=idx[-1] + 1)
+                         for j in range(self._values.shape[1])], axis=-1)
+        return codes[0] + np.arange(len(sums)), sums
+
+    def trend(self, freq="M", window=3, start=None, end=None):
+        """Tabel tren: bucket, label, total_orders, total_revenue, MA `window` periode, rev_growth (%)."""
+        codes, sums = self.series(freq, start, end)
+        trend = pd.DataFrame({"bucket": bucket_start(codes, freq), "label": bucket_label(codes, freq)})
+        for j, col in enumerate(TREND_MEASURES):
+            trend[col] = sums[:, j]
+        trend["total_orders"] = trend["total_orders"].astype(np.int64)
+        trend["orders_MA"] = moving_average(sums[:, 0], window)
+        trend["revenue_MA"] = moving_average(sums[:, 1], window)
+        trend["rev_growth"] = growth(sums[:, 1])
+        return trend
@@ -0,0 +1,360 @@
+"""
+Stage ETL: dari tabel mentah Olist menjadi main_df dan tabel turunan dashboard.
+
+Urutan langkah mengikuti Proyek_Analisis_Data.ipynb:
+filter order delivered → agregasi payments & reviews → merge bertahap →
+tabel turunan (revenue, RFM, tren bulanan, pembayaran, pengiriman).
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .config import (ARTIFACTS, CUBE_DIMENSIONS, CUBE_MEASURES, MAX_DELIVERY_DAYS,
+                     ORDER_DATE_COLS, OUT_PATH, RFM_EDGES_FILE, STATE_FILE)
+from .buckets import day_code, moving_average
+from .delivery import daily_moments, delivery_category, delivery_histogram, stats_from_histogram
+from .hll import sparse_entries
+from .ids import intern_ids, save_ids
+from .joins import lookup
+from .load import load_raw
+from .lookup import lookup_index
+from .rfm import load_edges, rfm_table, save_edges
+from .sellers import scorecards, seller_aggregates
+from .state import build_state, cohort_state, payment_state, save_state
+from .store import FORMATS, write_table
+from .timing import StageTimer
+
+
+# ─── Cleaning & agregasi per order ────────────────────────────
+def clean_orders(orders_df):
+    """Order berstatus delivered dengan delivery_days valid (0–120 hari)."""
+    orders_df = orders_df.copy()
+    for col in ORDER_DATE_COLS:
+        orders_df[col] = pd.to_datetime(orders_df[col])
+
+    delivered = orders_df[orders_df["order_status"] == "delivered"]
+    delivered = delivered.dropna(subset=["order_delivered_customer_date", "order_purchase_timestamp"])
+    delivered = delivered.assign(delivery_days=(
+        delivered["order_delivered_customer_date"] - delivered["order_purchase_timestamp"]
+    ).dt.days)
+    return delivered[(delivered["delivery_days"] >= 0) & (delivered["delivery_days"] <= MAX_DELIVERY_DAYS)]
+
+
+def top_category(df, key, value):
+    """Nilai `value` paling sering per `key` (Series ber-index `key`, terurut).
+
+    Pengganti vektor untuk `groupby(key)[value].agg(lambda x: x.mode()[0])`:
+    hitung (key, value), urutkan count menurun lalu value menaik, ambil baris
+    pertama per key. Seri diselesaikan seperti mode() — nilai terkecil menang —
+    dan NaN diabaikan.
+    """
+    counts = df.groupby([key, value], observed=True, sort=False).size().rename("_count").reset_index()
+    counts = counts.sort_values([key, "_count", value], ascending=[True, False, True], kind="stable")
+    return counts.drop_duplicates(key).set_index(key)[value]
+
+
+def aggregate_payments(payments_df):
+    """Total payment_value dan metode dominan per order."""
+    agg = payments_df.groupby("order_id")[["payment_value"]].sum()
+    agg["payment_type"] = top_category(payments_df, "order_id", "payment_type")
+    return agg.reset_index()
+
+
+def aggregate_reviews(reviews_df):
+    """Rata-rata review_score per order."""
+    return reviews_df.groupby("order_id")["review_score"].mean().reset_index()
+
+
+def translate_products(products_df, translation_df):
+    """Tambahkan product_category_name_english ('unknown' jika tidak ada terjemahan)."""
+    products = pd.merge(products_df, translation_df, on="product_category_name", how="left")
+    products["product_category_name_english"] = products["product_category_name_english"].fillna("unknown")
+    return products
+
+
+# ─── main_df ──────────────────────────────────────────────────
+ORDER_COLUMNS = ["order_id", "customer_id", "order_purchase_timestamp",
+                 "order_delivered_customer_date", "order_estimated_delivery_date", "delivery_days"]
+# Kolom tambahan (bukan dari notebook) yang boleh kosong: tidak ikut dropna agar baris main_df sama
+OPTIONAL_ORDER_COLUMNS = ["order_estimated_delivery_date"]
+CUSTOMER_COLUMNS = ["customer_unique_id", "customer_city", "customer_state"]
+ITEM_KEY = ["order_id", "order_item_id"]
+
+
+def build_main_df(order_items_df, orders_delivered, customers_df, products_df,
+                  payments_agg, reviews_agg, timer=None):
+    """Join bertahap ke level item, buang baris kosong dan duplikat, urutkan per waktu beli.
+
+    Rencana join (lihat pipeline.joins): semua tabel per order (payments,
+    reviews, customers) di-join di level order dulu, baru hasilnya ditempel ke
+    order_items yang sudah dipangkas ke order delivered; products terakhir.
+    Baris yang tidak lengkap dibuang di setiap langkah, duplikat dibuang per
+    (order_id, order_item_id). Tiap join tercatat sebagai stage di `timer`.
+    Urutan order_purchase_timestamp dipakai pipeline.query sebagai indeks rentang.
+    """
+    timer = timer or StageTimer()
+    pay_cols = [c for c in payments_agg.columns if c != "order_id"]
+    review_cols = [c for c in reviews_agg.columns if c != "order_id"]
+
+    required = [c for c in ORDER_COLUMNS if c not in OPTIONAL_ORDER_COLUMNS]
+    orders = orders_delivered[ORDER_COLUMNS].dropna(subset=required)
+    with timer.stage("join_payments"):
+        orders = lookup(orders, payments_agg, "order_id", pay_cols)
+    with timer.stage("join_reviews"):
+        orders = lookup(orders, reviews_agg, "order_id", review_cols)
+    with timer.stage("join_customers"):
+        orders = lookup(orders, customers_df, "customer_id", CUSTOMER_COLUMNS)
+    with timer.stage("join_order_items"):
+        items = order_items_df.dropna().drop_duplicates(ITEM_KEY)
+        main_df = lookup(items, orders, "order_id", [c for c in orders.columns if c != "order_id"],
+                         OPTIONAL_ORDER_COLUMNS)
+    with timer.stage("join_products"):
+        main_df = lookup(main_df, products_df, "product_id", ["product_category_name_english"])
+
+    with timer.stage("finalize_main_df"):
+        # Urutan kolom sama dengan rantai pd.merge di notebook
+        main_df = main_df[list(order_items_df.columns) + ORDER_COLUMNS[1:] + CUSTOMER_COLUMNS
+                          + ["product_category_name_english"] + pay_cols + review_cols]
+        main_df = main_df.assign(
+            year_month=main_df["order_purchase_timestamp"].dt.to_period("M"),
+            revenue=main_df["price"] + main_df["freight_value"],
+        )
+        main_df = main_df.sort_values("order_purchase_timestamp", kind="stable", ignore_index=True)
+    return main_df
+
+
+# ─── Tabel turunan ────────────────────────────────────────────
+def revenue_by_category(main_df):
+    return main_df.groupby("product_category_name_english", observed=True).agg(
+        total_revenue=("revenue", "sum"),
+        total_orders=("order_id", "nunique"),
+        avg_revenue_per_order=("revenue", "mean"),
+    ).sort_values("total_revenue", ascending=False).reset_index()
+
+
+def monthly_trend(main_df):
+    trend = main_df.groupby("year_month").agg(
+        total_orders=("order_id", "nunique"),
+        total_revenue=("revenue", "sum"),
+    ).reset_index()
+    trend["year_month_str"] = trend["year_month"].astype(str)
+    trend["orders_MA3"] = moving_average(trend["total_orders"], 3)
+    trend["revenue_MA3"] = moving_average(trend["total_revenue"], 3)
+    return trend
+
+
+def daily_trend(main_df):
+    """Jumlah order unik dan revenue per tanggal beli (hanya hari yang ada transaksinya)."""
+    days = day_code(main_df["order_purchase_timestamp"])
+    if not len(days):
+        return pd.DataFrame({"date": pd.Series(dtype="datetime64[ns]"), "orders": 0, "revenue": 0.0})
+    # Satu order selalu jatuh di satu hari: order unik per hari = baris pertama tiap order_id
+    _, first = np.unique(main_df["order_id"].to_numpy(), return_index=True)
+    idx = days - days.min()
+    orders = np.bincount(idx[first], minlength=idx.max() + 1)
+    revenue = np.bincount(idx, weights=main_df["revenue"].to_numpy(dtype=float), minlength=idx.max() + 1)
+    keep = np.flatnonzero(orders)
+    return pd.DataFrame({"date": (days.min() + keep).astype("datetime64[D]").astype("datetime64[ns]"),
+                         "orders": orders[keep], "revenue": revenue[keep]})
+
+
+def payment_freq(main_df):
+    """Jumlah order & nilai per metode pembayaran dominan (order delivered, satu order dihitung sekali).
+
+    Definisi yang sama dipakai refresh inkremental, build streaming, dan query rentang tanggal.
+    """
+    freq = payment_state(main_df)
+    freq["avg_value"] = freq["total_value"] / freq["count"]
+    freq = freq[["count", "avg_value", "total_value"]].sort_values("count", ascending=False).reset_index()
+    freq["pct"] = (freq["count"] / freq["count"].sum() * 100).round(2)
+    return freq
+
+
+def delivery_review(main_df):
+    """Satu baris per order: delivery_days, review_score, delivery_category."""
+    dr = main_df[["order_id", "delivery_days", "review_score"]].dropna().drop_duplicates(subset="order_id")
+    dr["delivery_category"] = delivery_category(dr["delivery_days"])
+    return dr
+
+
+def delivery_stats(delivery_review):
+    """Statistik per kategori pengiriman + total (rata-rata, kuartil, whisker, Pearson r)."""
+    return stats_from_histogram(delivery_histogram(delivery_review))
+
+
+def delivery_moments(main_df):
+    """Momen delivery_days × review_score per tanggal beli (satu order dihitung sekali)."""
+    orders = main_df[["order_id", "order_purchase_timestamp", "delivery_days", "review_score"]]
+    orders = orders.dropna().drop_duplicates(subset="order_id")
+    return daily_moments(orders["order_purchase_timestamp"].dt.normalize(),
+                         orders["delivery_days"], orders["review_score"])
+
+
+def cohort_matrix(main_df):
+    """Pelanggan aktif, order, dan revenue per (bulan akuisisi, umur bulan)."""
+    return cohort_state(main_df).table()
+
+
+def seller_scorecards(main_df, sellers=None):
+    """Revenue, order, rata-rata lama kirim & review, dan tingkat keterlambatan per seller."""
+    return scorecards(seller_aggregates(main_df), sellers)
+
+
+# ─── Cube harian ──────────────────────────────────────────────
+def cube_keys(main_df):
+    """Kunci cube per baris item: tanggal beli + CUBE_DIMENSIONS."""
+    keys = main_df[CUBE_DIMENSIONS[:-1]].assign(
+        delivery_category=delivery_category(main_df["delivery_days"]))
+    keys.insert(0, "date", main_df["order_purchase_timestamp"].dt.normalize())
+    return keys
+
+
+def id_hash(values):
+    """Hash uint64 (hash_key default pandas) atas kode ID hasil intern.
+
+    Kode bergantung pada kamus `ids/` store yang sama: build penuh memberi kode
+    menurut urutan string, --stream menurut urutan kemunculan. Jadi hash hanya
+    sebanding di dalam satu store (termasuk refresh inkrementalnya, yang
+    memakai ulang kamus), bukan antar store yang dibangun terpisah.
+    """
+    return pd.util.hash_pandas_object(values, index=False).to_numpy()
+
+
+def daily_cube(main_df):
+    """Measure aditif per (date, kategori, payment_type, customer_state, delivery_category).
+
+    payment_value dan orders (satu order) dibagi rata ke item order, sehingga
+    penjumlahan lintas kategori kembali ke total per order.
+    """
+    items_per_order = main_df.groupby("order_id")["order_id"].transform("size")
+    cube = cube_keys(main_df).assign(
+        revenue=main_df["revenue"],
+        items=1,
+        review_sum=main_df["review_score"],
+        review_count=main_df["review_score"].notna().astype(int),
+        delivery_sum=main_df["delivery_days"],
+        delivery_count=main_df["delivery_days"].notna().astype(int),
+        payment_value=main_df["payment_value"] / items_per_order,
+        orders=1 / items_per_order,
+    )
+    return cube.groupby(["date"] + CUBE_DIMENSIONS, observed=True, sort=True)[CUBE_MEASURES].sum().reset_index()
+
+
+def cube_members(main_df):
+    """Himpunan (exact) order & pelanggan per sel cube sebagai hash uint64, terurut tanggal."""
+    members = cube_keys(main_df).assign(order_hash=id_hash(main_df["order_id"]),
+                                        customer_hash=id_hash(main_df["customer_unique_id"]))
+    members = members.drop_duplicates(["date", "order_hash"] + CUBE_DIMENSIONS)
+    return members.sort_values("date", kind="stable", ignore_index=True)
+
+
+def distinct_sketches(members):
+    """Sketch HLL sparse per (date, dimensi, nilai) untuk order & pelanggan.
+
+    dimension "all" adalah sketch harian tanpa irisan. Satu baris per
+    register terisi (entry = register << 8 | rank, rank maksimum).
+    """
+    frames = []
+    for kind in ("order", "customer"):
+        entries = sparse_entries(members[f"{kind}_hash"])
+        for dim in ["all"] + CUBE_DIMENSIONS:
+            sk = pd.DataFrame({
+                "date":     members["date"],
+                "value":    "all" if dim == "all" else members[dim],
+                "register": entries >> 8,
+                "entry":    entries,
+            }).groupby(["date", "value", "register"], observed=True, sort=False)["entry"].max().reset_index()
+            frames.append(sk.assign(dimension=dim, kind=kind)[SKETCH_COLUMNS])
+    return pd.concat(frames, ignore_index=True).sort_values("date", kind="stable", ignore_index=True)
+
+
+# Nama artefak → (fungsi, sumber input)
+DERIVED = {
+    "revenue_by_category": (revenue_by_category, "main_df"),
+    "rfm_df":              (rfm_table,           "main_df"),
+    "monthly_trend":       (monthly_trend,       "main_df"),
+    "daily_trend":         (daily_trend,         "main_df"),
+    "payment_freq":        (payment_freq,        "main_df"),
+    "delivery_review":     (delivery_review,     "main_df"),
+    "delivery_stats":      (delivery_stats,      "delivery_review"),
+    "delivery_moments":    (delivery_moments,    "main_df"),
+    "daily_cube":          (daily_cube,          "main_df"),
+    "cube_members":        (cube_members,        "main_df"),
+    "distinct_sketches":   (distinct_sketches,   "cube_members"),
+    "cohort_matrix":       (cohort_matrix,       "main_df"),
+    "seller_scorecards":   (seller_scorecards,   "main_df"),
+    "lookup_index":        (lookup_index,        "main_df"),
+}
+
+SKETCH_COLUMNS = ["date", "dimension", "value", "kind", "entry"]
+
+
+# ─── Orkestrasi ───────────────────────────────────────────────
+def build_all(raw, timer=None, rfm_edges=None, workers=1):
+    """Jalankan seluruh stage atas dict tabel mentah; hasil: dict nama artefak → DataFrame.
+
+    `rfm_edges` adalah metadata threshold RFM dari build sebelumnya (opsional).
+    Dengan `workers` ≠ 1, tabel turunan dibangun di process pool
+    (pipeline.parallel; 0 = semua core).
+    """
+    timer = timer or StageTimer()
+
+    with timer.stage("clean_orders"):
+        orders_delivered = clean_orders(raw["orders"])
+    with timer.stage("aggregate_payments"):
+        payments_agg = aggregate_payments(raw["payments"])
+    with timer.stage("aggregate_reviews"):
+        reviews_agg = aggregate_reviews(raw["reviews"])
+    with timer.stage("translate_products"):
+        products = translate_products(raw["products"], raw["translation"])
+    main_df = build_main_df(raw["order_items"], orders_delivered, raw["customers"],
+                            products, payments_agg, reviews_agg, timer)
+
+    if workers != 1:
+        # Impor di sini: pipeline.parallel memakai fungsi-fungsi modul ini
+        from .parallel import build_derived_parallel
+        return build_derived_parallel(main_df, raw, workers, timer, rfm_edges)
+
+    # Sumber tabel turunan: tabel mentah atau artefak yang dibangun sebelumnya
+    options = {"rfm_df": {"previous": rfm_edges}, "seller_scorecards": {"sellers": raw.get("sellers")}}
+    artifacts = {"main_df": main_df}
+    for name, (fn, src) in DERIVED.items():
+        with timer.stage(name):
+            source = artifacts[src] if src in artifacts else raw[src]
+            artifacts[name] = fn(source, **options.get(name, {}))
+    return artifacts
+
+
+def write_artifacts(artifacts, out_path=OUT_PATH, formats=FORMATS):
+    """Tulis artefak ke store Parquet dan/atau CSV yang dibaca dashboard."""
+    out_path = Path(out_path)
+    out_path.mkdir(parents=True, exist_ok=True)
+    for name in ARTIFACTS:
+        write_table(artifacts[name], name, out_path, formats)
+    if "rfm_edges" in artifacts["rfm_df"].attrs:
+        save_edges(artifacts["rfm_df"].attrs["rfm_edges"], out_path / RFM_EDGES_FILE)
+
+
+def run(data_path, out_path, timer=None, refit_rfm=False, formats=FORMATS, workers=1):
+    """Load → intern ID → build → write, dengan durasi tiap stage tercatat di `timer`.
+
+    Threshold RFM di `out_path` dipakai ulang kecuali `refit_rfm` atau datanya
+    sudah berubah cukup jauh. State agregat untuk refresh inkremental
+    (lihat pipeline.incremental) ikut ditulis.
+    """
+    timer = timer or StageTimer()
+    with timer.stage("load_raw"):
+        raw = load_raw(data_path)
+    with timer.stage("intern_ids"):
+        raw, ids = intern_ids(raw)
+    rfm_edges = None if refit_rfm else load_edges(Path(out_path) / RFM_EDGES_FILE)
+    artifacts = build_all(raw, timer, rfm_edges, workers)
+    with timer.stage("build_state"):
+        state = build_state(artifacts["main_df"], raw["orders"])
+    with timer.stage("write_artifacts"):
+        write_artifacts(artifacts, out_path, formats)
+        save_ids(ids, out_path)
+        save_state(state, Path(out_path) / STATE_FILE)
+    return artifacts
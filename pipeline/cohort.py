@@ -0,0 +1,172 @@
+"""
+Matriks kohort akuisisi bulanan: retensi & revenue per umur pelanggan.
+
+Kohort seorang pelanggan (customer_unique_id) adalah bulan pembelian
+pertamanya; umur sebuah order = bulan order − bulan kohort. Semua waktu
+dipetakan ke kode bulan bilangan bulat (tahun * 12 + bulan - 1), sehingga
+matriks dibangun tanpa pivot atas baris item: satu event per order
+(np.unique + bincount revenue), bulan pertama per pelanggan lewat groupby,
+selisih kode sebagai umur, lalu np.bincount atas indeks sel
+(kohort * lebar + umur) menjadi matriks padat 2D.
+
+State per pelanggan (bulan pertama & terakhir aktif, array padat per kode
+pelanggan) ikut disimpan di CohortMatrix, sehingga order baru yang selalu
+datang setelah watermark cukup ditambahkan lewat `update`: pelanggan aktif
+hanya dihitung sekali per bulan, termasuk bulan watermark yang terbelah
+antara build lama dan delta. Build penuh, refresh inkremental, dan build
+streaming (partisi bulanan terurut) memakai jalur update yang sama.
+"""
+
+import numpy as np
+import pandas as pd
+
+MEASURES = ["customers", "orders", "revenue"]
+COHORT_COLUMNS = ["cohort", "age"] + MEASURES
+
+
+def month_code(ts):
+    """Kode bulan (tahun * 12 + bulan - 1) per timestamp; -1 untuk NaT."""
+    ts = pd.Series(ts)
+    return (ts.dt.year * 12 + ts.dt.month - 1).fillna(-1).to_numpy(np.int32)
+
+
+def month_start(codes):
+    """Kebalikan month_code: tanggal awal bulan per kode."""
+    codes = np.asarray(codes, dtype=np.int64)
+    return pd.to_datetime(pd.DataFrame({"year": codes // 12, "month": codes % 12 + 1, "day": 1}))
+
+
+def _grow(values, size, fill=-1):
+    """Perpanjang array per kode pelanggan (isi `fill`) sampai `size`."""
+    if size <= len(values):
+        return values
+    return np.concatenate([values, np.full(size - len(values), fill, dtype=values.dtype)])
+
+
+class CohortMatrix:
+    """Matriks padat (kohort × umur bulan) untuk pelanggan aktif, order, dan revenue.
+
+    Baris ke-i adalah kohort bulan `start + i`, kolom ke-k umur k bulan; sel
+    dengan kohort + umur melewati bulan terakhir data belum teramati (0).
+    """
+
+    def __init__(self, start=None, values=None):
+        self.start = start
+        self.values = values or {m: np.zeros((0, 0)) for m in MEASURES}
+        # Per kode pelanggan: kode bulan pertama & terakhir aktif (-1 = belum pernah)
+        self.first = np.empty(0, dtype=np.int32)
+        self.last = np.empty(0, dtype=np.int32)
+
+    @property
+    def size(self):
+        return len(self.values["orders"])
+
+    @property
+    def end(self):
+        """Kode bulan terakhir yang tercakup matriks."""
+        return self.start + self.size - 1
+
+    def _resize(self, start, end):
+        """Perluas matriks agar mencakup kohort `start`..`end` (umur ikut memanjang)."""
+        if self.start is not None:
+            start, end = min(start, self.start), max(end, self.end)
+        size = end - start + 1
+        if self.start is not None and start == self.start and size <= self.size:
+            return
+        shift = 0 if self.start is None else self.start - start
+        for m, old in self.values.items():
+            grown = np.zeros((size, size))
+            grown[shift:shift + len(old), :old.shape[1]] = old
+            self.values[m] = grown
+        self.start = start
+
+    def update(self, main_df):
+        """Tambahkan order di `main_df`; order harus tidak lebih awal dari yang sudah dilipat per pelanggan."""
+        if main_df.empty:
+            return
+        # Satu event per order: pelanggan, bulan beli, revenue (price + freight) seluruh item
+        _, rows, inverse = np.unique(main_df["order_id"].to_numpy(), return_index=True, return_inverse=True)
+        revenue = np.bincount(inverse, weights=main_df["revenue"].to_numpy(dtype=float))
+        cust = main_df["customer_unique_id"].to_numpy()[rows].astype(np.int64)
+        month = month_code(main_df["order_purchase_timestamp"].to_numpy()[rows])
+
+        size = int(cust.max()) + 1
+        self.first, self.last = _grow(self.first, size), _grow(self.last, size)
+        span = pd.Series(month).groupby(cust).agg(["min", "max"])
+        active = span.index.to_numpy()
+        new = self.first[active] < 0
+        self.first[active[new]] = span["min"].to_numpy()[new]
+        cohort = self.first[cust]
+        self._resize(int(cohort.min()), int(month.max()))
+
+        # Pelanggan aktif = pasangan (pelanggan, bulan) unik, kecuali bulan yang sudah terhitung sebelumnya
+        pairs = pd.unique(cust << 32 | month.astype(np.int64))
+        p_cust, p_month = pairs >> 32, (pairs & 0xFFFFFFFF).astype(np.int32)
+        fresh = p_month != self.last[p_cust]
+        self.last[active] = np.maximum(self.last[active], span["max"].to_numpy())
+
+        def add(measure, c, mon, weights=None):
+            cohort_row = self.first[c] - self.start
+            cell = cohort_row * self.size + (mon - self.first[c])
+            self.values[measure] += np.bincount(cell, weights, minlength=self.size ** 2).reshape(
+                self.size, self.size)
+
+        add("customers", p_cust[fresh], p_month[fresh])
+        add("orders", cust, month)
+        add("revenue", cust, month, revenue)
+
+    # ─── Artefak ──────────────────────────────────────────────
+    def table(self):
+        """Artefak cohort_matrix: satu baris per sel teramati (cohort, age)."""
+        if self.start is None:
+            return pd.DataFrame(columns=COHORT_COLUMNS)
+        cohort, age = np.nonzero(np.add.outer(np.arange(self.size), np.arange(self.size)) < self.size)
+        df = pd.DataFrame({"cohort": month_start(self.start + cohort), "age": age})
+        for m in MEASURES:
+            df[m] = self.values[m][cohort, age]
+        return df
+
+    @classmethod
+    def from_table(cls, table):
+        """Matriks dari artefak cohort_matrix (tanpa state per pelanggan, untuk dibaca saja)."""
+        if table.empty:
+            return cls()
+        code = month_code(table["cohort"])
+        start = int(code.min())
+        size = int((code + table["age"].to_numpy()).max()) - start + 1
+        row, age = code - start, table["age"].to_numpy()
+        values = {}
+        for m in MEASURES:
+            values[m] = np.zeros((size, size))
+            values[m][row, age] = table[m].to_numpy(dtype=float)
+        return cls(start, values)
+
+    # ─── Query ────────────────────────────────────────────────
+    def window(self, start=None, end=None):
+        """(kode kohort pertama, {measure: matriks}) untuk kohort yang diakuisisi di bulan start..end.
+
+        Aktivitas setelah bulan `end` tidak dihitung; sel yang belum teramati
+        bernilai NaN.
+        """
+        lo = self.start if start is None else max(self.start, int(month_code([pd.Timestamp(start)])[0]))
+        hi = self.end if end is None else min(self.end, int(month_code([pd.Timestamp(end)])[0]))
+        rows = np.arange(lo, hi + 1) - self.start
+        ages = np.arange(hi - lo + 1)
+        observed = np.add.outer(rows + self.start, ages) <= hi
+        return lo, {m: np.where(observed, self.values[m][np.ix_(rows, ages)], np.nan) for m in MEASURES}
+
+    def frame(self, measure="customers", start=None, end=None):
+        """Matriks `measure` sebagai DataFrame (index = bulan kohort "YYYY-MM", kolom = umur bulan).
+
+        measure "retention" = pelanggan aktif / ukuran kohort (umur 0).
+        """
+        lo, values = self.window(start, end)
+        if measure == "retention":
+            size = values["customers"][:, :1]
+            data = np.divide(values["customers"], size, out=np.full(values["customers"].shape, np.nan),
+                             where=size > 0)
+        else:
+            data = values[measure]
+        index = month_start(lo + np.arange(len(data))).dt.strftime("%Y-%m")
+        return pd.DataFrame(data, index=pd.Index(index, name="cohort"),
+                            columns=pd.RangeIndex(data.shape[1], name="age"))
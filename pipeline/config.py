@@ -0,0 +1,88 @@
+"""
+Konfigurasi path, nama file mentah, dan konstanta pipeline ETL.
+"""
+
+from pathlib import Path
+
+ROOT      = Path(__file__).resolve().parent.parent
+DATA_PATH = ROOT / "E-Commerce_Public_Dataset"
+OUT_PATH  = ROOT / "dashboard"
+
+# ─── File mentah Olist ────────────────────────────────────────
+RAW_FILES = {
+    "customers":   "customers_dataset.csv",
+    "orders":      "orders_dataset.csv",
+    "order_items": "order_items_dataset.csv",
+    "products":    "products_dataset.csv",
+    "translation": "product_category_name_translation.csv",
+    "payments":    "order_payments_dataset.csv",
+    "reviews":     "order_reviews_dataset.csv",
+    "sellers":     "sellers_dataset.csv",
+}
+
+ORDER_DATE_COLS = [
+    "order_purchase_timestamp",
+    "order_approved_at",
+    "order_delivered_carrier_date",
+    "order_delivered_customer_date",
+    "order_estimated_delivery_date",
+]
+
+# Kolom ID hex yang di-intern menjadi kode int32 (pipeline.ids)
+ID_COLUMNS = [
+    "order_id",
+    "customer_id",
+    "customer_unique_id",
+    "product_id",
+    "seller_id",
+]
+IDS_DIR = "ids"
+
+# Jumlah baris per chunk CSV pada build streaming (pipeline.stream)
+CHUNK_ROWS = 500_000
+
+# Batas anomali lama pengiriman (hari)
+MAX_DELIVERY_DAYS = 120
+
+# ─── Artefak dashboard (urutan = urutan penulisan) ────────────
+ARTIFACTS = [
+    "revenue_by_category",
+    "rfm_df",
+    "monthly_trend",
+    "daily_trend",
+    "payment_freq",
+    "delivery_review",
+    "delivery_stats",
+    "delivery_moments",
+    "daily_cube",
+    "cube_members",
+    "distinct_sketches",
+    "cohort_matrix",
+    "seller_scorecards",
+    "lookup_index",
+    "main_df",
+]
+
+# ─── Cube harian (pipeline.cube) ──────────────────────────────
+CUBE_DIMENSIONS = [
+    "product_category_name_english",
+    "payment_type",
+    "customer_state",
+    "delivery_category",
+]
+CUBE_MEASURES = [
+    "revenue",
+    "items",
+    "review_sum",
+    "review_count",
+    "delivery_sum",
+    "delivery_count",
+    "payment_value",
+    "orders",
+]
+
+# Metadata threshold RFM, ditulis di samping rfm_df.csv
+RFM_EDGES_FILE = "rfm_edges.json"
+
+# State agregat untuk refresh inkremental
+STATE_FILE = "pipeline_state.pkl"
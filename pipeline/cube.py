@@ -0,0 +1,255 @@
+"""
+Cube harian pra-agregasi untuk query rentang tanggal × irisan dimensi.
+
+daily_cube menyimpan measure aditif per (date, kategori, payment_type,
+customer_state, delivery_category); cube_members menyimpan hash order &
+pelanggan per sel untuk hitungan distinct yang exact. Saat dimuat, cube
+diringkas menjadi prefix sum per hari (total dan per dimensi), sehingga
+rentang tanpa filter dimensi dijawab dengan satu pengurangan P[d1] - P[d0].
+Dengan filter dimensi, hanya baris cube di rentang tersebut (hasil
+searchsorted) yang di-mask dan di-bincount. main_df tidak disentuh.
+
+Distinct count default-nya exact. Dengan `approx=True` (dan artefak
+distinct_sketches dimuat), hitungan diperoleh dari merge sketch HLL per
+hari/dimensi; galat relatif standar ada di `hll_error`.
+"""
+
+import numpy as np
+import pandas as pd
+
+from . import hll
+from .buckets import moving_average
+from .config import CUBE_DIMENSIONS, CUBE_MEASURES
+
+CATEGORY = "product_category_name_english"
+DAY = np.timedelta64(1, "D")
+
+
+def _codes(frame):
+    """dimensi → (kode int, label) dari kolom category (atau dikategorikan di sini)."""
+    out = {}
+    for dim in CUBE_DIMENSIONS:
+        col = frame[dim] if isinstance(frame[dim].dtype, pd.CategoricalDtype) else frame[dim].astype("category")
+        out[dim] = (col.cat.codes.to_numpy(), col.cat.categories)
+    return out
+
+
+def _prefix(day_idx, codes, n_groups, n_days, values):
+    """Prefix sum (n_days + 1, n_groups, n_measures) atas sumbu hari."""
+    key = day_idx * n_groups + codes
+    sums = np.stack([np.bincount(key, weights=values[:, j], minlength=n_days * n_groups)
+                     for j in range(values.shape[1])], axis=-1).reshape(n_days, n_groups, -1)
+    prefix = np.zeros((n_days + 1, n_groups, values.shape[1]))
+    np.cumsum(sums, axis=0, out=prefix[1:])
+    return prefix
+
+
+class DailyCube:
+    """Query measure & distinct count atas daily_cube + cube_members.
+
+    `where` adalah dict dimensi → daftar nilai yang dipertahankan, mis.
+    {"customer_state": ["SP", "RJ"]}. `by` boleh salah satu CUBE_DIMENSIONS
+    atau "month".
+    """
+
+    def __init__(self, cube, members, sketches=None, precision=hll.HLL_PRECISION):
+        if not cube["date"].is_monotonic_increasing:
+            cube = cube.sort_values("date", kind="stable", ignore_index=True)
+        if not members["date"].is_monotonic_increasing:
+            members = members.sort_values("date", kind="stable", ignore_index=True)
+        self.cube, self.members = cube, members
+        self._ts = {"cube": cube["date"].to_numpy(), "members": members["date"].to_numpy()}
+        self._codes = {"cube": _codes(cube), "members": _codes(members)}
+
+        days = self._ts["cube"].astype("datetime64[D]")
+        self.first = days[0] if len(days) else np.datetime64("1970-01-01")
+        day_idx = ((days - self.first) // DAY).astype(np.intp)
+        self.n_days = int(day_idx[-1]) + 1 if len(day_idx) else 0
+        values = cube[CUBE_MEASURES].to_numpy(dtype=float)
+
+        self._day_prefix = _prefix(day_idx, np.zeros_like(day_idx), 1, self.n_days, values)[:, 0]
+        self._dim_prefix = {dim: _prefix(day_idx, codes, len(cats), self.n_days, values)
+                            for dim, (codes, cats) in self._codes["cube"].items()}
+        self._day_month = (self.first + np.arange(self.n_days) * DAY).astype("datetime64[M]")
+
+        # Sketch HLL: blok (dimensi, kind) → (tanggal, kode nilai, entri), terurut tanggal
+        self.precision = precision
+        self.hll_error = hll.relative_error(precision)
+        self._sketches = None
+        if sketches is not None:
+            self.add_sketches(sketches)
+
+    def add_sketches(self, sketches):
+        """Muat distinct_sketches untuk mode approx (bisa menyusul setelah cube dibuat)."""
+        if not sketches["date"].is_monotonic_increasing:
+            sketches = sketches.sort_values("date", kind="stable", ignore_index=True)
+        value = sketches["value"].astype("category")
+        ts, codes, entries = (sketches["date"].to_numpy(), value.cat.codes.to_numpy(),
+                              sketches["entry"].to_numpy())
+        self._sketch_values = value.cat.categories
+        self._sketches = {key: (ts[pos], codes[pos], entries[pos]) for key, pos in
+                          sketches.groupby(["dimension", "kind"], observed=True).indices.items()}
+
+    @property
+    def has_sketches(self):
+        return self._sketches is not None
+
+    # ─── Rentang ──────────────────────────────────────────────
+    def day_bounds(self, start=None, end=None):
+        """Indeks hari [d0, d1) untuk tanggal start..end (inklusif)."""
+        d0 = 0 if start is None else (np.datetime64(pd.Timestamp(start).date()) - self.first) // DAY
+        d1 = self.n_days if end is None else (np.datetime64(pd.Timestamp(end).date()) - self.first) // DAY + 1
+        return int(np.clip(d0, 0, self.n_days)), int(np.clip(d1, 0, self.n_days))
+
+    def row_bounds(self, frame, start=None, end=None):
+        ts = self._ts[frame]
+        lo = 0 if start is None else np.searchsorted(ts, np.datetime64(pd.Timestamp(start).normalize()))
+        hi = len(ts) if end is None else np.searchsorted(
+            ts, np.datetime64(pd.Timestamp(end).normalize() + pd.Timedelta(days=1)))
+        return int(lo), int(hi)
+
+    def _mask(self, frame, lo, hi, where):
+        mask = np.ones(hi - lo, dtype=bool)
+        for dim, values in where.items():
+            codes, cats = self._codes[frame][dim]
+            allowed = cats.get_indexer(pd.Index(values))
+            mask &= np.isin(codes[lo:hi], allowed[allowed >= 0])
+        return mask
+
+    def _groups(self, frame, by, lo, hi):
+        """(kode grup per baris lo:hi, label grup)."""
+        if by == "month":
+            months, codes = np.unique(self._ts[frame][lo:hi].astype("datetime64[M]"), return_inverse=True)
+            return codes, pd.PeriodIndex(months, freq="M")
+        codes, cats = self._codes[frame][by]
+        return codes[lo:hi], cats
+
+    # ─── Measure aditif ───────────────────────────────────────
+    def totals(self, start=None, end=None, where=None):
+        """Jumlah seluruh measure untuk rentang (dan filter) yang diberikan."""
+        if not where:
+            d0, d1 = self.day_bounds(start, end)
+            sums = self._day_prefix[d1] - self._day_prefix[d0]
+        else:
+            lo, hi = self.row_bounds("cube", start, end)
+            sel = self.cube[CUBE_MEASURES].to_numpy(dtype=float)[lo:hi][self._mask("cube", lo, hi, where)]
+            sums = sel.sum(axis=0)
+        return pd.Series(sums, index=CUBE_MEASURES)
+
+    def by(self, dim, start=None, end=None, where=None):
+        """Measure per nilai `dim`; hanya grup yang punya item di rentang."""
+        if not where and dim in self._dim_prefix:
+            d0, d1 = self.day_bounds(start, end)
+            prefix = self._dim_prefix[dim]
+            sums, labels = prefix[d1] - prefix[d0], self._codes["cube"][dim][1]
+        elif not where:
+            d0, d1 = self.day_bounds(start, end)
+            daily = np.diff(self._day_prefix[d0:d1 + 1], axis=0)
+            labels, codes = np.unique(self._day_month[d0:d1], return_inverse=True)
+            labels = pd.PeriodIndex(labels, freq="M")
+            sums = np.stack([np.bincount(codes, weights=daily[:, j], minlength=len(labels))
+                             for j in range(daily.shape[1])], axis=-1)
+        else:
+            lo, hi = self.row_bounds("cube", start, end)
+            mask = self._mask("cube", lo, hi, where)
+            codes, labels = self._groups("cube", dim, lo, hi)
+            values = self.cube[CUBE_MEASURES].to_numpy(dtype=float)[lo:hi][mask]
+            sums = np.stack([np.bincount(codes[mask], weights=values[:, j], minlength=len(labels))
+                             for j in range(values.shape[1])], axis=-1).reshape(len(labels), -1)
+        out = pd.DataFrame(sums, index=pd.Index(labels, name=dim), columns=CUBE_MEASURES)
+        return out[out["items"] > 0]
+
+    # ─── Distinct count (exact, dari cube_members) ────────────
+    def distinct(self, column, start=None, end=None, by=None, where=None, approx=False):
+        """Jumlah order/pelanggan unik (`column` = "order" atau "customer")."""
+        if approx:
+            return self._approx_distinct(column, start, end, by, where or {})
+        lo, hi = self.row_bounds("members", start, end)
+        mask = self._mask("members", lo, hi, where or {})
+        hashes = self.members[f"{column}_hash"].to_numpy()[lo:hi][mask]
+        if by is None:
+            return len(pd.unique(hashes))
+        codes, labels = self._groups("members", by, lo, hi)
+        counts = pd.Series(hashes).groupby(codes[mask]).nunique()
+        return pd.Series(counts.to_numpy(), index=pd.Index(labels[counts.index], name=by))
+
+    def _approx_distinct(self, column, start, end, by, where):
+        """Estimasi HLL dari merge sketch sparse di rentang (filter ≤1 dimensi)."""
+        if self._sketches is None:
+            raise ValueError("distinct_sketches tidak dimuat; gunakan approx=False")
+        if len(where) > 1 or (where and by in CUBE_DIMENSIONS and by not in where):
+            raise ValueError("mode HLL hanya mendukung filter pada satu dimensi (sama dengan `by`)")
+        dim = by if by in CUBE_DIMENSIONS else next(iter(where), "all")
+        empty = np.array([], dtype="datetime64[ns]"), np.array([], dtype=np.int8), np.array([], dtype=np.uint32)
+        ts, codes, entries = self._sketches.get((dim, column), empty)
+
+        lo = 0 if start is None else np.searchsorted(ts, np.datetime64(pd.Timestamp(start).normalize()))
+        hi = len(ts) if end is None else np.searchsorted(
+            ts, np.datetime64(pd.Timestamp(end).normalize() + pd.Timedelta(days=1)))
+        ts, codes, entries = ts[lo:hi], codes[lo:hi], entries[lo:hi]
+        if where:
+            allowed = self._sketch_values.get_indexer(pd.Index(where[dim]))
+            keep = np.isin(codes, allowed[allowed >= 0])
+            ts, codes, entries = ts[keep], codes[keep], entries[keep]
+
+        if by is None:
+            return int(round(hll.estimate(hll.from_entries(entries, p=self.precision))[0]))
+        if by == "month":
+            labels, groups = np.unique(ts.astype("datetime64[M]"), return_inverse=True)
+            labels = pd.PeriodIndex(labels, freq="M")
+        else:
+            uniq, groups = np.unique(codes, return_inverse=True)
+            labels = self._sketch_values[uniq]
+        est = hll.estimate(hll.from_entries(entries, groups, len(labels), self.precision))
+        return pd.Series(np.round(est).astype(np.int64), index=pd.Index(labels, name=by))
+
+    # ─── Tabel halaman dashboard ──────────────────────────────
+    def overview(self, start=None, end=None, where=None, approx=False):
+        t = self.totals(start, end, where)
+        total_ord = self.distinct("order", start, end, where=where, approx=approx)
+        return {
+            "total_rev":  t["revenue"],
+            "total_ord":  total_ord,
+            "total_cust": self.distinct("customer", start, end, where=where, approx=approx),
+            "avg_score":  t["review_sum"] / t["review_count"] if t["review_count"] else np.nan,
+            "avg_del":    t["delivery_sum"] / t["delivery_count"] if t["delivery_count"] else np.nan,
+            "avg_ticket": t["revenue"] / total_ord if total_ord else 0,
+        }
+
+    def revenue_by_category(self, start=None, end=None, where=None, approx=False):
+        g = self.by(CATEGORY, start, end, where)
+        orders = self.distinct("order", start, end, CATEGORY, where, approx)
+        rev = pd.DataFrame({
+            "total_revenue":         g["revenue"],
+            "total_orders":          orders.reindex(g.index),
+            "avg_revenue_per_order": g["revenue"] / g["items"],
+        })
+        return rev.sort_values("total_revenue", ascending=False).reset_index()
+
+    def monthly_trend(self, start=None, end=None, where=None, approx=False):
+        g = self.by("month", start, end, where)
+        trend = pd.DataFrame({
+            "total_orders":  self.distinct("order", start, end, "month", where, approx).reindex(g.index),
+            "total_revenue": g["revenue"],
+        }).rename_axis("year_month").reset_index()
+        trend["year_month_str"] = trend["year_month"].astype(str)
+        trend["orders_MA3"] = moving_average(trend["total_orders"], 3)
+        trend["revenue_MA3"] = moving_average(trend["total_revenue"], 3)
+        return trend
+
+    def payment_freq(self, start=None, end=None, where=None, approx=False):
+        """Per order (metode dominan), sama seperti artefak payment_freq dan MainQuery.payment_freq.
+
+        Jumlah order diambil dari measure aditif `orders`, bukan distinct count,
+        sehingga tetap exact di mode approx. Dengan filter kategori, order yang
+        itemnya lintas kategori hanya terhitung sebagian.
+        """
+        g = self.by("payment_type", start, end, where)
+        count = g["orders"].round().astype(np.int64)
+        freq = pd.DataFrame({
+            "count":       count,
+            "avg_value":   g["payment_value"] / count,
+            "total_value": g["payment_value"],
+        }).sort_values("count", ascending=False).reset_index()
+        freq["pct"] = (freq["count"] / freq["count"].sum() * 100).round(2)
+        return freq
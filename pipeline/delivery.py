@@ -0,0 +1,175 @@
+"""
+Kategori lama pengiriman & statistik halaman Pengiriman dan Kepuasan.
+
+Kategori dihitung vektor dengan pd.cut atas DELIVERY_EDGES (batas atas
+inklusif tiap kategori) menjadi categorical terurut; dengan edge bawaan
+hasilnya identik dengan fungsi per-baris notebook.
+
+Semua statistik halaman (rata-rata, jumlah order, kuartil & whisker box
+plot, Pearson r) diturunkan dari histogram order per
+(delivery_days, review_score). delivery_days bilangan bulat 0–120 dan
+review_score hanya bernilai kelipatan rata-rata beberapa skor 1–5, jadi
+histogramnya kecil, aditif (bisa dilipat seperti state lain), dan kuantilnya
+tetap exact.
+
+Korelasi dan garis tren OLS cukup dihitung dari momen (n, Σx, Σy, Σx², Σy²,
+Σxy) dengan x = delivery_days dan y = review_score. Momen dijumlahkan untuk
+digabung lintas partisi/chunk/hari; artefak delivery_moments menyimpannya
+per tanggal beli, sehingga r dan garis tren untuk rentang tanggal mana pun
+dijawab dari prefix sum per hari (DailyMoments) tanpa membaca baris order.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Batas atas inklusif (hari) tiap kategori; kategori terakhir = > edge terakhir
+DELIVERY_EDGES = (7, 14, 21)
+DELIVERY_NAMES = ("Fast", "Normal", "Slow", "Very Slow")
+
+# Rentang whisker box plot (× IQR), sama dengan default matplotlib
+WHIS = 1.5
+
+STATS_COLUMNS = ["delivery_category", "orders", "days_mean", "days_p99", "review_mean",
+                 "review_q1", "review_median", "review_q3", "whisker_lo", "whisker_hi",
+                 "fliers", "pearson_r"]
+TOTAL = "Total"
+
+MOMENT_COLUMNS = ["n", "sum_x", "sum_y", "sum_xx", "sum_yy", "sum_xy"]
+
+
+def delivery_labels(edges=DELIVERY_EDGES, names=DELIVERY_NAMES):
+    """Label kategori, mis. "1-Fast (≤7 days)", "2-Normal (8-14 days)", "4-Very Slow (>21 days)"."""
+    if len(names) != len(edges) + 1:
+        raise ValueError(f"butuh {len(edges) + 1} nama kategori untuk {len(edges)} edge")
+    ranges = ([f"≤{edges[0]} days"] + [f"{lo + 1}-{hi} days" for lo, hi in zip(edges, edges[1:])]
+              + [f">{edges[-1]} days"])
+    return [f"{i}-{name} ({rng})" for i, (name, rng) in enumerate(zip(names, ranges), 1)]
+
+
+def delivery_category(days, edges=DELIVERY_EDGES, names=DELIVERY_NAMES):
+    """Kategori lama pengiriman per nilai `days` sebagai categorical terurut."""
+    return pd.cut(days, [-np.inf, *edges, np.inf], labels=delivery_labels(edges, names))
+
+
+# ─── Momen korelasi & regresi ─────────────────────────────────
+def moments(x, y, w=None):
+    """Array momen (n, Σx, Σy, Σx², Σy², Σxy); `w` = frekuensi tiap pasangan (default 1)."""
+    x, y = np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+    w = np.ones_like(x) if w is None else np.asarray(w, dtype=float)
+    return np.array([w.sum(), w @ x, w @ y, w @ (x * x), w @ (y * y), w @ (x * y)])
+
+
+def _centered(m):
+    """(Sxx, Syy, Sxy) terpusat; sisa pembulatan saat semua nilai sama dianggap 0."""
+    n, sx, sy, sxx, syy, sxy = m
+    with np.errstate(invalid="ignore", divide="ignore"):
+        cxx, cyy, cxy = sxx - sx * sx / n, syy - sy * sy / n, sxy - sx * sy / n
+    return (cxx if cxx > 1e-12 * sxx else 0.0), (cyy if cyy > 1e-12 * syy else 0.0), cxy
+
+
+def pearson_r(m):
+    """Korelasi Pearson dari momen; NaN jika kosong atau salah satu varians 0."""
+    cxx, cyy, cxy = _centered(m)
+    if not (cxx > 0 and cyy > 0):
+        return np.nan
+    return cxy / np.sqrt(cxx * cyy)
+
+
+def ols(m):
+    """(slope, intercept) garis OLS y = slope·x + intercept dari momen; NaN jika varians x 0."""
+    n, sx, sy = m[:3]
+    cxx, _, cxy = _centered(m)
+    if not cxx > 0:
+        return np.nan, np.nan
+    slope = cxy / cxx
+    return slope, (sy - slope * sx) / n
+
+
+def daily_moments(dates, x, y):
+    """Momen per tanggal (satu baris per hari, terurut) dari pasangan (x, y)."""
+    x, y = np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+    df = pd.DataFrame({"date": np.asarray(dates), "n": 1, "sum_x": x, "sum_y": y,
+                       "sum_xx": x * x, "sum_yy": y * y, "sum_xy": x * y})
+    return df.groupby("date", sort=True)[MOMENT_COLUMNS].sum().reset_index()
+
+
+class DailyMoments:
+    """Prefix sum momen per hari dari artefak delivery_moments untuk query rentang tanggal."""
+
+    def __init__(self, table):
+        # Refresh inkremental bisa menulis hari watermark dua kali: jumlahkan dulu per hari
+        daily = table.groupby("date", sort=True)[MOMENT_COLUMNS].sum()
+        self._days = daily.index.to_numpy()
+        self._prefix = np.zeros((len(daily) + 1, len(MOMENT_COLUMNS)))
+        np.cumsum(daily.to_numpy(dtype=float), axis=0, out=self._prefix[1:])
+
+    def total(self, start=None, end=None):
+        """Momen gabungan untuk tanggal start..end (inklusif)."""
+        lo = 0 if start is None else np.searchsorted(self._days, np.datetime64(pd.Timestamp(start).normalize()))
+        hi = len(self._days) if end is None else np.searchsorted(
+            self._days, np.datetime64(pd.Timestamp(end).normalize()), side="right")
+        return self._prefix[hi] - self._prefix[lo]
+
+    def fit(self, start=None, end=None):
+        """Jumlah order, Pearson r, dan garis OLS review_score ~ delivery_days untuk rentang."""
+        m = self.total(start, end)
+        slope, intercept = ols(m)
+        return {"orders": int(round(m[0])), "pearson_r": pearson_r(m),
+                "slope": slope, "intercept": intercept}
+
+
+# ─── Statistik dari histogram ─────────────────────────────────
+def delivery_histogram(orders):
+    """Jumlah order per (delivery_days, review_score); `orders` satu baris per order."""
+    return orders.groupby(["delivery_days", "review_score"]).size().to_frame("count")
+
+
+def weighted_quantile(values, counts, q):
+    """Kuantil interpolasi linear (seperti np.percentile) dari nilai terurut + frekuensinya."""
+    cum = np.cumsum(counts)
+    pos = (cum[-1] - 1) * np.asarray(q, dtype=float)
+    lo = np.floor(pos)
+    hi = np.minimum(lo + 1, cum[-1] - 1)
+    v_lo = values[np.searchsorted(cum, lo, side="right")]
+    v_hi = values[np.searchsorted(cum, hi, side="right")]
+    return v_lo + (pos - lo) * (v_hi - v_lo)
+
+
+def box_stats(values, counts):
+    """Kuartil, whisker, dan nilai flier (unik) seperti matplotlib.cbook.boxplot_stats."""
+    q1, median, q3 = weighted_quantile(values, counts, [0.25, 0.5, 0.75])
+    iqr = q3 - q1
+    inside_hi = values[values <= q3 + WHIS * iqr]
+    inside_lo = values[values >= q1 - WHIS * iqr]
+    whisker_hi = max(inside_hi.max(), q3) if len(inside_hi) else q3
+    whisker_lo = min(inside_lo.min(), q1) if len(inside_lo) else q1
+    fliers = values[(values < whisker_lo) | (values > whisker_hi)]
+    return q1, median, q3, whisker_lo, whisker_hi, ";".join(f"{v:g}" for v in fliers)
+
+
+def _summary(hist):
+    """Satu baris statistik untuk histogram (delivery_days, review_score) → count."""
+    days = hist.index.get_level_values("delivery_days").to_numpy(dtype=float)
+    score = hist.index.get_level_values("review_score").to_numpy(dtype=float)
+    w = hist["count"].to_numpy(dtype=float)
+    by_score = hist.groupby(level="review_score")["count"].sum()
+    by_days = hist.groupby(level="delivery_days")["count"].sum()
+    return (int(w.sum()), (w * days).sum() / w.sum(),
+            weighted_quantile(by_days.index.to_numpy(dtype=float), by_days.to_numpy(), 0.99),
+            (w * score).sum() / w.sum(),
+            *box_stats(by_score.index.to_numpy(dtype=float), by_score.to_numpy()),
+            pearson_r(moments(days, score, w)))
+
+
+def stats_from_histogram(hist, edges=DELIVERY_EDGES, names=DELIVERY_NAMES):
+    """Statistik per kategori pengiriman + baris TOTAL, dari histogram order.
+
+    Kolom: orders, days_mean, days_p99, review_mean, kuartil review, whisker
+    box plot, fliers (nilai review unik di luar whisker, dipisah ";"), dan
+    pearson_r (delivery_days vs review_score). Kategori tanpa order dilewati.
+    """
+    hist = hist[hist["count"] > 0].sort_index()
+    category = delivery_category(hist.index.get_level_values("delivery_days"), edges, names)
+    rows = [(label, *_summary(part)) for label, part in hist.groupby(category, observed=True)]
+    rows.append((TOTAL, *_summary(hist)))
+    return pd.DataFrame(rows, columns=STATS_COLUMNS)
@@ -0,0 +1,87 @@
+"""
+Cache gambar grafik hasil render untuk dashboard.
+
+Setiap interaksi widget menjalankan ulang seluruh skrip Streamlit, termasuk
+menggambar ulang figur Matplotlib walaupun data dan filternya sama. Cache ini
+menyimpan byte PNG/SVG hasil render per kunci (halaman, id grafik, sidik
+data, filter) dengan eviksi LRU dan batas ukuran total, dipakai bersama oleh
+semua sesi dalam satu proses.
+"""
+
+import hashlib
+import io
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+# Batas total byte gambar yang disimpan per proses
+MAX_BYTES = 64 * 2**20
+
+# Opsi savefig yang sama dengan st.pyplot
+SAVEFIG = {"bbox_inches": "tight", "dpi": 200}
+
+
+def fingerprint(*objs):
+    """Sidik data (hex) untuk DataFrame/Series/nilai biasa; berubah jika isi berubah."""
+    h = hashlib.blake2b(digest_size=16)
+    for obj in objs:
+        if isinstance(obj, (pd.DataFrame, pd.Series)):
+            h.update(pd.util.hash_pandas_object(obj, index=True).to_numpy().tobytes())
+            cols = obj.columns if isinstance(obj, pd.DataFrame) else [obj.name]
+            h.update(repr(list(cols)).encode())
+        else:
+            h.update(repr(obj).encode())
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def render(fig, fmt="png"):
+    """Byte gambar figur (format png atau svg)."""
+    buf = io.BytesIO()
+    fig.savefig(buf, format=fmt, **SAVEFIG)
+    return buf.getvalue()
+
+
+class FigureCache:
+    """LRU kunci → byte gambar, dibatasi total `max_bytes`; aman dipakai antar thread."""
+
+    def __init__(self, max_bytes=MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._items)
+
+    def get(self, key):
+        with self._lock:
+            image = self._items.get(key)
+            if image is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return image
+
+    def put(self, key, image):
+        """Simpan `image`; entri terlama dibuang sampai total ≤ max_bytes."""
+        if len(image) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self.nbytes -= len(old)
+            self._items[key] = image
+            self.nbytes += len(image)
+            while self.nbytes > self.max_bytes:
+                _, evicted = self._items.popitem(last=False)
+                self.nbytes -= len(evicted)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self.nbytes = 0
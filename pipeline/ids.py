@@ -0,0 +1,67 @@
+"""
+Interning ID: string hex 32 karakter → kode int32 padat.
+
+Dijalankan tepat setelah load_raw, sehingga merge main_df, groupby, dan
+nunique di seluruh pipeline bekerja di atas kolom int32, bukan kolom object.
+Kamus per kolom ID (posisi = kode) disimpan di `<out>/ids/<kolom>.parquet`.
+Build penuh membuat kamus terurut (urutan kode = urutan string); refresh
+inkremental memakai kamus tersimpan dan menambah ID baru di akhir, sehingga
+kode lama tidak pernah berubah. String hanya di-decode untuk ditampilkan.
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .config import ID_COLUMNS, IDS_DIR
+
+
+def encode(values, index):
+    """Kode int32 untuk `values`; ID yang belum ada ditambahkan di akhir `index`."""
+    values = np.asarray(values, dtype=object)
+    codes = index.get_indexer(values)
+    missing = codes < 0
+    if missing.any():
+        index = index.append(pd.Index(pd.unique(values[missing])))
+        codes[missing] = index.get_indexer(values[missing])
+    return codes.astype(np.int32), index
+
+
+def intern_ids(raw, dictionaries=None):
+    """Ganti kolom ID_COLUMNS di semua tabel `raw` dengan kode int32.
+
+    Hasil: (raw baru, kamus nama kolom → pd.Index). Tanpa `dictionaries`,
+    kamus dibangun dari ID unik terurut di seluruh tabel.
+    """
+    dictionaries = dict(dictionaries or {})
+    raw = dict(raw)
+    for col in ID_COLUMNS:
+        tables = [name for name, df in raw.items() if col in df.columns]
+        if not tables:
+            continue
+        if col not in dictionaries:
+            values = pd.concat([raw[name][col] for name in tables], ignore_index=True)
+            dictionaries[col] = pd.Index(np.sort(values.dropna().unique()))
+        for name in tables:
+            codes, dictionaries[col] = encode(raw[name][col], dictionaries[col])
+            raw[name] = raw[name].assign(**{col: codes})
+    return raw, dictionaries
+
+
+def decode(codes, index):
+    """String ID untuk kode (untuk tampilan)."""
+    return index.take(np.asarray(codes))
+
+
+def save_ids(dictionaries, out_path):
+    d = Path(out_path) / IDS_DIR
+    d.mkdir(parents=True, exist_ok=True)
+    for col, index in dictionaries.items():
+        pd.DataFrame({"id": index}).to_parquet(d / f"{col}.parquet", index=False)
+
+
+def load_ids(out_path):
+    """Kamus tersimpan di `out_path` (dict kosong jika belum ada)."""
+    d = Path(out_path) / IDS_DIR
+    return {p.stem: pd.Index(pd.read_parquet(p)["id"]) for p in sorted(d.glob("*.parquet"))}
@@ -0,0 +1,225 @@
+"""
+Refresh inkremental (append-only) untuk main_df dan seluruh tabel turunan.
+
+Build penuh menyimpan *state* agregat di samping artefak: watermark
+(order_purchase_timestamp terakhir yang sudah diproses), jumlah & count per
+kategori / bulan / metode pembayaran dominan per order, histogram order per (delivery_days,
+review_score), state RFM per pelanggan (last_purchase, frequency,
+monetary), matriks kohort beserta bulan pertama/terakhir aktif per
+pelanggan, dan agregat per seller. Refresh berikutnya hanya membaca
+orders/order_items/payments/reviews baru, lalu:
+
+- order dengan order_purchase_timestamp > watermark saja yang diproses,
+  sehingga order baru selalu disjoint dari histori dan hitungan distinct
+  order (total_orders, frequency) cukup dijumlahkan;
+- baris main_df, delivery_review, delivery_moments, daily_trend, daily_cube,
+  cube_members & distinct_sketches baru di-append (part Parquet baru / CSV);
+  sel cube, momen, dan tren untuk hari watermark bisa muncul dua kali, tetapi
+  measure-nya aditif dan sketch digabung dengan max sehingga query tetap
+  benar;
+- state agregat di-update di tempat, lalu tabel kecil (termasuk
+  cohort_matrix & seller_scorecards) diturunkan ulang dan kolom MA3
+  dihitung ulang hanya dari bulan pertama yang berubah;
+- baris delta digabung ke lookup_index (posisi baris main_df per
+  pelanggan/order) lewat merge_index: hanya kode delta yang diurutkan.
+
+Batasan append-only: payment/review yang datang belakangan untuk order lama,
+atau order lama yang baru berstatus delivered setelah watermark lewat,
+tidak ikut terhitung. Jalankan build penuh secara berkala untuk
+merekonsiliasi.
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .buckets import moving_average
+from .build import (aggregate_payments, aggregate_reviews, build_main_df, clean_orders,
+                    cube_members, daily_cube, daily_trend, delivery_moments, delivery_review,
+                    distinct_sketches, translate_products)
+from .config import RFM_EDGES_FILE, STATE_FILE
+from .delivery import stats_from_histogram
+from .ids import intern_ids, load_ids, save_ids
+from .load import load_raw
+from .lookup import merge_index
+from .rfm import load_edges, rfm_scored, save_edges
+from .sellers import scorecards, seller_aggregates
+from .state import (CATEGORY, category_state, customer_state, delivery_state, load_state,
+                    monthly_state, payment_state, save_state)
+from .store import append_table, existing_formats, read_table, write_table
+from .timing import StageTimer
+
+DELTA_TABLES     = ["orders", "order_items", "payments", "reviews"]
+DIMENSION_TABLES = ["customers", "products", "translation", "sellers"]
+
+
+# ─── Merge state ──────────────────────────────────────────────
+def _add(state, delta):
+    """Jumlahkan measure aditif; baris baru ikut ditambahkan."""
+    return state.add(delta, fill_value=0).astype(state.dtypes.to_dict())
+
+
+def _merge_customers(customers, delta):
+    """Update last_purchase/frequency/monetary hanya untuk pelanggan di delta."""
+    seen = delta.index.isin(customers.index)
+    old = delta.index[seen]
+    customers.loc[old, "last_purchase"] = np.maximum(customers.loc[old, "last_purchase"],
+                                                     delta.loc[old, "last_purchase"])
+    customers.loc[old, "frequency"] += delta.loc[old, "frequency"]
+    customers.loc[old, "monetary"] += delta.loc[old, "monetary"]
+    if seen.all():
+        return customers
+    return pd.concat([customers, delta[~seen]]).sort_index()
+
+
+def fold_main(state, main_delta):
+    """Tambahkan agregat kategori, bulanan, pembayaran, RFM, pengiriman, kohort, dan seller dari main_df delta (disjoint dari state)."""
+    state["category"] = _add(state["category"], category_state(main_delta))
+    state["monthly"] = _add(state["monthly"], monthly_state(main_delta))
+    state["payments"] = _add(state["payments"], payment_state(main_delta))
+    state["customers"] = _merge_customers(state["customers"], customer_state(main_delta))
+    state["delivery"] = _add(state["delivery"], delivery_state(main_delta))
+    state["cohort"].update(main_delta)
+    state["sellers"] = _add(state["sellers"], seller_aggregates(main_delta))
+
+
+# ─── Turunkan tabel dashboard dari state ──────────────────────
+def revenue_from_state(category):
+    rev = category.assign(avg_revenue_per_order=category["total_revenue"] / category["item_count"])
+    rev = rev[["total_revenue", "total_orders", "avg_revenue_per_order"]]
+    return rev.sort_values("total_revenue", ascending=False).rename_axis(CATEGORY).reset_index()
+
+
+def monthly_from_state(monthly, previous=None, changed_from=None):
+    """Tren bulanan; MA3 sebelum bulan `changed_from` diambil dari `previous` apa adanya."""
+    trend = monthly.sort_index().rename_axis("year_month").reset_index()
+    trend["year_month_str"] = trend["year_month"].astype(str)
+    start = 0
+    if previous is not None and changed_from is not None:
+        start = int(trend["year_month"].searchsorted(changed_from))
+    lo = max(start - 2, 0)
+    for col, ma in (("total_orders", "orders_MA3"), ("total_revenue", "revenue_MA3")):
+        values = np.empty(len(trend))
+        if start:
+            values[:start] = previous[ma].to_numpy()[:start]
+        values[start:] = moving_average(trend[col].to_numpy()[lo:], 3)[start - lo:]
+        trend[ma] = values
+    return trend
+
+
+def payment_from_state(payments):
+    freq = payments.assign(avg_value=payments["total_value"] / payments["count"])
+    freq = freq[["count", "avg_value", "total_value"]]
+    freq = freq.sort_values("count", ascending=False).rename_axis("payment_type").reset_index()
+    freq["pct"] = (freq["count"] / freq["count"].sum() * 100).round(2)
+    return freq
+
+
+def rfm_from_state(customers, previous_edges=None):
+    snapshot_date = customers["last_purchase"].max() + pd.Timedelta(days=1)
+    rfm_df = customers.rename_axis("customer_unique_id").reset_index()
+    rfm_df.insert(1, "recency", (snapshot_date - rfm_df.pop("last_purchase")).dt.days)
+    return rfm_scored(rfm_df, snapshot_date, previous=previous_edges)
+
+
+# ─── Refresh ──────────────────────────────────────────────────
+def select_delta(delta_raw, watermark):
+    """Batasi tabel delta ke order setelah watermark (append-only)."""
+    purchase = pd.to_datetime(delta_raw["orders"]["order_purchase_timestamp"])
+    orders = delta_raw["orders"][purchase > watermark]
+    new_ids = orders["order_id"]
+    return {
+        "orders":      orders,
+        "order_items": delta_raw["order_items"][delta_raw["order_items"]["order_id"].isin(new_ids)],
+        "payments":    delta_raw["payments"][delta_raw["payments"]["order_id"].isin(new_ids)],
+        "reviews":     delta_raw["reviews"][delta_raw["reviews"]["order_id"].isin(new_ids)],
+    }
+
+
+def apply_delta(state, delta_raw, dims, timer=None):
+    """Proses delta terhadap state (di tempat).
+
+    Hasil: (main_df_delta, delivery_review_delta, first_changed_month).
+    """
+    timer = timer or StageTimer()
+
+    with timer.stage("select_delta"):
+        delta = select_delta(delta_raw, state["watermark"])
+    if delta["orders"].empty:
+        return None, None, None
+
+    with timer.stage("merge_delta"):
+        main_delta = build_main_df(
+            delta["order_items"], clean_orders(delta["orders"]), dims["customers"],
+            translate_products(dims["products"], dims["translation"]),
+            aggregate_payments(delta["payments"]), aggregate_reviews(delta["reviews"]),
+        )
+
+    with timer.stage("update_state"):
+        fold_main(state, main_delta)
+        state["watermark"] = max(state["watermark"],
+                                 pd.to_datetime(delta["orders"]["order_purchase_timestamp"]).max())
+
+    first_month = main_delta["year_month"].min() if len(main_delta) else None
+    return main_delta, delivery_review(main_delta), first_month
+
+
+def run_incremental(data_path, delta_path, out_path, timer=None):
+    """Refresh artefak di `out_path` dengan delta dari `delta_path`.
+
+    Tabel dimensi (customers, products, translation, sellers) dibaca dari `data_path`.
+    """
+    timer = timer or StageTimer()
+    out_path = Path(out_path)
+
+    state = load_state(out_path / STATE_FILE)
+    ids = load_ids(out_path)
+    if state is None or not ids:
+        raise FileNotFoundError(f"{out_path / STATE_FILE} (jalankan build penuh terlebih dahulu)")
+
+    with timer.stage("load_delta"):
+        dims = load_raw(data_path, DIMENSION_TABLES)
+        delta_raw = load_raw(delta_path, DELTA_TABLES)
+    with timer.stage("intern_ids"):
+        # Kamus tersimpan dipakai ulang: kode lama tetap, ID baru ditambah di akhir
+        raw, ids = intern_ids({**dims, **delta_raw}, ids)
+        dims = {name: raw[name] for name in DIMENSION_TABLES}
+        delta_raw = {name: raw[name] for name in DELTA_TABLES}
+
+    main_delta, dr_delta, first_month = apply_delta(state, delta_raw, dims, timer)
+    if main_delta is None:
+        return state
+
+    with timer.stage("derive_tables"):
+        previous_trend = read_table("monthly_trend", root=out_path)
+        rfm_df = rfm_from_state(state["customers"], load_edges(out_path / RFM_EDGES_FILE))
+        tables = {
+            "revenue_by_category": revenue_from_state(state["category"]),
+            "rfm_df":              rfm_df,
+            "monthly_trend":       monthly_from_state(state["monthly"], previous_trend, first_month),
+            "payment_freq":        payment_from_state(state["payments"]),
+            "delivery_stats":      stats_from_histogram(state["delivery"]),
+            "cohort_matrix":       state["cohort"].table(),
+            "seller_scorecards":   scorecards(state["sellers"], dims["sellers"]),
+        }
+
+    with timer.stage("write_artifacts"):
+        formats = existing_formats(out_path, "main_df")
+        for name, df in tables.items():
+            write_table(df, name, out_path, formats)
+        save_edges(rfm_df.attrs["rfm_edges"], out_path / RFM_EDGES_FILE)
+        append_table(main_delta, "main_df", out_path, formats)
+        append_table(dr_delta, "delivery_review", out_path, formats)
+        append_table(delivery_moments(main_delta), "delivery_moments", out_path, formats)
+        append_table(daily_trend(main_delta), "daily_trend", out_path, formats)
+        append_table(daily_cube(main_delta), "daily_cube", out_path, formats)
+        members = cube_members(main_delta)
+        append_table(members, "cube_members", out_path, formats)
+        append_table(distinct_sketches(members), "distinct_sketches", out_path, formats)
+        # Posisi baris delta mulai dari panjang main_df lama (= panjang indeks lama)
+        index = read_table("lookup_index", root=out_path)
+        write_table(merge_index(index, main_delta, len(index)), "lookup_index", out_path, formats)
+        save_ids(ids, out_path)
+        save_state(state, out_path / STATE_FILE)
+    return state
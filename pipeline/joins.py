@@ -0,0 +1,48 @@
+"""
+Join lookup many-to-one untuk rantai merge main_df.
+
+main_df di notebook = lima pd.merge lalu dropna() + drop_duplicates() atas
+frame lebar. Karena dropna akhir membuang baris yang tidak lengkap, setiap
+left join di rantai itu setara dengan inner join terhadap baris dimensi yang
+lengkap. Jadi tiap langkah cukup berupa lookup posisi: tabel dimensi dipangkas
+ke kolom yang dipakai, dibuang baris kosongnya, lalu kolomnya diambil dengan
+`take` berdasarkan posisi key. Tidak ada hash join, tidak ada salinan frame
+lebar per langkah, dan tipe kolom tetap (tidak jadi float karena NaN).
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def positions(keys, table_keys):
+    """Posisi baris di `table_keys` (unik) untuk tiap key; -1 jika tidak ada.
+
+    Key integer padat (kode hasil pipeline.ids) memakai tabel lookup array
+    langsung; selain itu pd.Index.get_indexer.
+    """
+    keys, table_keys = np.asarray(keys), np.asarray(table_keys)
+    if (keys.dtype.kind in "iu" and table_keys.dtype.kind in "iu" and len(table_keys)
+            and table_keys.min() >= 0 and (not len(keys) or keys.min() >= 0)):
+        size = int(max(table_keys.max(), keys.max(initial=0))) + 1
+        if size <= 4 * (len(table_keys) + len(keys)):
+            lut = np.full(size, -1, dtype=np.intp)
+            lut[table_keys] = np.arange(len(table_keys))
+            return lut[keys]
+    return pd.Index(table_keys).get_indexer(keys)
+
+
+def lookup(frame, table, key, columns, optional=()):
+    """frame ⋈ table[columns] pada `key` (many-to-one), hanya baris yang lengkap.
+
+    Key ganda di `table` memakai baris pertama. Kolom di `optional` boleh
+    kosong dan tidak ikut menentukan baris yang lengkap.
+    """
+    table = table[[key] + list(columns)]
+    if not table[key].is_unique:
+        table = table.drop_duplicates(key)
+    table = table.dropna(subset=[c for c in table.columns if c not in optional])
+    pos = positions(frame[key], table[key])
+    keep = pos >= 0
+    if not keep.all():
+        frame, pos = frame[keep], pos[keep]
+    return frame.assign(**{c: table[c].to_numpy()[pos] for c in columns})
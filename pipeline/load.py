@@ -0,0 +1,16 @@
+"""
+Memuat dataset mentah Olist dari folder CSV.
+"""
+
+from pathlib import Path
+
+import pandas as pd
+
+from .config import DATA_PATH, RAW_FILES
+
+
+def load_raw(data_path=DATA_PATH, names=None):
+    """Baca file mentah (semua, atau hanya `names`) menjadi dict nama → DataFrame."""
+    data_path = Path(data_path)
+    names = list(RAW_FILES) if names is None else names
+    return {name: pd.read_csv(data_path / RAW_FILES[name]) for name in names}
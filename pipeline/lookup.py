@@ -0,0 +1,139 @@
+"""
+Lookup satu pelanggan / order atas main_df lewat indeks terurut.
+
+Artefak lookup_index menyimpan, untuk setiap kunci (customer_unique_id dan
+order_id), kode kunci terurut beserta posisi baris main_df-nya
+(argsort stabil, jadi baris satu kunci tetap urut waktu beli). Satu lookup
+= konversi string → kode lewat kamus ID, dua np.searchsorted atas kolom
+kode, lalu mengambil k baris main_df; tidak ada scan boolean atas seluruh
+tabel. Segmen RFM diambil dengan cara yang sama dari rfm_df, yang terurut
+customer_unique_id.
+
+Posisi baris mengacu ke urutan part main_df di store. Baris yang di-append
+(refresh inkremental, batch build streaming) digabung ke indeks lama lewat
+merge_index: hanya kode delta yang diurutkan, lalu disisipkan dengan
+np.searchsorted + np.insert, tanpa membaca ulang atau mengurutkan histori.
+"""
+
+import numpy as np
+import pandas as pd
+
+from .ids import decode
+
+# Kunci lookup → nama kolom posisi baris di lookup_index
+INDEX_KEYS = {"customer_unique_id": "customer_row", "order_id": "order_row"}
+
+# Kolom main_df yang dibutuhkan halaman lookup
+LOOKUP_COLUMNS = [
+    "order_id", "order_item_id", "product_id", "seller_id", "price", "freight_value",
+    "customer_unique_id", "customer_city", "customer_state", "order_purchase_timestamp",
+    "order_delivered_customer_date", "delivery_days", "product_category_name_english",
+    "payment_type", "payment_value", "review_score",
+]
+
+
+def lookup_index(main_df):
+    """Per kunci: kode terurut + posisi baris main_df (int32)."""
+    out = {}
+    for key, row in INDEX_KEYS.items():
+        codes = main_df[key].to_numpy()
+        order = np.argsort(codes, kind="stable")
+        out[key] = codes[order]
+        out[row] = order.astype(np.int32)
+    return pd.DataFrame(out)
+
+
+def merge_index(index, main_delta, offset):
+    """lookup_index setelah baris `main_delta` di-append ke main_df mulai posisi `offset`.
+
+    Sisipan memakai side="right": baris lama satu kunci tetap di depan baris
+    baru, jadi urutan waktu beli per kunci terjaga.
+    """
+    delta = lookup_index(main_delta)
+    out = {}
+    for key, row in INDEX_KEYS.items():
+        codes = index[key].to_numpy()
+        at = np.searchsorted(codes, delta[key].to_numpy(), side="right")
+        out[key] = np.insert(codes, at, delta[key].to_numpy())
+        out[row] = np.insert(index[row].to_numpy(), at, delta[row].to_numpy() + offset)
+    return pd.DataFrame(out)
+
+
+class MainLookup:
+    """Detail pelanggan/order dari main_df + lookup_index (+ kamus ID & rfm_df opsional)."""
+
+    def __init__(self, main_df, index, ids=None, rfm_df=None):
+        if len(index) != len(main_df):
+            # Indeks usang (mis. main_df di-append tanpa indeks baru): bangun ulang di memori
+            index = lookup_index(main_df)
+        self.df = main_df
+        self.ids = ids or {}
+        self._index = {key: (index[key].to_numpy(), index[row].to_numpy()) for key, row in INDEX_KEYS.items()}
+        if rfm_df is not None and not rfm_df["customer_unique_id"].is_monotonic_increasing:
+            rfm_df = rfm_df.sort_values("customer_unique_id", ignore_index=True)
+        self.rfm = rfm_df
+
+    def code(self, key, value):
+        """Kode int untuk ID string `value` (None jika tidak dikenal)."""
+        if key not in self.ids:
+            return value
+        pos = self.ids[key].get_indexer([value])[0]
+        return None if pos < 0 else pos
+
+    def rows(self, key, value):
+        """Baris main_df untuk satu ID (string) pada kolom `key`, terurut waktu beli."""
+        code = self.code(key, value)
+        if code is None:
+            return self.df.iloc[:0]
+        codes, rows = self._index[key]
+        lo, hi = np.searchsorted(codes, code, side="left"), np.searchsorted(codes, code, side="right")
+        return self.df.iloc[rows[lo:hi]]
+
+    def latest(self, key):
+        """ID (string) pada baris main_df terakhir, untuk contoh input."""
+        if self.df.empty:
+            return ""
+        code = self.df[key].iat[-1]
+        return decode([code], self.ids[key])[0] if key in self.ids else code
+
+    def decoded(self, items):
+        """Salinan `items` dengan kolom ID berupa string asli."""
+        items = items.copy()
+        for col in items.columns.intersection(list(self.ids)):
+            items[col] = decode(items[col], self.ids[col])
+        return items
+
+    def segment(self, value):
+        """Baris rfm_df pelanggan (Series) atau None."""
+        code = self.code("customer_unique_id", value)
+        if self.rfm is None or code is None:
+            return None
+        keys = self.rfm["customer_unique_id"].to_numpy()
+        pos = np.searchsorted(keys, code)
+        return self.rfm.iloc[pos] if pos < len(keys) and keys[pos] == code else None
+
+    # ─── Ringkasan ────────────────────────────────────────────
+    @staticmethod
+    def orders(items):
+        """Satu baris per order dari baris item (payment & review sudah per order di main_df)."""
+        items = items.assign(revenue=items["price"] + items["freight_value"])
+        return items.groupby("order_id", sort=False, observed=True).agg(
+            order_purchase_timestamp=("order_purchase_timestamp", "first"),
+            items=("order_item_id", "size"),
+            categories=("product_category_name_english", lambda c: ", ".join(sorted(set(map(str, c))))),
+            revenue=("revenue", "sum"),
+            payment_type=("payment_type", "first"),
+            payment_value=("payment_value", "first"),
+            delivery_days=("delivery_days", "first"),
+            review_score=("review_score", "first"),
+        ).reset_index()
+
+    def customer(self, customer_id):
+        """(baris item, ringkasan order, baris RFM) seorang pelanggan; item kosong jika tidak ada."""
+        items = self.decoded(self.rows("customer_unique_id", customer_id))
+        return items, self.orders(items), self.segment(customer_id)
+
+    def order(self, order_id):
+        """(baris item, ringkasan order) satu order."""
+        items = self.decoded(self.rows("order_id", order_id))
+        return items, self.orders(items)
@@ -0,0 +1,183 @@
+"""
+Build tabel turunan secara paralel di process pool.
+
+Tabel turunan DERIVED tidak saling bergantung, kecuali distinct_sketches
+yang membaca cube_members. Sumbernya (main_df, tabel mentah, artefak antara)
+ditulis sekali sebagai file Arrow IPC lalu di-memory-map oleh setiap worker,
+sehingga yang dikirim antar proses hanya nama tugas dan batas baris, bukan
+DataFrame.
+
+Tabel besar dihitung per partisi: rentang baris sumber yang dipotong hanya di
+pergantian bulan (main_df terurut order_purchase_timestamp, cube_members
+terurut date). Satu order selalu jatuh di satu bulan, jadi agregat per
+partisi bisa digabung tanpa membaca ulang baris: tabel baris cukup di-concat,
+sedangkan kategori, bulanan, pembayaran, dan RFM memakai state aditif yang sama dengan
+refresh inkremental (pipeline.state / pipeline.incremental).
+"""
+
+import logging
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.ipc as ipc
+
+from .build import (DERIVED, cube_members, daily_cube, daily_trend, delivery_moments,
+                    delivery_review, distinct_sketches)
+from .incremental import monthly_from_state, payment_from_state, revenue_from_state, rfm_from_state
+from .sellers import scorecards, seller_aggregates
+from .state import category_state, customer_state, monthly_state, payment_state
+from .timing import StageTimer
+
+log = logging.getLogger(__name__)
+
+# Kolom waktu (terurut) untuk memotong partisi per sumber
+TIME_COLUMNS = {"main_df": "order_purchase_timestamp", "cube_members": "date"}
+
+# Partisi per worker; lebih dari satu agar beban antar bulan merata
+PARTS_PER_WORKER = 4
+
+
+# ─── Gabung hasil partisi ─────────────────────────────────────
+def _concat(parts):
+    return pd.concat(parts, ignore_index=True)
+
+
+def _revenue(parts):
+    return revenue_from_state(pd.concat(parts).groupby(level=0).sum())
+
+
+def _monthly(parts):
+    return monthly_from_state(pd.concat(parts))
+
+
+def _payments(parts):
+    return payment_from_state(pd.concat(parts).groupby(level=0).sum())
+
+
+def _rfm(parts, previous=None):
+    customers = pd.concat(parts).groupby(level=0).agg(
+        {"last_purchase": "max", "frequency": "sum", "monetary": "sum"})
+    return rfm_from_state(customers, previous)
+
+
+def _sellers(parts, sellers=None):
+    return scorecards(pd.concat(parts).groupby(level=0).sum(), sellers)
+
+
+# Tabel yang dihitung per partisi: nama → (fungsi per partisi, fungsi gabung)
+PARTITIONED = {
+    "revenue_by_category": (category_state,    _revenue),
+    "rfm_df":              (customer_state,    _rfm),
+    "monthly_trend":       (monthly_state,     _monthly),
+    "payment_freq":        (payment_state,     _payments),
+    "delivery_review":     (delivery_review,   _concat),
+    "delivery_moments":    (delivery_moments,  _concat),
+    "daily_trend":         (daily_trend,       _concat),
+    "daily_cube":          (daily_cube,        _concat),
+    "cube_members":        (cube_members,      _concat),
+    "distinct_sketches":   (distinct_sketches, _concat),
+    "seller_scorecards":   (seller_aggregates, _sellers),
+}
+
+
+# ─── Sumber bersama (Arrow IPC di-memory-map) ─────────────────
+_PATHS = {}
+_FRAMES = {}
+
+
+def share(df, path):
+    """Tulis df ke file Arrow IPC untuk dibaca worker."""
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    with pa.OSFile(str(path), "wb") as sink, ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    return str(path)
+
+
+def _init_worker(paths):
+    _PATHS.update(paths)
+
+
+def _source(name):
+    """Sumber di worker: di-map sekali per proses, kolom numerik tanpa salinan."""
+    if name not in _FRAMES:
+        table = ipc.open_file(pa.memory_map(_PATHS[name], "r")).read_all()
+        _FRAMES[name] = table.to_pandas(split_blocks=True)
+    return _FRAMES[name]
+
+
+def _run_task(fn, src, lo, hi, kwargs):
+    df = _source(src)
+    return fn(df if lo is None else df.iloc[lo:hi], **kwargs)
+
+
+# ─── Partisi ──────────────────────────────────────────────────
+def partition_bounds(times, n_parts):
+    """Batas baris [lo, hi) berukuran ≈ sama, dipotong hanya di pergantian bulan.
+
+    `times` harus terurut; selain itu satu partisi untuk seluruh baris.
+    """
+    n = len(times)
+    if n_parts <= 1 or n == 0 or not times.is_monotonic_increasing:
+        return [(0, n)]
+    month = (times.dt.year * 12 + times.dt.month).to_numpy()
+    starts = np.flatnonzero(np.diff(month)) + 1
+    if not len(starts):
+        return [(0, n)]
+    targets = np.linspace(0, n, n_parts + 1)[1:-1]
+    cuts = starts[np.minimum(np.searchsorted(starts, targets), len(starts) - 1)]
+    edges = np.unique(np.r_[0, cuts, n])
+    return list(zip(edges[:-1].tolist(), edges[1:].tolist()))
+
+
+# ─── Orkestrasi ───────────────────────────────────────────────
+def build_derived_parallel(main_df, raw, workers, timer=None, rfm_edges=None):
+    """Setara loop DERIVED di build_all, tetapi tersebar di `workers` proses.
+
+    Tabel dijalankan bergelombang: gelombang berikutnya berisi tabel yang
+    sumbernya artefak dari gelombang sebelumnya.
+    """
+    timer = timer or StageTimer()
+    workers = workers or os.cpu_count()
+    options = {"rfm_df": {"previous": rfm_edges}, "seller_scorecards": {"sellers": raw.get("sellers")}}
+    frames = {**raw, "main_df": main_df}
+    artifacts, pending, paths, wave = {"main_df": main_df}, dict(DERIVED), {}, 0
+
+    with tempfile.TemporaryDirectory(prefix="olist-shared-") as tmp:
+        while pending:
+            wave += 1
+            ready = {name: spec for name, spec in pending.items() if spec[1] in frames}
+            if not ready:
+                raise ValueError(f"sumber tidak tersedia untuk: {sorted(pending)}")
+            with timer.stage(f"share_wave_{wave}"):
+                for _, src in ready.values():
+                    if src not in paths:
+                        paths[src] = share(frames[src], Path(tmp) / f"{src}.arrow")
+
+            with timer.stage(f"derive_wave_{wave}"):
+                # Pool baru per gelombang agar initializer melihat sumber terbaru
+                with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(paths,)) as pool:
+                    futures = {}
+                    for name, (fn, src) in ready.items():
+                        if name in PARTITIONED and src in TIME_COLUMNS:
+                            bounds = partition_bounds(frames[src][TIME_COLUMNS[src]],
+                                                      workers * PARTS_PER_WORKER)
+                            futures[name] = [pool.submit(_run_task, PARTITIONED[name][0], src, lo, hi, {})
+                                             for lo, hi in bounds]
+                        else:
+                            futures[name] = pool.submit(_run_task, fn, src, None, None,
+                                                        options.get(name, {}))
+                    for name, fs in futures.items():
+                        if isinstance(fs, list):
+                            combine = PARTITIONED[name][1]
+                            artifacts[name] = combine([f.result() for f in fs], **options.get(name, {}))
+                            log.info("%-24s %d partisi", name, len(fs))
+                        else:
+                            artifacts[name] = fs.result()
+                        frames[name] = artifacts[name]
+                        del pending[name]
+    return artifacts
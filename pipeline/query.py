@@ -0,0 +1,111 @@
+"""
+Query rentang tanggal atas main_df yang terurut order_purchase_timestamp.
+
+main_df ditulis pipeline dalam urutan waktu pembelian (refresh inkremental
+menjaga urutan ini karena delta selalu setelah watermark), sehingga satu
+rentang tanggal cukup dicari dengan dua np.searchsorted lalu di-slice,
+tanpa boolean mask atas seluruh tabel. Tabel per halaman dihitung ulang
+dari slice tersebut dengan fungsi yang sama seperti build, kecuali RFM yang
+dijawab dari indeks order per pelanggan (pipeline.rfm.CustomerIndex).
+"""
+
+import numpy as np
+import pandas as pd
+
+from .build import delivery_review, delivery_stats, monthly_trend, payment_freq, revenue_by_category
+from .rfm import DEFAULT_SEGMENT, SEGMENT_RULES, CustomerIndex, rfm_scored
+
+TS = "order_purchase_timestamp"
+
+# Baris migrasi RFM untuk pelanggan yang belum bertransaksi di snapshot awal
+NEW_SEGMENT = "Baru"
+
+
+class MainQuery:
+    """Indeks rentang waktu (searchsorted) + agregasi per halaman untuk satu window."""
+
+    def __init__(self, main_df, rfm_edges=None):
+        if not main_df[TS].is_monotonic_increasing:
+            main_df = main_df.sort_values(TS, kind="stable", ignore_index=True)
+        self.df = main_df
+        self.rfm_edges = rfm_edges
+        self._ts = main_df[TS].to_numpy()
+        self._customers = None
+
+    @property
+    def min(self):
+        return pd.Timestamp(self._ts[0])
+
+    @property
+    def max(self):
+        return pd.Timestamp(self._ts[-1])
+
+    def bounds(self, start=None, end=None):
+        """Posisi [lo, hi) untuk tanggal start..end (end inklusif satu hari penuh)."""
+        lo = 0 if start is None else np.searchsorted(
+            self._ts, np.datetime64(pd.Timestamp(start).normalize()), side="left")
+        hi = len(self._ts) if end is None else np.searchsorted(
+            self._ts, np.datetime64(pd.Timestamp(end).normalize() + pd.Timedelta(days=1)), side="left")
+        return int(lo), int(hi)
+
+    def is_full(self, start=None, end=None):
+        return self.bounds(start, end) == (0, len(self._ts))
+
+    def window(self, start=None, end=None):
+        lo, hi = self.bounds(start, end)
+        return self.df.iloc[lo:hi]
+
+    @property
+    def customers(self):
+        """Indeks CSR order per pelanggan, dibangun saat pertama dipakai."""
+        if self._customers is None:
+            self._customers = CustomerIndex(self.df)
+        return self._customers
+
+    # ─── Agregasi per halaman ─────────────────────────────────
+    def overview(self, start=None, end=None):
+        w = self.window(start, end)
+        total_rev = w["revenue"].sum()
+        total_ord = w["order_id"].nunique()
+        return {
+            "total_rev":  total_rev,
+            "total_ord":  total_ord,
+            "total_cust": w["customer_unique_id"].nunique(),
+            "avg_score":  w["review_score"].mean(),
+            "avg_del":    w["delivery_days"].mean(),
+            "avg_ticket": total_rev / total_ord if total_ord else 0,
+        }
+
+    def revenue_by_category(self, start=None, end=None):
+        return revenue_by_category(self.window(start, end))
+
+    def rfm_df(self, start=None, end=None):
+        """RFM per window: snapshot = hari setelah transaksi terakhir di window."""
+        rfm_df, snapshot = self.customers.rfm_base(start, end)
+        return rfm_scored(rfm_df, snapshot, self.rfm_edges)
+
+    def rfm_migration(self, start=None, before=None, end=None):
+        """Jumlah pelanggan per (segmen di window start..before, segmen di window start..end).
+
+        Pelanggan yang baru bertransaksi setelah `before` masuk baris NEW_SEGMENT.
+        """
+        segments = [name for name, _ in SEGMENT_RULES] + [DEFAULT_SEGMENT]
+        old, new = self.rfm_df(start, before), self.rfm_df(start, end)
+        old_segment = pd.Series(old["segment"].to_numpy(), index=old["customer_unique_id"].to_numpy())
+        old_segment = old_segment.reindex(new["customer_unique_id"].to_numpy()).fillna(NEW_SEGMENT)
+        moves = pd.crosstab(old_segment.to_numpy(), new["segment"].to_numpy(),
+                            rownames=["segment_before"], colnames=["segment"])
+        return moves.reindex(index=segments + [NEW_SEGMENT], columns=segments, fill_value=0)
+
+    def monthly_trend(self, start=None, end=None):
+        w = self.window(start, end)
+        return monthly_trend(w.assign(year_month=w[TS].dt.to_period("M")))
+
+    def payment_freq(self, start=None, end=None):
+        return payment_freq(self.window(start, end))
+
+    def delivery_review(self, start=None, end=None):
+        return delivery_review(self.window(start, end))
+
+    def delivery_stats(self, start=None, end=None):
+        return delivery_stats(self.delivery_review(start, end))
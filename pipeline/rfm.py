@@ -0,0 +1,228 @@
+"""
+Engine RFM tervektorisasi: skor R/F/M via np.digitize, segmen via np.select.
+
+Batas bin recency & monetary dihitung dari kuantil data saat ini
+(`fit_edges`) dan disimpan sebagai metadata di samping rfm_df, sehingga
+tidak perlu lagi menurunkan angka threshold secara manual. Dengan
+`edges=FIXED_EDGES` hasilnya identik dengan fungsi per-baris di notebook.
+"""
+
+import datetime as dt
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# ─── Threshold historis notebook (batas atas inklusif tiap bin) ──
+# Recency: makin kecil makin baik → ≤114 hari = 5, >500 hari = 1
+RECENCY_EDGES   = (114, 219, 346, 500)
+# Frequency: 1 → 1, 2 → 2, 3 → 3, 4–5 → 4, >5 → 5
+FREQUENCY_EDGES = (1, 2, 3, 5)
+# Monetary: ≤63.68 BRL = 1, >500 BRL = 5
+MONETARY_EDGES  = (63.68, 112.83, 201.13, 500)
+
+FIXED_EDGES = {
+    "recency":   RECENCY_EDGES,
+    "frequency": FREQUENCY_EDGES,
+    "monetary":  MONETARY_EDGES,
+}
+
+# ─── Kuantil untuk threshold adaptif ──────────────────────────
+# Q1–Q3 seperti notebook, ditambah satu batas ekor atas.
+# Frequency tetap memakai FREQUENCY_EDGES: ~97% pelanggan hanya 1x
+# transaksi sehingga kuantilnya runtuh ke satu nilai.
+RECENCY_QUANTILES  = (0.25, 0.50, 0.75, 0.90)
+MONETARY_QUANTILES = (0.25, 0.50, 0.75, 0.95)
+
+# Edge lama dipakai ulang selama jumlah pelanggan berubah ≤5%
+# dan snapshot bergeser ≤7 hari.
+REFIT_TOLERANCE      = 0.05
+REFIT_MAX_SHIFT_DAYS = 7
+
+# ─── Aturan segmen (dievaluasi berurutan, yang pertama cocok menang) ──
+SEGMENT_RULES = [
+    ("Champions",       lambda r, f, m: (r >= 4) & (f >= 4) & (m >= 4)),
+    ("Loyal Customers", lambda r, f, m: (f >= 4) & (m >= 3) & (r >= 3)),
+    ("Promising",       lambda r, f, m: (r >= 4) & ((f <= 2) | (m <= 2))),
+    ("At Risk",         lambda r, f, m: (r <= 2) & ((f >= 3) | (m >= 3))),
+]
+DEFAULT_SEGMENT = "Lost"
+
+
+def score(values, edges, higher_is_better=True):
+    """Skor 1..len(edges)+1; bin ke-i = (edges[i-1], edges[i]]."""
+    bins = np.digitize(np.asarray(values), edges, right=True)
+    return bins + 1 if higher_is_better else len(edges) + 1 - bins
+
+
+def score_label(r, f, m):
+    """RFM_score ("R" + "F" + "M") per pelanggan dari tabel label, tanpa astype(str) per baris."""
+    r, f, m = np.asarray(r), np.asarray(f), np.asarray(m)
+    k = int(max(r.max(initial=0), f.max(initial=0), m.max(initial=0))) + 1
+    labels = np.array([f"{a}{b}{c}" for a in range(k) for b in range(k) for c in range(k)], dtype=object)
+    return labels[(r * k + f) * k + m]
+
+
+def segment(r, f, m, rules=SEGMENT_RULES, default=DEFAULT_SEGMENT):
+    """Nama segmen per pelanggan dari array skor R, F, M."""
+    r, f, m = np.asarray(r), np.asarray(f), np.asarray(m)
+    return np.select([rule(r, f, m) for _, rule in rules],
+                     [name for name, _ in rules], default=default)
+
+
+def default_snapshot(main_df):
+    """Hari setelah transaksi terakhir."""
+    return main_df["order_purchase_timestamp"].max() + dt.timedelta(days=1)
+
+
+def rfm_base(main_df, snapshot_date=None):
+    """recency/frequency/monetary per customer_unique_id (max lalu kurangi, bukan lambda per grup)."""
+    if snapshot_date is None:
+        snapshot_date = default_snapshot(main_df)
+    rfm_df = main_df.groupby("customer_unique_id").agg(
+        last_purchase=("order_purchase_timestamp", "max"),
+        frequency=("order_id", "nunique"),
+        monetary=("payment_value", "sum"),
+    ).reset_index()
+    recency = (snapshot_date - rfm_df.pop("last_purchase")).dt.days
+    rfm_df.insert(1, "recency", recency)
+    return rfm_df
+
+
+# ─── Threshold adaptif ────────────────────────────────────────
+def quantile_edges(values, quantiles):
+    """Kuantil (interpolasi linear, sama dengan np.quantile) lewat satu np.partition.
+
+    Tanpa nilai (non-NaN) sama sekali, semua edge NaN — seperti np.nanquantile.
+    """
+    v = np.asarray(values, dtype=float)
+    v = v[~np.isnan(v)]
+    if not len(v):
+        return tuple(float("nan") for _ in np.atleast_1d(quantiles))
+    pos = np.asarray(quantiles, dtype=float) * (len(v) - 1)
+    lo = np.floor(pos).astype(np.intp)
+    hi = np.minimum(lo + 1, len(v) - 1)
+    part = np.partition(v, np.union1d(lo, hi))
+    return tuple(float(x) for x in part[lo] + (part[hi] - part[lo]) * (pos - lo))
+
+
+def fit_edges(rfm_df, snapshot_date, recency_quantiles=RECENCY_QUANTILES,
+              monetary_quantiles=MONETARY_QUANTILES):
+    """Metadata threshold RFM dari distribusi rfm_df saat ini."""
+    return {
+        "recency":   quantile_edges(rfm_df["recency"], recency_quantiles),
+        "frequency": FREQUENCY_EDGES,
+        "monetary":  quantile_edges(rfm_df["monetary"], monetary_quantiles),
+        "quantiles": {"recency": list(recency_quantiles), "monetary": list(monetary_quantiles)},
+        "n_customers":   int(len(rfm_df)),
+        "snapshot_date": pd.Timestamp(snapshot_date).isoformat(),
+    }
+
+
+def needs_refit(edges, n_customers, snapshot_date, tolerance=REFIT_TOLERANCE,
+                max_shift_days=REFIT_MAX_SHIFT_DAYS):
+    """True jika metadata lama sudah tidak mewakili data saat ini."""
+    if not edges or "n_customers" not in edges:
+        return True
+    changed = abs(n_customers - edges["n_customers"]) / max(edges["n_customers"], 1)
+    shift = abs((pd.Timestamp(snapshot_date) - pd.Timestamp(edges["snapshot_date"])).days)
+    return changed > tolerance or shift > max_shift_days
+
+
+def save_edges(edges, path):
+    Path(path).write_text(json.dumps(edges, indent=2))
+
+
+def load_edges(path):
+    """Metadata threshold tersimpan, atau None jika belum ada."""
+    path = Path(path)
+    return json.loads(path.read_text()) if path.exists() else None
+
+
+# ─── Scoring ──────────────────────────────────────────────────
+def score_rfm(rfm_df, edges=FIXED_EDGES, segment_rules=SEGMENT_RULES,
+              default_segment=DEFAULT_SEGMENT):
+    """Tambahkan R_score, F_score, M_score, RFM_score, dan segment ke rfm_df."""
+    rfm_df["R_score"] = score(rfm_df["recency"], edges["recency"], higher_is_better=False)
+    rfm_df["F_score"] = score(rfm_df["frequency"], edges["frequency"])
+    rfm_df["M_score"] = score(rfm_df["monetary"], edges["monetary"])
+    rfm_df["RFM_score"] = score_label(rfm_df["R_score"], rfm_df["F_score"], rfm_df["M_score"])
+    rfm_df["segment"] = segment(rfm_df["R_score"], rfm_df["F_score"], rfm_df["M_score"],
+                                segment_rules, default_segment)
+    return rfm_df
+
+
+def rfm_table(main_df, snapshot_date=None, edges=None, previous=None, **score_kw):
+    """RFM lengkap per customer_unique_id.
+
+    Tanpa `edges`, threshold dipakai ulang dari `previous` bila masih valid
+    (lihat `needs_refit`), selain itu dihitung ulang dari kuantil data.
+    Metadata threshold yang dipakai tersedia di `rfm_df.attrs["rfm_edges"]`.
+    """
+    if snapshot_date is None:
+        snapshot_date = default_snapshot(main_df)
+    return rfm_scored(rfm_base(main_df, snapshot_date), snapshot_date, edges, previous, **score_kw)
+
+
+def rfm_scored(rfm_df, snapshot_date, edges=None, previous=None, **score_kw):
+    """Skor rfm_df (recency/frequency/monetary) dengan threshold eksplisit, lama, atau hasil fit."""
+    if edges is None:
+        if needs_refit(previous, len(rfm_df), snapshot_date):
+            edges = fit_edges(rfm_df, snapshot_date)
+        else:
+            edges = previous
+    rfm_df = score_rfm(rfm_df, edges, **score_kw)
+    rfm_df.attrs["rfm_edges"] = edges
+    return rfm_df
+
+
+# ─── RFM per rentang (indeks CSR per pelanggan) ───────────────
+class CustomerIndex:
+    """Indeks order per pelanggan untuk RFM rentang/snapshot mana pun tanpa groupby main_df.
+
+    Satu event per order, diurutkan per (customer_unique_id, waktu beli) dalam
+    format CSR: order pelanggan ke-c ada di posisi offsets[c]..offsets[c+1].
+    payment_value kumulatif per pelanggan membuat monetary sebuah rentang cukup
+    dihitung dari dua posisi. Posisi batas rentang untuk semua pelanggan dicari
+    sekaligus dengan satu np.searchsorted atas kunci (pelanggan, peringkat waktu).
+    """
+
+    def __init__(self, main_df):
+        # monetary rfm_base = jumlah payment_value per baris item, jadi dijumlah per order dulu
+        _, first, inverse = np.unique(main_df["order_id"].to_numpy(), return_index=True, return_inverse=True)
+        value = np.bincount(inverse, weights=main_df["payment_value"].to_numpy(dtype=float))
+        self.labels, cust = np.unique(main_df["customer_unique_id"].to_numpy()[first], return_inverse=True)
+        ts = main_df["order_purchase_timestamp"].to_numpy()[first]
+
+        order = np.lexsort((ts, cust))
+        cust, self.ts, value = cust[order], ts[order], value[order]
+        self.offsets = np.zeros(len(self.labels) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(cust, minlength=len(self.labels)), out=self.offsets[1:])
+        self.times, rank = np.unique(self.ts, return_inverse=True)
+        self._key = cust.astype(np.int64) * len(self.times) + rank
+        # Kumulatif dimulai dari 0 per pelanggan: riwayat penuh tanpa selisih pembulatan
+        self._cum = pd.Series(value).groupby(cust).cumsum().to_numpy()
+
+    def positions(self, bound):
+        """Per pelanggan: posisi order pertama dengan waktu beli ≥ `bound` (np.datetime64)."""
+        rank = np.searchsorted(self.times, bound)
+        return np.searchsorted(self._key, np.arange(len(self.labels), dtype=np.int64) * len(self.times) + rank)
+
+    def rfm_base(self, start=None, end=None):
+        """(rfm_base untuk order di tanggal start..end, snapshot_date) — snapshot seperti default_snapshot."""
+        lo = self.offsets[:-1] if start is None else self.positions(np.datetime64(pd.Timestamp(start).normalize()))
+        hi = self.offsets[1:] if end is None else self.positions(
+            np.datetime64(pd.Timestamp(end).normalize() + pd.Timedelta(days=1)))
+        active = np.flatnonzero(hi > lo)
+        lo, hi = lo[active], hi[active]
+        last = self.ts[hi - 1]
+        snapshot = last.max() + np.timedelta64(1, "D") if len(active) else np.datetime64("NaT")
+        earlier = np.where(lo > self.offsets[active], self._cum[lo - 1], 0.0)
+        rfm_df = pd.DataFrame({
+            "customer_unique_id": self.labels[active],
+            "recency":            (snapshot - last) // np.timedelta64(1, "D"),
+            "frequency":          hi - lo,
+            "monetary":           self._cum[hi - 1] - earlier,
+        })
+        return rfm_df, pd.Timestamp(snapshot)
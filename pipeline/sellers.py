@@ -0,0 +1,116 @@
+"""
+Scorecard performa seller dari main_df + sellers_dataset.csv.
+
+Agregat per seller_id bersifat aditif (jumlah item, revenue, order, total
+delivery_days, total review_score, order terlambat), sehingga disimpan di
+state dan dilipat seperti agregat kategori: build penuh, refresh inkremental,
+build streaming, dan partisi paralel cukup menjumlahkannya. Satu order
+dihitung sekali per seller walaupun berisi beberapa item dari seller yang
+sama. Order terlambat = tanggal diterima pelanggan setelah tanggal estimasi.
+
+Artefak seller_scorecards (satu baris per seller, sudah berisi rata-rata,
+late_rate, kota & negara bagian) dibaca dashboard lewat SellerBoard: peringkat
+top-k / bottom-k per metrik memakai np.argpartition atas array kolom, dengan
+filter seller_state dan minimal order, tanpa menyentuh baris item.
+"""
+
+import numpy as np
+import pandas as pd
+
+from .ids import decode
+from .joins import positions
+
+# Metrik peringkat → label dashboard
+SELLER_METRICS = {
+    "revenue":           "Revenue",
+    "orders":            "Jumlah Order",
+    "avg_delivery_days": "Rata-rata Lama Kirim (hari)",
+    "avg_review_score":  "Rata-rata Review",
+    "late_rate":         "Tingkat Keterlambatan",
+}
+SCORECARD_COLUMNS = ["seller_id", "seller_city", "seller_state", "orders", "items", "revenue",
+                     "avg_delivery_days", "avg_review_score", "late_rate"]
+UNKNOWN = "unknown"
+
+
+def seller_aggregates(main_df):
+    """Measure aditif per seller_id: items, revenue, orders, delivery_sum, review_sum, late_orders."""
+    items = main_df.groupby("seller_id").agg(items=("revenue", "size"), revenue=("revenue", "sum"))
+    orders = main_df.drop_duplicates(["seller_id", "order_id"])
+    late = (orders["order_delivered_customer_date"].dt.normalize()
+            > orders["order_estimated_delivery_date"].dt.normalize())
+    per_order = orders.assign(late=late.astype(np.int64)).groupby("seller_id").agg(
+        orders=("order_id", "size"),
+        delivery_sum=("delivery_days", "sum"),
+        review_sum=("review_score", "sum"),
+        late_orders=("late", "sum"),
+    )
+    return items.join(per_order)
+
+
+def scorecards(aggregates, sellers=None):
+    """Satu baris per seller (urut revenue menurun) dari agregat + kota/negara bagian di `sellers`."""
+    card = aggregates.rename_axis("seller_id").reset_index()
+    card["avg_delivery_days"] = card["delivery_sum"] / card["orders"]
+    card["avg_review_score"] = card["review_sum"] / card["orders"]
+    card["late_rate"] = card["late_orders"] / card["orders"]
+    # Seller tanpa baris di sellers_dataset tetap dinilai, lokasinya "unknown"
+    if sellers is None:
+        sellers = pd.DataFrame({"seller_id": [], "seller_city": [], "seller_state": []})
+    sellers = sellers.drop_duplicates("seller_id")
+    pos = positions(card["seller_id"], sellers["seller_id"])
+    for col in ("seller_city", "seller_state"):
+        values = np.append(sellers[col].fillna(UNKNOWN).to_numpy(dtype=object), UNKNOWN)
+        card[col] = values[pos]
+    return card[SCORECARD_COLUMNS].sort_values("revenue", ascending=False, ignore_index=True)
+
+
+class SellerBoard:
+    """Peringkat seller atas artefak seller_scorecards (array kolom, tanpa baris item).
+
+    `ids` adalah kamus pipeline.ids; jika ada, seller_id hasil rank di-decode
+    ke string aslinya.
+    """
+
+    def __init__(self, cards, ids=None):
+        self.cards = cards.reset_index(drop=True)
+        self.ids = ids or {}
+        self._metrics = {m: self.cards[m].to_numpy(dtype=float) for m in SELLER_METRICS}
+        self._orders = self.cards["orders"].to_numpy()
+        state = self.cards["seller_state"].astype("category")
+        self._state_codes, self.states = state.cat.codes.to_numpy(), list(state.cat.categories)
+
+    def selection(self, states=None, min_orders=1):
+        """Posisi baris seller yang lolos filter negara bagian & minimal order."""
+        keep = self._orders >= min_orders
+        if states:
+            allowed = pd.Index(self.states).get_indexer(pd.Index(states))
+            keep &= np.isin(self._state_codes, allowed[allowed >= 0])
+        return np.flatnonzero(keep)
+
+    def rank(self, metric, k=10, states=None, min_orders=1, largest=True):
+        """k seller dengan `metric` terbesar (atau terkecil), terurut; argpartition lalu sort k baris saja."""
+        rows = self.selection(states, min_orders)
+        values = self._metrics[metric][rows]
+        key = -values if largest else values
+        k = min(k, len(rows))
+        if not k:
+            return self.cards.iloc[:0]
+        part = np.argpartition(key, k - 1)[:k] if k < len(rows) else np.arange(len(rows))
+        # Nilai sama: seller dengan order lebih banyak di atas
+        top = part[np.lexsort((-self._orders[rows][part], key[part]))]
+        ranked = self.cards.iloc[rows[top]]
+        if "seller_id" in self.ids:
+            ranked = ranked.assign(seller_id=decode(ranked["seller_id"], self.ids["seller_id"]))
+        return ranked
+
+    def summary(self, states=None, min_orders=1):
+        """Ringkasan seller terpilih: jumlah seller, revenue, order, review & keterlambatan tertimbang order."""
+        rows = self.selection(states, min_orders)
+        orders = self._orders[rows].sum()
+
+        def weighted(metric):
+            return (self._metrics[metric][rows] * self._orders[rows]).sum() / orders if orders else np.nan
+
+        return {"sellers": len(rows), "revenue": self._metrics["revenue"][rows].sum(), "orders": int(orders),
+                "avg_review_score": weighted("avg_review_score"), "late_rate": weighted("late_rate")}
@@ -0,0 +1,66 @@
+"""
+Lapisan data bersama: artefak Arrow IPC yang di-memory-map read-only.
+
+Semua proses/worker dashboard yang membuka file yang sama berbagi halaman
+page cache yang sama, sehingga memori tidak bertambah per worker. Kolom
+string dikembalikan sebagai `string[pyarrow]` dan kolom numerik tanpa
+konsolidasi block, jadi DataFrame dari `frame()` tetap menunjuk ke buffer
+yang di-map; hanya kode category yang disalin.
+"""
+
+import threading
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.ipc as ipc
+
+from .config import OUT_PATH
+from .store import parts
+
+
+def _arrow_strings(dtype):
+    if pa.types.is_string(dtype) or pa.types.is_large_string(dtype):
+        return pd.ArrowDtype(dtype)
+    return None
+
+
+class SharedData:
+    """Accessor read-only atas `store/<nama>/part-*.arrow` di `root`.
+
+    File di-map sekali per proses dan di-map ulang otomatis jika part
+    berubah (build penuh atau refresh inkremental).
+    """
+
+    def __init__(self, root=OUT_PATH):
+        self.root = root
+        self._tables = {}
+        self._lock = threading.Lock()
+
+    def _signature(self, name):
+        return tuple((p.name, p.stat().st_mtime_ns, p.stat().st_size)
+                     for p in parts(self.root, name, "arrow"))
+
+    def has(self, name):
+        return bool(parts(self.root, name, "arrow"))
+
+    def table(self, name, columns=None):
+        """pyarrow.Table zero-copy (hanya `columns` jika diberikan)."""
+        sig = self._signature(name)
+        if not sig:
+            raise FileNotFoundError(f"{self.root}/store/{name}/part-*.arrow")
+        with self._lock:
+            cached = self._tables.get(name)
+            if cached is None or cached[0] != sig:
+                chunks = [ipc.open_file(pa.memory_map(str(p), "r")).read_all()
+                          for p in parts(self.root, name, "arrow")]
+                cached = (sig, pa.concat_tables(chunks, promote_options="default"))
+                self._tables[name] = cached
+        table = cached[1]
+        return table if columns is None else table.select(columns)
+
+    def frame(self, name, columns=None):
+        """DataFrame pandas di atas buffer yang di-map (jangan diubah di tempat)."""
+        return self.table(name, columns).to_pandas(split_blocks=True, types_mapper=_arrow_strings)
+
+    def nbytes(self, name):
+        return self.table(name).nbytes
@@ -0,0 +1,84 @@
+"""
+State agregat yang disimpan build penuh untuk refresh inkremental.
+
+Semua measure bersifat aditif (sum/count) atau dapat digabung (max), sehingga
+delta cukup di-merge ke state tanpa membaca ulang histori.
+"""
+
+from pathlib import Path
+
+import pandas as pd
+
+from .cohort import CohortMatrix
+from .delivery import delivery_histogram
+from .sellers import seller_aggregates
+
+CATEGORY = "product_category_name_english"
+
+
+def category_state(main_df):
+    return main_df.groupby(CATEGORY).agg(
+        total_revenue=("revenue", "sum"),
+        item_count=("revenue", "size"),
+        total_orders=("order_id", "nunique"),
+    )
+
+
+def monthly_state(main_df):
+    return main_df.groupby("year_month").agg(
+        total_orders=("order_id", "nunique"),
+        total_revenue=("revenue", "sum"),
+    )
+
+
+def payment_state(main_df):
+    """Jumlah order dan total payment_value per metode dominan (satu baris per order)."""
+    orders = main_df[["order_id", "payment_type", "payment_value"]].drop_duplicates("order_id")
+    return orders.groupby("payment_type", observed=True).agg(
+        count=("order_id", "size"),
+        total_value=("payment_value", "sum"),
+    )
+
+
+def customer_state(main_df):
+    return main_df.groupby("customer_unique_id").agg(
+        last_purchase=("order_purchase_timestamp", "max"),
+        frequency=("order_id", "nunique"),
+        monetary=("payment_value", "sum"),
+    )
+
+
+def delivery_state(main_df):
+    """Histogram order per (delivery_days, review_score) untuk delivery_stats."""
+    orders = main_df[["order_id", "delivery_days", "review_score"]].dropna().drop_duplicates("order_id")
+    return delivery_histogram(orders)
+
+
+def cohort_state(main_df):
+    """Matriks kohort + bulan pertama/terakhir aktif per pelanggan."""
+    cohort = CohortMatrix()
+    cohort.update(main_df)
+    return cohort
+
+
+def build_state(main_df, orders_df):
+    """State agregat awal dari hasil build penuh."""
+    return {
+        "watermark": pd.to_datetime(orders_df["order_purchase_timestamp"]).max(),
+        "category":  category_state(main_df),
+        "monthly":   monthly_state(main_df),
+        "payments":  payment_state(main_df),
+        "customers": customer_state(main_df),
+        "delivery":  delivery_state(main_df),
+        "cohort":    cohort_state(main_df),
+        "sellers":   seller_aggregates(main_df),
+    }
+
+
+def save_state(state, path):
+    pd.to_pickle(state, path)
+
+
+def load_state(path):
+    path = Path(path)
+    return pd.read_pickle(path) if path.exists() else None
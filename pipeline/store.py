@@ -0,0 +1,202 @@
+"""
+Artifact store kolumnar (Parquet) dengan skema bertipe untuk input dashboard.
+
+Setiap artefak disimpan sebagai folder `store/<nama>/part-NNNNN.parquet`:
+kolom dimensi sebagai category, numerik di-downcast, timestamp native.
+Format "arrow" menulis part yang sama sebagai Arrow IPC tanpa kompresi
+(`part-NNNNN.arrow`) untuk di-memory-map oleh pipeline.shared.
+Refresh inkremental cukup menambah file part baru. CSV tetap bisa ditulis
+berdampingan (kompatibel dengan notebook) dan menjadi fallback `read_table`
+jika store belum dibangun.
+"""
+
+import shutil
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.ipc as ipc
+
+from .config import OUT_PATH
+
+STORE_DIR = "store"
+FORMATS   = ("parquet", "arrow", "csv")
+
+# ─── Skema per artefak ────────────────────────────────────────
+# Kolom uang (price, revenue, payment_value, ...) tetap float64 supaya
+# penjumlahan jutaan baris tidak kehilangan presisi sen.
+SCHEMAS = {
+    "main_df": {
+        "order_id":                      "int32",
+        "customer_id":                   "int32",
+        "customer_unique_id":            "int32",
+        "product_id":                    "int32",
+        "seller_id":                     "int32",
+        "order_item_id":                 "int16",
+        "shipping_limit_date":           "datetime64[ns]",
+        "order_purchase_timestamp":      "datetime64[ns]",
+        "order_delivered_customer_date": "datetime64[ns]",
+        "order_estimated_delivery_date": "datetime64[ns]",
+        "delivery_days":                 "int16",
+        "customer_state":                "category",
+        "product_category_name_english": "category",
+        "payment_type":                  "category",
+        "review_score":                  "float32",
+    },
+    "rfm_df": {
+        "customer_unique_id": "int32",
+        "recency":            "int16",
+        "frequency":          "int32",
+        "R_score":            "int8",
+        "F_score":            "int8",
+        "M_score":            "int8",
+        "RFM_score":          "category",
+        "segment":            "category",
+    },
+    "monthly_trend": {
+        "total_orders": "int32",
+    },
+    "daily_trend": {
+        "date":   "datetime64[ns]",
+        "orders": "int32",
+    },
+    "payment_freq": {
+        "count": "int32",
+    },
+    "delivery_review": {
+        "order_id":          "int32",
+        "delivery_days":     "int16",
+        "review_score":      "float32",
+        "delivery_category": "category",
+    },
+    "delivery_stats": {
+        "delivery_category": "category",
+        "orders":            "int32",
+    },
+    "delivery_moments": {
+        "date": "datetime64[ns]",
+        "n":    "int32",
+    },
+    "revenue_by_category": {
+        "total_orders": "int32",
+    },
+    "daily_cube": {
+        "date":                          "datetime64[ns]",
+        "product_category_name_english": "category",
+        "payment_type":                  "category",
+        "customer_state":                "category",
+        "delivery_category":             "category",
+        "items":                         "int32",
+        "review_count":                  "int32",
+        "delivery_count":                "int32",
+    },
+    "cube_members": {
+        "date":                          "datetime64[ns]",
+        "product_category_name_english": "category",
+        "payment_type":                  "category",
+        "customer_state":                "category",
+        "delivery_category":             "category",
+        "order_hash":                    "uint64",
+        "customer_hash":                 "uint64",
+    },
+    "cohort_matrix": {
+        "cohort":    "datetime64[ns]",
+        "age":       "int16",
+        "customers": "int32",
+        "orders":    "int32",
+    },
+    "seller_scorecards": {
+        "seller_id":    "int32",
+        "seller_state": "category",
+        "orders":       "int32",
+        "items":        "int32",
+    },
+    "lookup_index": {
+        "customer_unique_id": "int32",
+        "customer_row":       "int32",
+        "order_id":           "int32",
+        "order_row":          "int32",
+    },
+    "distinct_sketches": {
+        "date":      "datetime64[ns]",
+        "dimension": "category",
+        "value":     "category",
+        "kind":      "category",
+        "entry":     "uint32",
+    },
+}
+
+
+def apply_schema(df, name):
+    """Cast kolom yang ada di df sesuai SCHEMAS[name]."""
+    schema = {c: t for c, t in SCHEMAS.get(name, {}).items() if c in df.columns}
+    dates = [c for c, t in schema.items() if t.startswith("datetime")]
+    for c in dates:
+        df[c] = pd.to_datetime(df[c])
+    return df.astype({c: t for c, t in schema.items() if c not in dates})
+
+
+# ─── Tulis ────────────────────────────────────────────────────
+def table_dir(root, name):
+    return Path(root) / STORE_DIR / name
+
+
+def parts(root, name, ext="parquet"):
+    """File part artefak `name` berurutan."""
+    d = table_dir(root, name)
+    return sorted(d.glob(f"part-*.{ext}")) if d.exists() else []
+
+
+def existing_formats(root, name):
+    """Format yang sudah ada untuk artefak `name` di `root`."""
+    found = [ext for ext in ("parquet", "arrow") if parts(root, name, ext)]
+    if (Path(root) / f"{name}.csv").exists():
+        found.append("csv")
+    return tuple(found)
+
+
+def _write_part(df, name, path, ext):
+    df = apply_schema(df.copy(), name)
+    if ext == "parquet":
+        df.to_parquet(path, index=False)
+    else:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        with pa.OSFile(str(path), "wb") as sink, ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+
+
+def write_table(df, name, root=OUT_PATH, formats=FORMATS):
+    """Tulis ulang artefak secara penuh."""
+    d = table_dir(root, name)
+    columnar = [ext for ext in ("parquet", "arrow") if ext in formats]
+    if columnar:
+        shutil.rmtree(d, ignore_errors=True)
+        d.mkdir(parents=True)
+    for ext in columnar:
+        _write_part(df, name, d / f"part-00000.{ext}", ext)
+    if "csv" in formats:
+        df.to_csv(Path(root) / f"{name}.csv", index=False)
+
+
+def append_table(df, name, root=OUT_PATH, formats=FORMATS):
+    """Tambah baris ke artefak: part kolumnar baru dan/atau append CSV."""
+    if df.empty:
+        return
+    d = table_dir(root, name)
+    for ext in ("parquet", "arrow"):
+        if ext not in formats:
+            continue
+        existing = parts(root, name, ext)
+        idx = int(existing[-1].stem.split("-")[1]) + 1 if existing else 0
+        d.mkdir(parents=True, exist_ok=True)
+        _write_part(df, name, d / f"part-{idx:05d}.{ext}", ext)
+    if "csv" in formats:
+        df.to_csv(Path(root) / f"{name}.csv", mode="a", header=False, index=False)
+
+
+# ─── Baca ─────────────────────────────────────────────────────
+def read_table(name, columns=None, root=OUT_PATH):
+    """Baca artefak (hanya `columns` jika diberikan); Parquet jika ada, selain itu CSV."""
+    if parts(root, name):
+        return pd.read_parquet(parts(root, name), columns=columns)
+    return apply_schema(pd.read_csv(Path(root) / f"{name}.csv", usecols=columns), name)
@@ -0,0 +1,211 @@
+"""
+Build streaming untuk dataset mentah yang lebih besar dari RAM.
+
+Tabel dimensi (customers, products, translation, sellers) dibaca utuh dan
+tetap di memori. Tabel fakta (orders, order_items, payments, reviews) dibaca
+per chunk dalam dua tahap:
+
+1. spill — tiap chunk di-intern, dipangkas ke kolom yang dipakai, lalu ditulis
+   ke partisi bulanan (bulan order_purchase_timestamp) di folder sementara.
+   Baris order_items/payments/reviews mengikuti partisi order-nya lewat array
+   kode order → partisi. Watermark dilipat langsung dari chunk.
+2. fold — partisi diproses urut bulan: join ke main_df partisi, agregat
+   kategori/bulanan/pembayaran/RFM/pengiriman/kohort/seller dilipat ke state
+   (sama seperti refresh inkremental), dan baris main_df, delivery_review,
+   momen pengiriman, tren harian, serta cube di-append ke store; lookup_index
+   digabung per batch lewat merge_index.
+   Partisi saling lepas dan terurut waktu, jadi hasilnya sama dengan build
+   penuh dan state-nya bisa langsung dipakai refresh inkremental.
+
+Memori puncak ≈ dimensi + kamus ID + satu partisi bulanan + state per
+pelanggan + lookup_index (empat int32 per baris item); baris artefak lain
+tidak ditahan. Kode order_id/seller_id diberikan menurut urutan kemunculan
+(bukan urutan string seperti build penuh); hasil decode-nya sama.
+"""
+
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .build import (aggregate_payments, aggregate_reviews, build_main_df, clean_orders,
+                    cube_members, daily_cube, daily_trend, delivery_moments, delivery_review,
+                    distinct_sketches, translate_products)
+from .cohort import month_code
+from .config import CHUNK_ROWS, ORDER_DATE_COLS, RAW_FILES, RFM_EDGES_FILE, STATE_FILE
+from .delivery import stats_from_histogram
+from .ids import intern_ids, save_ids
+from .incremental import (DELTA_TABLES, DIMENSION_TABLES, fold_main, monthly_from_state,
+                          payment_from_state, revenue_from_state, rfm_from_state)
+from .load import load_raw
+from .lookup import lookup_index, merge_index
+from .rfm import load_edges, save_edges
+from .sellers import scorecards, seller_aggregates
+from .state import (category_state, cohort_state, customer_state, delivery_state, monthly_state,
+                    payment_state, save_state)
+from .store import FORMATS, append_table, write_table
+from .timing import StageTimer
+
+# Kolom tabel fakta yang disimpan ke partisi
+SPILL_COLUMNS = {
+    "orders":      ["order_id", "customer_id", "order_status"] + ORDER_DATE_COLS,
+    "order_items": ["order_id", "order_item_id", "product_id", "seller_id",
+                    "shipping_limit_date", "price", "freight_value"],
+    "payments":    ["order_id", "payment_type", "payment_value"],
+    "reviews":     ["order_id", "review_score"],
+}
+
+
+# ─── Tahap 1: spill ke partisi bulanan ────────────────────────
+def _grow(lut, size):
+    """Perpanjang array kode → partisi (isi -1) sampai `size`."""
+    if size <= len(lut):
+        return lut
+    return np.concatenate([lut, np.full(size - len(lut), -1, dtype=lut.dtype)])
+
+
+def spill(data_path, spill_dir, ids, chunksize=CHUNK_ROWS, timer=None):
+    """Pecah tabel fakta ke `spill_dir/<tabel>/<bulan>/part-*.parquet`.
+
+    Hasil: (kode bulan terurut, watermark, kamus ID).
+    Order selain delivered dan baris tanpa order yang dikenal tidak di-spill.
+    """
+    timer = timer or StageTimer()
+    spill_dir = Path(spill_dir)
+    part_of = np.empty(0, dtype=np.int32)
+    watermark, months = pd.NaT, set()
+
+    for name in DELTA_TABLES:
+        with timer.stage(f"spill_{name}"):
+            reader = pd.read_csv(Path(data_path) / RAW_FILES[name], chunksize=chunksize,
+                                 usecols=lambda c: c in SPILL_COLUMNS[name])
+            for i, chunk in enumerate(reader):
+                raw, ids = intern_ids({name: chunk}, ids)
+                chunk = raw[name]
+                part_of = _grow(part_of, len(ids["order_id"]))
+                if name == "orders":
+                    purchase = pd.to_datetime(chunk["order_purchase_timestamp"])
+                    if purchase.notna().any():
+                        watermark = purchase.max() if pd.isna(watermark) else max(watermark, purchase.max())
+                    month = month_code(purchase)
+                    part_of[chunk["order_id"].to_numpy()] = month
+                    keep = (chunk["order_status"] == "delivered").to_numpy() & (month >= 0)
+                else:
+                    month = part_of[chunk["order_id"].to_numpy()]
+                    keep = month >= 0
+                for m, rows in chunk[keep].groupby(month[keep], sort=False):
+                    d = spill_dir / name / str(m)
+                    d.mkdir(parents=True, exist_ok=True)
+                    rows.to_parquet(d / f"part-{i:05d}.parquet", index=False)
+                    months.add(int(m))
+    return sorted(months), watermark, ids
+
+
+def read_partition(spill_dir, name, month):
+    files = sorted((Path(spill_dir) / name / str(month)).glob("part-*.parquet"))
+    return pd.concat([pd.read_parquet(f) for f in files], ignore_index=True) if files else None
+
+
+# ─── Tahap 2: fold per partisi ────────────────────────────────
+def fold(spill_dir, months, dims, out_path, formats=FORMATS, chunksize=CHUNK_ROWS):
+    """Join tiap partisi, lipat ke state, append baris artefak; hasil: state (tanpa watermark).
+
+    Baris artefak ditampung sampai main_df mencapai `chunksize` baris sebelum
+    ditulis sebagai satu part, agar bulan yang kecil tidak menjadi part kecil.
+    lookup_index digabung per part main_df dan ditulis sekali di akhir.
+    """
+    state, written, pending, index = None, set(), {}, None
+
+    def flush():
+        nonlocal index
+        for name, frames in pending.items():
+            df = pd.concat(frames, ignore_index=True)
+            (append_table if name in written else write_table)(df, name, out_path, formats)
+            written.add(name)
+            if name == "main_df":
+                index = lookup_index(df) if index is None else merge_index(index, df, len(index))
+        pending.clear()
+
+    for month in months:
+        part = {name: read_partition(spill_dir, name, month) for name in DELTA_TABLES}
+        if any(df is None for df in part.values()):
+            continue
+        main_part = build_main_df(part["order_items"], clean_orders(part["orders"]),
+                                  dims["customers"], dims["products"],
+                                  aggregate_payments(part["payments"]),
+                                  aggregate_reviews(part["reviews"]))
+        if main_part.empty:
+            continue
+        if state is None:
+            state = {"category":  category_state(main_part),
+                     "monthly":   monthly_state(main_part),
+                     "payments":  payment_state(main_part),
+                     "customers": customer_state(main_part),
+                     "delivery":  delivery_state(main_part),
+                     "cohort":    cohort_state(main_part),
+                     "sellers":   seller_aggregates(main_part)}
+        else:
+            fold_main(state, main_part)
+
+        members = cube_members(main_part)
+        rows = {
+            "main_df":           main_part,
+            "delivery_review":   delivery_review(main_part),
+            "delivery_moments":  delivery_moments(main_part),
+            "daily_trend":       daily_trend(main_part),
+            "daily_cube":        daily_cube(main_part),
+            "cube_members":      members,
+            "distinct_sketches": distinct_sketches(members),
+        }
+        for name, df in rows.items():
+            pending.setdefault(name, []).append(df)
+        if sum(len(df) for df in pending["main_df"]) >= chunksize:
+            flush()
+    flush()
+    if state is None:
+        raise ValueError("tidak ada order delivered yang lengkap di dataset")
+    write_table(index, "lookup_index", out_path, formats)
+    return state
+
+
+# ─── Orkestrasi ───────────────────────────────────────────────
+def run_streaming(data_path, out_path, timer=None, chunksize=CHUNK_ROWS, refit_rfm=False,
+                  formats=FORMATS, spill_dir=None):
+    """Build penuh dengan memori terbatas; artefak & state sama dengan pipeline.build.run.
+
+    `spill_dir` adalah induk folder sementara partisi (default: temp sistem).
+    """
+    timer = timer or StageTimer()
+    out_path = Path(out_path)
+    out_path.mkdir(parents=True, exist_ok=True)
+
+    with timer.stage("load_dimensions"):
+        dims, ids = intern_ids(load_raw(data_path, DIMENSION_TABLES))
+        dims["products"] = translate_products(dims["products"], dims["translation"])
+
+    with tempfile.TemporaryDirectory(prefix="olist-spill-", dir=spill_dir) as tmp:
+        months, watermark, ids = spill(data_path, tmp, ids, chunksize, timer)
+        with timer.stage("fold_partitions"):
+            state = fold(tmp, months, dims, out_path, formats, chunksize)
+    state["watermark"] = watermark
+
+    with timer.stage("derive_tables"):
+        previous = None if refit_rfm else load_edges(out_path / RFM_EDGES_FILE)
+        rfm_df = rfm_from_state(state["customers"], previous)
+        tables = {
+            "revenue_by_category": revenue_from_state(state["category"]),
+            "rfm_df":              rfm_df,
+            "monthly_trend":       monthly_from_state(state["monthly"]),
+            "payment_freq":        payment_from_state(state["payments"]),
+            "delivery_stats":      stats_from_histogram(state["delivery"]),
+            "cohort_matrix":       state["cohort"].table(),
+            "seller_scorecards":   scorecards(state["sellers"], dims["sellers"]),
+        }
+    with timer.stage("write_artifacts"):
+        for name, df in tables.items():
+            write_table(df, name, out_path, formats)
+        save_edges(rfm_df.attrs["rfm_edges"], out_path / RFM_EDGES_FILE)
+        save_ids(ids, out_path)
+        save_state(state, out_path / STATE_FILE)
+    return state
@@ -0,0 +1,94 @@
+"""
+Pencatat durasi per stage untuk pipeline yang berjalan headless.
+"""
+
+import logging
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+import pandas as pd
+
+log = logging.getLogger(__name__)
+
+
+class StageTimer:
+    """Mengumpulkan durasi (detik) setiap stage secara berurutan.
+
+    Stage boleh bersarang; stage anak dicatat dengan `depth` lebih besar dan
+    tidak ikut dijumlahkan ke `total`. Dengan `trace_memory=True`, puncak
+    alokasi di atas memori awal stage (tracemalloc, termasuk buffer
+    numpy/pandas) ikut dicatat dalam MB.
+    """
+
+    def __init__(self, trace_memory=False):
+        self.records = []
+        self.trace_memory = trace_memory
+        self._depth = 0
+        self._peaks = []  # puncak absolut stage yang masih terbuka
+
+    @contextmanager
+    def stage(self, name):
+        if self.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            if self._peaks:
+                # reset_peak di bawah menghapus puncak induk; simpan dulu
+                self._peaks[-1] = max(self._peaks[-1], tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+            self._peaks.append(base)
+        # Slot dipesan saat masuk agar urutan record = urutan stage dimulai
+        depth, slot = self._depth, len(self.records)
+        self.records.append((name, None, None, depth))
+        self._depth += 1
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - t0
+            self._depth = depth
+            peak = None
+            if self.trace_memory:
+                top = max(self._peaks.pop(), tracemalloc.get_traced_memory()[1])
+                if self._peaks:
+                    self._peaks[-1] = max(self._peaks[-1], top)
+                peak = (top - base) / 2**20
+                log.info("%-24s %8.3f s %9.1f MB", "  " * depth + name, elapsed, peak)
+            else:
+                log.info("%-24s %8.3f s", "  " * depth + name, elapsed)
+            self.records[slot] = (name, elapsed, peak, depth)
+
+    @property
+    def total(self):
+        return sum(sec for _, sec, _, depth in self.records if depth == 0)
+
+    def to_frame(self):
+        df = pd.DataFrame(self.records, columns=["stage", "seconds", "peak_mb", "depth"])
+        drop = ([] if self.trace_memory else ["peak_mb"]) + ([] if df["depth"].any() else ["depth"])
+        return df.drop(columns=drop)
+
+    def report(self):
+        names = ["  " * depth + n for n, _, _, depth in self.records]
+        width = max([len(n) for n in names] + [5])
+        lines = [f"{n:<{width}}  {sec:8.3f} s" + (f" {peak:9.1f} MB" if peak is not None else "")
+                 for n, (_, sec, peak, _) in zip(names, self.records)]
+        lines.append(f"{'TOTAL':<{width}}  {self.total:8.3f} s")
+        return "\n".join(lines)
+
+
+def memory_snapshot():
+    """Ringkasan memori proses saat ini (MB): puncak RSS dan alokasi tracemalloc."""
+    snap = {"rss_peak_mb": None, "traced_mb": None, "traced_peak_mb": None}
+    try:
+        import resource
+        # ru_maxrss dalam KB di Linux, byte di macOS
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        snap["rss_peak_mb"] = rss / (2**20 if sys.platform == "darwin" else 2**10)
+    except ImportError:  # Windows
+        pass
+    if tracemalloc.is_tracing():
+        current, peak = tracemalloc.get_traced_memory()
+        snap["traced_mb"], snap["traced_peak_mb"] = current / 2**20, peak / 2**20
+    return snap
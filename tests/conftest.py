@@ -0,0 +1,86 @@
+"""
+Fixture bersama: dataset sintetis kecil (benchmarks.synth) dan build-nya.
+
+Dataset dan setiap mode build dibuat sekali per sesi pytest. Build
+inkremental = build penuh atas data sampai CUTOFF lalu refresh dengan sisanya,
+sehingga hasilnya bisa dibandingkan dengan build penuh atas seluruh data.
+"""
+
+import shutil
+
+import pandas as pd
+import pytest
+
+from benchmarks.synth import generate
+from pipeline.build import run
+from pipeline.config import RAW_FILES
+from pipeline.incremental import DELTA_TABLES, DIMENSION_TABLES, run_incremental
+from pipeline.store import read_table
+from pipeline.stream import run_streaming
+
+SCALE = 0.02
+SEED = 7
+# Order setelah tanggal ini masuk delta refresh inkremental
+CUTOFF = pd.Timestamp("2018-05-15")
+FORMATS = ("parquet",)
+
+
+@pytest.fixture(scope="session")
+def raw_dir(tmp_path_factory):
+    path = tmp_path_factory.mktemp("raw")
+    generate(path, SCALE, SEED, chunk_orders=500)
+    return path
+
+
+@pytest.fixture(scope="session")
+def split_dirs(raw_dir, tmp_path_factory):
+    """(base, delta): tabel dimensi di base, tabel fakta dibelah di CUTOFF."""
+    base, delta = tmp_path_factory.mktemp("base"), tmp_path_factory.mktemp("delta")
+    for name in DIMENSION_TABLES:
+        shutil.copy(raw_dir / RAW_FILES[name], base / RAW_FILES[name])
+    orders = pd.read_csv(raw_dir / RAW_FILES["orders"])
+    old = pd.to_datetime(orders["order_purchase_timestamp"]) <= CUTOFF
+    orders[old].to_csv(base / RAW_FILES["orders"], index=False)
+    orders[~old].to_csv(delta / RAW_FILES["orders"], index=False)
+    for name in DELTA_TABLES[1:]:
+        df = pd.read_csv(raw_dir / RAW_FILES[name])
+        keep = df["order_id"].isin(orders.loc[old, "order_id"])
+        df[keep].to_csv(base / RAW_FILES[name], index=False)
+        df[~keep].to_csv(delta / RAW_FILES[name], index=False)
+    return base, delta
+
+
+@pytest.fixture(scope="session")
+def full_out(raw_dir, tmp_path_factory):
+    out = tmp_path_factory.mktemp("full")
+    run(raw_dir, out, formats=FORMATS)
+    return out
+
+
+@pytest.fixture(scope="session")
+def incremental_out(split_dirs, tmp_path_factory):
+    base, delta = split_dirs
+    out = tmp_path_factory.mktemp("incremental")
+    run(base, out, formats=FORMATS)
+    run_incremental(base, delta, out)
+    return out
+
+
+@pytest.fixture(scope="session")
+def stream_out(raw_dir, tmp_path_factory):
+    out = tmp_path_factory.mktemp("stream")
+    # Chunk kecil agar spill & flush terjadi berkali-kali
+    run_streaming(raw_dir, out, chunksize=700, formats=FORMATS)
+    return out
+
+
+@pytest.fixture(scope="session")
+def parallel_out(raw_dir, tmp_path_factory):
+    out = tmp_path_factory.mktemp("parallel")
+    run(raw_dir, out, formats=FORMATS, workers=2)
+    return out
+
+
+@pytest.fixture(scope="session")
+def main_df(full_out):
+    return read_table("main_df", root=full_out)
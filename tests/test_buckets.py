@@ -0,0 +1,52 @@
+"""
+TimeBuckets & moving_average: sama dengan resample/rolling pandas.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pipeline.build import daily_trend, monthly_trend
+from pipeline.buckets import TimeBuckets, bucket_code, bucket_start, moving_average
+
+FREQ = {"D": "D", "W": "W-MON", "M": "MS", "Q": "QS"}
+
+
+@pytest.mark.parametrize("window", [1, 3, 7])
+def test_moving_average_matches_rolling(window):
+    values = np.random.default_rng(window).normal(100, 20, 50)
+    want = pd.Series(values).rolling(window, min_periods=1).mean().to_numpy()
+    np.testing.assert_allclose(moving_average(values, window), want)
+
+
+@pytest.mark.parametrize("freq", list(FREQ))
+def test_bucket_start_inverts_bucket_code(freq):
+    days = np.arange(16_000, 17_500)
+    start = bucket_start(bucket_code(days, freq), freq)
+    assert (start <= days.astype("datetime64[D]")).all()
+    np.testing.assert_array_equal(bucket_code(start.to_numpy().astype("datetime64[D]").astype(np.int64), freq),
+                                  bucket_code(days, freq))
+
+
+@pytest.mark.parametrize("start,end", [(None, None), ("2017-02-15", "2017-09-03")])
+@pytest.mark.parametrize("freq", list(FREQ))
+def test_series_matches_resample(main_df, freq, start, end):
+    buckets = TimeBuckets(daily_trend(main_df))
+    got = buckets.trend(freq, 3, start, end)
+    daily = daily_trend(main_df).set_index("date")
+    if start is not None:
+        daily = daily.loc[start:end]
+    # Minggu dimulai Senin; resample kiri-tertutup berlabel awal bucket
+    want = daily.resample(FREQ[freq], label="left", closed="left").sum()
+    np.testing.assert_array_equal(got["bucket"].to_numpy(), want.index.to_numpy())
+    np.testing.assert_array_equal(got["total_orders"], want["orders"])
+    np.testing.assert_allclose(got["total_revenue"], want["revenue"])
+    np.testing.assert_allclose(got["revenue_MA"], moving_average(want["revenue"], 3))
+
+
+def test_monthly_series_matches_monthly_trend(main_df):
+    got = TimeBuckets(daily_trend(main_df)).trend("M", 3)
+    want = monthly_trend(main_df)
+    np.testing.assert_array_equal(got["label"], want["year_month_str"])
+    np.testing.assert_array_equal(got["total_orders"], want["total_orders"])
+    np.testing.assert_allclose(got["orders_MA"], want["orders_MA3"])
@@ -0,0 +1,50 @@
+"""
+Utilitas benchmark: best_of, dataset yang dibuat ulang saat stempel generator berubah.
+"""
+
+import json
+
+import numpy as np
+
+from benchmarks.common import best_of, dataset, synthetic_raw
+from benchmarks.synth import STAMP_FILE, read_stamp, stamp
+from pipeline.config import RAW_FILES
+
+SCALE = 0.005
+
+
+def test_best_of_returns_last_output_and_min_time():
+    calls = []
+    out, best = best_of(lambda: calls.append(len(calls)) or len(calls), repeat=3)
+    assert out == 3 and len(calls) == 3
+    assert 0 <= best
+
+
+def test_dataset_is_reused_while_stamp_matches(tmp_path):
+    path = dataset(tmp_path, SCALE, seed=1)
+    assert read_stamp(path) == stamp(SCALE, 1)
+    mtime = (path / STAMP_FILE).stat().st_mtime_ns
+    assert dataset(tmp_path, SCALE, seed=1) == path
+    assert (path / STAMP_FILE).stat().st_mtime_ns == mtime
+
+
+def test_dataset_regenerates_on_stale_stamp(tmp_path):
+    path = dataset(tmp_path, SCALE, seed=1)
+    old = read_stamp(path)
+    (path / STAMP_FILE).write_text(json.dumps({**old, "version": old["version"] - 1}))
+    dataset(tmp_path, SCALE, seed=1)
+    assert read_stamp(path) == stamp(SCALE, 1)
+
+
+def test_dataset_regenerates_on_other_seed(tmp_path):
+    first = (dataset(tmp_path, SCALE, seed=1) / RAW_FILES["orders"]).read_bytes()
+    second = (dataset(tmp_path, SCALE, seed=2) / RAW_FILES["orders"]).read_bytes()
+    assert first != second
+
+
+def test_synthetic_raw_interns_ids(tmp_path):
+    raw = synthetic_raw(SCALE, tmp_path, seed=1, tables=["orders"])
+    assert np.issubdtype(raw["orders"]["order_id"].dtype, np.integer)
+    plain = synthetic_raw(SCALE, tmp_path, seed=1, tables=["orders"], interned=False)
+    assert plain["orders"]["order_id"].dtype == object
+    assert raw["orders"]["order_id"].nunique() == plain["orders"]["order_id"].nunique()
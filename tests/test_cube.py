@@ -0,0 +1,81 @@
+"""
+DailyCube harus menjawab tabel halaman sama dengan MainQuery atas main_df.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pipeline.build import revenue_by_category
+from pipeline.cube import DailyCube
+from pipeline.query import MainQuery
+from pipeline.store import read_table
+
+WINDOWS = [(None, None), ("2017-06-01", "2017-08-15"), ("2018-02-10", "2018-02-10"), ("2016-01-01", "2019-12-31")]
+TABLES = {
+    "revenue_by_category": "product_category_name_english",
+    "monthly_trend":       "year_month",
+    "payment_freq":        "payment_type",
+}
+
+
+@pytest.fixture(scope="module")
+def cube(full_out):
+    return DailyCube(read_table("daily_cube", root=full_out), read_table("cube_members", root=full_out),
+                     read_table("distinct_sketches", root=full_out))
+
+
+@pytest.fixture(scope="module")
+def query(main_df):
+    return MainQuery(main_df)
+
+
+def by_key(df, key):
+    df = df.assign(**{key: df[key].astype(str)}).sort_values(key, ignore_index=True)
+    return df.astype({c: float for c in df.columns if c != key and df[c].dtype.kind in "iuf"})
+
+
+@pytest.mark.parametrize("start,end", WINDOWS)
+@pytest.mark.parametrize("name", list(TABLES))
+def test_window_tables_match_main_query(cube, query, name, start, end):
+    key = TABLES[name]
+    got, want = by_key(getattr(cube, name)(start, end), key), by_key(getattr(query, name)(start, end), key)
+    pd.testing.assert_frame_equal(got, want[got.columns], check_exact=False, rtol=1e-9, check_dtype=False)
+
+
+@pytest.mark.parametrize("start,end", WINDOWS)
+def test_overview_matches_main_query(cube, query, start, end):
+    got, want = cube.overview(start, end), query.overview(start, end)
+    assert (got["total_ord"], got["total_cust"]) == (want["total_ord"], want["total_cust"])
+    for k in ("total_rev", "avg_score", "avg_del", "avg_ticket"):
+        assert np.isclose(got[k], want[k])
+
+
+def test_full_range_payment_freq_matches_artifact(cube, full_out):
+    # Sama dengan artefak, juga di mode HLL (jumlah order dari measure aditif)
+    artifact = read_table("payment_freq", root=full_out)
+    for approx in (False, True):
+        pd.testing.assert_frame_equal(cube.payment_freq(approx=approx), artifact,
+                                      check_exact=False, rtol=1e-9, check_dtype=False, check_categorical=False)
+
+
+def test_dimension_filter_matches_sliced_main_df(cube, main_df):
+    where = {"customer_state": ["SP", "RJ"]}
+    ts = main_df["order_purchase_timestamp"]
+    sliced = main_df[(ts >= "2017-06-01") & (ts < "2017-09-01") & main_df["customer_state"].isin(where["customer_state"])]
+    key = "product_category_name_english"
+    got = by_key(cube.revenue_by_category("2017-06-01", "2017-08-31", where), key)
+    want = by_key(revenue_by_category(sliced), key)
+    pd.testing.assert_frame_equal(got, want[got.columns], check_exact=False, rtol=1e-9, check_dtype=False)
+    assert cube.overview("2017-06-01", "2017-08-31", where)["total_cust"] == sliced["customer_unique_id"].nunique()
+
+
+@pytest.mark.parametrize("start,end", WINDOWS[:2])
+def test_hll_distinct_within_error_bound(cube, start, end):
+    for column in ("order", "customer"):
+        exact = cube.distinct(column, start, end)
+        approx = cube.distinct(column, start, end, approx=True)
+        assert abs(approx - exact) <= 4 * cube.hll_error * exact + 1
+        exact_m = cube.distinct(column, start, end, "month")
+        approx_m = cube.distinct(column, start, end, "month", approx=True).reindex(exact_m.index)
+        assert (abs(approx_m - exact_m) <= 4 * cube.hll_error * exact_m + 1).all()
@@ -0,0 +1,57 @@
+"""
+Statistik pengiriman dari histogram & momen per hari: sama dengan hitungan langsung per order.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pipeline.build import delivery_moments, delivery_review, delivery_stats
+from pipeline.delivery import TOTAL, DailyMoments, delivery_category
+
+
+@pytest.fixture(scope="module")
+def orders(main_df):
+    return delivery_review(main_df).merge(
+        main_df[["order_id", "order_purchase_timestamp"]].drop_duplicates("order_id"), on="order_id")
+
+
+def test_category_matches_notebook_rules():
+    days = np.arange(0, 60)
+    want = ["1-Fast (≤7 days)" if d <= 7 else "2-Normal (8-14 days)" if d <= 14
+            else "3-Slow (15-21 days)" if d <= 21 else "4-Very Slow (>21 days)" for d in days]
+    np.testing.assert_array_equal(np.asarray(delivery_category(days), dtype=object), want)
+
+
+def test_stats_match_direct_computation(orders):
+    stats = delivery_stats(orders).set_index("delivery_category")
+    for label, part in [(TOTAL, orders), *orders.groupby("delivery_category", observed=True)]:
+        row = stats.loc[label]
+        days, score = part["delivery_days"].to_numpy(float), part["review_score"].to_numpy(float)
+        assert row["orders"] == len(part)
+        np.testing.assert_allclose(row["days_mean"], days.mean())
+        np.testing.assert_allclose(row["review_mean"], score.mean())
+        np.testing.assert_allclose(row[["review_q1", "review_median", "review_q3"]].to_numpy(float),
+                                   np.percentile(score, [25, 50, 75]))
+        np.testing.assert_allclose(row["days_p99"], np.percentile(days, 99))
+        if np.ptp(days) and np.ptp(score):
+            np.testing.assert_allclose(row["pearson_r"], np.corrcoef(days, score)[0, 1])
+
+
+@pytest.mark.parametrize("start,end", [(None, None), ("2017-03-01", "2017-08-31"), ("2018-02-10", None)])
+def test_daily_moments_fit_matches_corrcoef(main_df, orders, start, end):
+    fit = DailyMoments(delivery_moments(main_df)).fit(start, end)
+    day = orders["order_purchase_timestamp"].dt.normalize()
+    part = orders[(day >= (start or day.min())) & (day <= (end or day.max()))]
+    days, score = part["delivery_days"].to_numpy(float), part["review_score"].to_numpy(float)
+    assert fit["orders"] == len(part)
+    np.testing.assert_allclose(fit["pearson_r"], np.corrcoef(days, score)[0, 1])
+    np.testing.assert_allclose([fit["slope"], fit["intercept"]], np.polyfit(days, score, 1))
+
+
+def test_duplicate_days_are_summed(main_df):
+    # Refresh inkremental bisa menulis hari watermark dua kali
+    table = delivery_moments(main_df)
+    doubled = pd.concat([table, table.iloc[-3:].assign(n=0, sum_x=0.0, sum_y=0.0, sum_xx=0.0,
+                                                       sum_yy=0.0, sum_xy=0.0)])
+    np.testing.assert_allclose(DailyMoments(doubled).total(), DailyMoments(table).total())
@@ -0,0 +1,44 @@
+"""
+HyperLogLog: galat estimasi dalam batas relative_error, merge = sketch gabungan.
+"""
+
+import numpy as np
+import pytest
+
+from pipeline import hll
+
+
+def hashes(n, seed=0):
+    return np.random.default_rng(seed).integers(0, np.iinfo(np.uint64).max, n, dtype=np.uint64, endpoint=True)
+
+
+@pytest.mark.parametrize("n", [10, 1_000, 50_000, 500_000])
+def test_estimate_within_error_bound(n):
+    est = hll.estimate(hll.sketch(hashes(n, n)))[0]
+    # 4 sigma: gagal kurang dari sekali per ~15 ribu kasus
+    assert abs(est - n) <= 4 * hll.relative_error() * n + 1
+
+
+def test_error_averages_to_standard_error():
+    n, trials = 20_000, 40
+    errors = np.array([hll.estimate(hll.sketch(hashes(n, s)))[0] / n - 1 for s in range(trials)])
+    assert abs(errors.mean()) < 4 * hll.relative_error() / np.sqrt(trials)
+    assert errors.std() < 1.5 * hll.relative_error()
+
+
+def test_merge_equals_sketch_of_union():
+    a, b = hashes(30_000, 1), hashes(20_000, 2)
+    merged = hll.merge(np.vstack([hll.sketch(a), hll.sketch(b)]))
+    np.testing.assert_array_equal(merged, hll.sketch(np.concatenate([a, b]))[0])
+
+
+def test_sparse_entries_roundtrip():
+    h = hashes(5_000, 3)
+    groups = np.arange(len(h)) % 3
+    np.testing.assert_array_equal(hll.from_entries(hll.sparse_entries(h), groups, 3),
+                                  hll.sketch(h, groups, 3))
+
+
+def test_duplicates_do_not_change_estimate():
+    h = hashes(2_000, 4)
+    np.testing.assert_array_equal(hll.sketch(np.concatenate([h, h, h])), hll.sketch(h))
@@ -0,0 +1,58 @@
+"""
+lookup_index / merge_index / MainLookup: hasil sama dengan filter boolean atas main_df.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pipeline.ids import decode, load_ids
+from pipeline.lookup import INDEX_KEYS, MainLookup, lookup_index, merge_index
+from pipeline.store import read_table
+
+
+@pytest.fixture(scope="module")
+def lookup(full_out, main_df):
+    return MainLookup(main_df, read_table("lookup_index", root=full_out), load_ids(full_out),
+                      read_table("rfm_df", root=full_out))
+
+
+@pytest.mark.parametrize("parts", [2, 5])
+def test_merge_index_matches_rebuild(main_df, parts):
+    edges = np.linspace(0, len(main_df), parts + 1).astype(int)
+    index = lookup_index(main_df.iloc[:edges[1]])
+    for lo, hi in zip(edges[1:-1], edges[2:]):
+        index = merge_index(index, main_df.iloc[lo:hi], lo)
+    pd.testing.assert_frame_equal(index, lookup_index(main_df))
+
+
+def test_rows_keep_purchase_order(main_df):
+    index = lookup_index(main_df)
+    for key, row in INDEX_KEYS.items():
+        assert (np.diff(index[key].to_numpy()) >= 0).all()
+        # Baris satu kunci urut posisi (= urut waktu beli di main_df)
+        same = np.diff(index[key].to_numpy()) == 0
+        assert (np.diff(index[row].to_numpy())[same] > 0).all()
+
+
+@pytest.mark.parametrize("key", list(INDEX_KEYS))
+def test_rows_match_boolean_filter(lookup, main_df, full_out, key):
+    ids = load_ids(full_out)[key]
+    for code in main_df[key].drop_duplicates().sample(25, random_state=0):
+        got = lookup.rows(key, decode([code], ids)[0])
+        pd.testing.assert_frame_equal(got, main_df[main_df[key] == code])
+
+
+def test_unknown_id_returns_no_rows(lookup):
+    assert lookup.rows("order_id", "0" * 32).empty
+    items, orders, segment = lookup.customer("tidak-ada")
+    assert items.empty and orders.empty and segment is None
+
+
+def test_customer_summary(lookup, main_df, full_out):
+    ids = load_ids(full_out)
+    code = main_df["customer_unique_id"].value_counts().index[0]
+    items, orders, segment = lookup.customer(decode([code], ids["customer_unique_id"])[0])
+    mine = main_df[main_df["customer_unique_id"] == code]
+    assert len(items) == len(mine) and len(orders) == mine["order_id"].nunique()
+    assert segment["frequency"] == len(orders)
@@ -0,0 +1,28 @@
+"""
+partition_bounds: partisi menutup semua baris dan hanya dipotong di pergantian bulan.
+"""
+
+import pandas as pd
+import pytest
+
+from pipeline.parallel import partition_bounds
+
+
+@pytest.mark.parametrize("n_parts", [1, 2, 3, 8, 50])
+def test_bounds_cut_only_at_month_changes(main_df, n_parts):
+    times = main_df["order_purchase_timestamp"]
+    bounds = partition_bounds(times, n_parts)
+    assert bounds[0][0] == 0 and bounds[-1][1] == len(times)
+    assert all(hi == lo for (_, hi), (lo, _) in zip(bounds, bounds[1:]))
+    assert len(bounds) <= n_parts
+    month = times.dt.to_period("M")
+    for lo, _ in bounds[1:]:
+        assert month.iloc[lo] != month.iloc[lo - 1]
+
+
+def test_unsorted_or_single_month_is_one_partition():
+    times = pd.Series(pd.to_datetime(["2018-03-01", "2018-01-05", "2018-02-01"]))
+    assert partition_bounds(times, 4) == [(0, 3)]
+    same = pd.Series(pd.to_datetime(["2018-03-01", "2018-03-05", "2018-03-09"]))
+    assert partition_bounds(same, 4) == [(0, 3)]
+    assert partition_bounds(same.iloc[:0], 4) == [(0, 0)]
@@ -0,0 +1,70 @@
+"""
+Engine RFM: skor tervektorisasi, threshold kuantil, dan RFM per rentang dari CustomerIndex.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pipeline.query import MainQuery
+from pipeline.rfm import (FIXED_EDGES, CustomerIndex, default_snapshot, fit_edges, needs_refit,
+                          quantile_edges, rfm_base, rfm_table, score_rfm)
+
+
+def notebook_scores(row):
+    """Fungsi per baris notebook (referensi FIXED_EDGES)."""
+    rec, freq, mon = row.recency, row.frequency, row.monetary
+    r = 5 if rec <= 114 else 4 if rec <= 219 else 3 if rec <= 346 else 2 if rec <= 500 else 1
+    f = 1 if freq == 1 else 2 if freq == 2 else 3 if freq == 3 else 4 if freq <= 5 else 5
+    m = 1 if mon <= 63.68 else 2 if mon <= 112.83 else 3 if mon <= 201.13 else 4 if mon <= 500 else 5
+    return r, f, m
+
+
+# ─── quantile_edges ───────────────────────────────────────────
+@pytest.mark.parametrize("n", [1, 2, 7, 1000])
+def test_quantile_edges_matches_numpy(n):
+    values = np.random.default_rng(n).exponential(100, n)
+    q = (0.25, 0.5, 0.75, 0.95)
+    np.testing.assert_allclose(quantile_edges(values, q), np.quantile(values, q))
+
+
+def test_quantile_edges_ignores_nan():
+    values = np.array([np.nan, 3.0, 1.0, np.nan, 2.0])
+    np.testing.assert_allclose(quantile_edges(values, (0.5,)), (2.0,))
+
+
+@pytest.mark.parametrize("values", [[], [np.nan, np.nan]])
+def test_quantile_edges_without_data_is_nan(values):
+    edges = quantile_edges(values, (0.25, 0.5, 0.75))
+    assert len(edges) == 3 and all(np.isnan(edges))
+
+
+def test_rfm_table_on_empty_main_df(main_df):
+    assert rfm_table(main_df.iloc[:0]).empty
+
+
+# ─── Skor & threshold ─────────────────────────────────────────
+def test_fixed_edges_match_notebook_rules(main_df):
+    rfm_df = score_rfm(rfm_base(main_df), FIXED_EDGES)
+    expected = np.array([notebook_scores(row) for row in rfm_df.itertuples()])
+    np.testing.assert_array_equal(rfm_df[["R_score", "F_score", "M_score"]].to_numpy(), expected)
+
+
+def test_refit_only_when_data_moves(main_df):
+    rfm_df = rfm_base(main_df)
+    snapshot = main_df["order_purchase_timestamp"].max()
+    edges = fit_edges(rfm_df, snapshot)
+    assert not needs_refit(edges, len(rfm_df), snapshot + pd.Timedelta(days=3))
+    assert needs_refit(edges, len(rfm_df), snapshot + pd.Timedelta(days=30))
+    assert needs_refit(edges, int(len(rfm_df) * 1.2), snapshot)
+    assert needs_refit(None, len(rfm_df), snapshot)
+
+
+# ─── CustomerIndex ────────────────────────────────────────────
+@pytest.mark.parametrize("start,end", [(None, None), ("2017-03-01", "2017-12-31"), ("2018-01-01", None)])
+def test_customer_index_matches_rfm_base(main_df, start, end):
+    window = MainQuery(main_df).window(start, end)
+    got, snapshot = CustomerIndex(main_df).rfm_base(start, end)
+    want = rfm_base(window)
+    assert snapshot == default_snapshot(window)
+    pd.testing.assert_frame_equal(got, want, check_dtype=False, check_exact=False, rtol=1e-9)
@@ -0,0 +1,53 @@
+"""
+Scorecard seller: agregat aditif antar potongan data, peringkat = sort penuh.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pipeline.sellers import SELLER_METRICS, SellerBoard, seller_aggregates
+from pipeline.store import read_table
+
+
+@pytest.fixture(scope="module")
+def cards(full_out):
+    return read_table("seller_scorecards", root=full_out)
+
+
+def test_aggregates_add_across_time_partitions(main_df):
+    cut = int(np.searchsorted(main_df["order_purchase_timestamp"], pd.Timestamp("2017-10-01")))
+    parts = [seller_aggregates(main_df.iloc[:cut]), seller_aggregates(main_df.iloc[cut:])]
+    summed = parts[0].add(parts[1], fill_value=0)
+    pd.testing.assert_frame_equal(summed, seller_aggregates(main_df), check_dtype=False)
+
+
+def test_scorecard_matches_groupby(main_df, cards):
+    orders = main_df.drop_duplicates(["seller_id", "order_id"])
+    # review_score float32 di main_df: groupby mean-nya float32, scorecard float64
+    want = orders.groupby("seller_id").agg(orders=("order_id", "size"),
+                                           avg_review_score=("review_score", "mean"),
+                                           avg_delivery_days=("delivery_days", "mean"))
+    want["revenue"] = main_df.groupby("seller_id")["revenue"].sum()
+    got = cards.set_index("seller_id").loc[want.index]
+    pd.testing.assert_frame_equal(got[want.columns], want, check_dtype=False, check_exact=False, rtol=1e-6)
+
+
+@pytest.mark.parametrize("metric", list(SELLER_METRICS))
+@pytest.mark.parametrize("largest", [True, False])
+def test_rank_matches_full_sort(cards, metric, largest):
+    board = SellerBoard(cards)
+    got = board.rank(metric, k=10, min_orders=2, largest=largest)
+    pool = cards[cards["orders"] >= 2]
+    want = pool.sort_values([metric, "orders"], ascending=[not largest, False], kind="stable").head(10)
+    np.testing.assert_allclose(got[metric].to_numpy(), want[metric].to_numpy())
+    assert len(got) == min(10, len(pool))
+
+
+def test_state_filter(cards):
+    board = SellerBoard(cards)
+    state = cards["seller_state"].iloc[0]
+    rows = board.selection([state])
+    assert (cards["seller_state"].iloc[rows] == state).all()
+    assert len(rows) == (cards["seller_state"] == state).sum()
+    assert board.summary([state])["sellers"] == len(rows)